@@ -1,4 +1,5 @@
 # app.py
+import importlib.util
 import os
 import re
 from typing import Optional, Dict
@@ -12,7 +13,6 @@ try:
 except Exception:
     pass
 
-import altair as alt
 import pandas as pd
 import streamlit as st
 
@@ -21,30 +21,35 @@ from data.maxpreps import (
     MAXPREPS_D2_URL,
     MAXPREPS_RANKINGS_URL,
     MAXPREPS_SCHEDULE_URL,
+    fetch_page,
     parse_maxpreps_division_rank,
     parse_maxpreps_next_opponent,
 )
-from data.metrics import calculate_shot_on_target_percentages
+from data.metrics import TeamKpis, team_kpis
+from data.opponents import OpponentRegistry, opponent_mask
+from data.player_stats import STAT_COLUMNS, PlayerMatchCube
+from data.schema import parse_bool
 from data.seasons import supports_shot_on_target_kpis
-import requests
+from data.trends import (
+    DEFAULT_WINDOWS,
+    TREND_METRICS,
+    FormSettings,
+    comparison_frame,
+    form_metrics,
+    game_points,
+    metric_matrix,
+    rolling_frame,
+)
 from dotenv import load_dotenv
 
 # Centralized cached data loaders
-from loaders import (
-    load_seasons,
-    load_matches,
-    load_players,
-    load_events,
-    load_plays_simple,
-    load_summaries,
-    load_goals_allowed,
-)
+from loaders import data_status, load_data_snapshot, load_history_store
 
-# Optional Groq import (guarded)
-try:
-    from groq import Groq
-except Exception:
-    Groq = None
+# Optional dependencies are imported on first use: altair and groq alone add
+# over half a second to a cold start. See benchmarks/bench_startup.py.
+def _groq_installed() -> bool:
+    """Check for the optional groq package without importing it."""
+    return importlib.util.find_spec("groq") is not None
 
 
 def _groq_chat(system_prompt: str, user_prompt: str, *, temperature: float = 0.2) -> str:
@@ -55,8 +60,10 @@ def _groq_chat(system_prompt: str, user_prompt: str, *, temperature: float = 0.2
     api_key = os.getenv("GROQ_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("Missing GROQ_API_KEY")
-    if Groq is None:
-        raise RuntimeError("groq package not installed")
+    try:
+        from groq import Groq
+    except Exception as exc:
+        raise RuntimeError("groq package not installed") from exc
 
     client = Groq(api_key=api_key)
     completion = client.chat.completions.create(
@@ -452,9 +459,6 @@ require_app_password()
 # ---------------------------------------------------------------------
 # HELPERS
 # ---------------------------------------------------------------------
-def _bool_col(series: pd.Series) -> pd.Series:
-    return series.astype(str).str.strip().str.lower().isin(["true","1","yes","y","t"])
-
 def _normalize_set_piece(series: pd.Series) -> pd.Series:
     s = series.astype(str).str.strip().str.lower()
     def norm(v: str) -> str:
@@ -531,19 +535,6 @@ def _color_opp(name: str, res: str) -> str:
     safe = str(name) if name is not None else ""
     return f"<span style='color:{_result_color(res)};font-weight:600'>{safe}</span> {_result_emoji(res)}"
 
-def _team_record_text(df: pd.DataFrame) -> str:
-    if df.empty or "result" not in df: return "0-0"
-    w = int((df["result"]=="W").sum())
-    l = int((df["result"]=="L").sum())
-    d = int((df["result"]=="D").sum())
-    return f"{w}-{l}-{d}" if d>0 else f"{w}-{l}"
-
-def _strip_and_alias_matches(df: pd.DataFrame) -> pd.DataFrame:
-    df.columns = df.columns.astype(str).str.strip()
-    if "shots_for" not in df.columns and "shots" in df.columns:
-        df = df.rename(columns={"shots":"shots_for"})
-    return df
-
 def _suffix(n: int) -> str:
     return {1:"st",2:"nd",3:"rd"}.get(n if n in (1,2,3) else 0, "th")
 
@@ -580,9 +571,7 @@ def _minute_bucket(x) -> str:
 # ---------------------------------------------------------------------
 @st.cache_data(ttl=3600)
 def fetch_html(url: str) -> str:
-    r = requests.get(url, timeout=20, headers={"User-Agent":"Mozilla/5.0"})
-    r.raise_for_status()
-    return r.text
+    return fetch_page(url)
 
 def _clean_text(html: str) -> str:
     text = re.sub(r"<script.*?</script>", " ", html, flags=re.S)
@@ -609,7 +598,7 @@ def set_piece_leaderboard_from_plays(plays_df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame(columns=["set_piece", "Play Call", "play_type", "attempts", "Goals", "Goal%"])
 
     grp = (
-        plays_df.groupby(["play_call_id", "set_piece", "play_type"], dropna=False)
+        plays_df.groupby(["play_call_id", "set_piece", "play_type"], dropna=False, observed=True)
         .agg(
             attempts=("play_call_id", "count"),
             goals=("goal_created", "sum"),
@@ -626,116 +615,38 @@ def set_piece_leaderboard_from_plays(plays_df: pd.DataFrame) -> pd.DataFrame:
     ordered = out[cols].sort_values(["Goal%", "attempts", "Play Call"], ascending=[False, False, True])
     return ordered
 
+def _trend_form_settings() -> FormSettings:
+    """The rolling windows and EWMA half-life picked on the Trends tab (defaults until it is opened)."""
+    return FormSettings(
+        tuple(st.session_state.get("trend_windows") or DEFAULT_WINDOWS),
+        st.session_state.get("trend_halflife") or None,
+    )
+
 def build_trend_frame(matches: pd.DataFrame) -> pd.DataFrame:
     if matches.empty:
         return pd.DataFrame()
-    df = matches.sort_values("date").copy()
-    df["GF"] = df.get("goals_for", 0)
-    df["GA"] = df.get("goals_against", 0)
-
-    sv  = df.get("saves", pd.Series([0]*len(df)))
-    shf = df.get("shots_for", pd.Series([0]*len(df)))
-    sha = df.get("shots_against", pd.Series([0]*len(df)))
-
-    denom_sv = sv + df["GA"]
-    df["Save%"] = (sv / denom_sv * 100).where(denom_sv > 0, 0.0)
-    df["GF Conv%"] = (df["GF"] / shf * 100).where(shf > 0, 0.0)
-    df["GA Conv%"] = (df["GA"] / sha * 100).where(sha > 0, 0.0)
-
-    roll = df[["GF", "GA", "Save%", "GF Conv%", "GA Conv%"]].rolling(3, min_periods=1).mean()
-    for c in roll.columns:
-        df[f"R3 {c}"] = roll[c]
+    matrix = metric_matrix(matches)
+    df = matches.loc[matrix.index].copy()
+    for c in TREND_METRICS:
+        df[c] = matrix[c]
+    df = df.join(rolling_frame(matrix, 3))
     df["Date"] = df["date"]
     return df
 
-def build_comparison_trend_frame(matches: pd.DataFrame) -> pd.DataFrame:
-    """Build a comparison frame showing all games vs last 3 games metrics."""
-    if matches.empty:
-        return pd.DataFrame()
-    
-    df = matches.sort_values("date").copy()
-    df["GF"] = df.get("goals_for", 0)
-    df["GA"] = df.get("goals_against", 0)
-
-    sv  = df.get("saves", pd.Series([0]*len(df)))
-    shf = df.get("shots_for", pd.Series([0]*len(df)))
-    sha = df.get("shots_against", pd.Series([0]*len(df)))
-
-    denom_sv = sv + df["GA"]
-    df["Save%"] = (sv / denom_sv * 100).where(denom_sv > 0, 0.0)
-    df["GF Conv%"] = (df["GF"] / shf * 100).where(shf > 0, 0.0)
-    df["GA Conv%"] = (df["GA"] / sha * 100).where(sha > 0, 0.0)
-
-    # Calculate season averages (all games)
-    season_avg = {
-        "GF": df["GF"].mean(),
-        "GA": df["GA"].mean(),
-        "Save%": df["Save%"].mean(),
-        "GF Conv%": df["GF Conv%"].mean(),
-        "GA Conv%": df["GA Conv%"].mean()
-    }
-
-    # Calculate last 3 games averages
-    last_3_avg = {}
-    if len(df) >= 3:
-        last_3 = df.tail(3)
-        last_3_avg = {
-            "GF": last_3["GF"].mean(),
-            "GA": last_3["GA"].mean(),
-            "Save%": last_3["Save%"].mean(),
-            "GF Conv%": last_3["GF Conv%"].mean(),
-            "GA Conv%": last_3["GA Conv%"].mean()
-        }
-    else:
-        # If less than 3 games, use all available games
-        last_3_avg = season_avg.copy()
-
-    # Create comparison data
-    comparison_data = []
-    for metric in ["GF", "GA", "Save%", "GF Conv%", "GA Conv%"]:
-        comparison_data.append({
-            "Metric": metric,
-            "All Games": season_avg[metric],
-            "Last 3 Games": last_3_avg[metric],
-            "Difference": last_3_avg[metric] - season_avg[metric]
-        })
-
-    return pd.DataFrame(comparison_data)
-
-def build_individual_game_trends(matches: pd.DataFrame) -> pd.DataFrame:
-    """Build individual game data points for trend analysis."""
-    if matches.empty:
-        return pd.DataFrame()
-    
-    df = matches.sort_values("date").copy()
-    df["GF"] = df.get("goals_for", 0)
-    df["GA"] = df.get("goals_against", 0)
-
-    sv  = df.get("saves", pd.Series([0]*len(df)))
-    shf = df.get("shots_for", pd.Series([0]*len(df)))
-    sha = df.get("shots_against", pd.Series([0]*len(df)))
+def build_comparison_trend_frame(matches: pd.DataFrame, form: FormSettings = FormSettings()) -> pd.DataFrame:
+    """Build a comparison frame showing all games vs the last-N windows (and EWMA)."""
+    return comparison_frame(metric_matrix(matches), form_metrics(matches, form), form)
 
-    denom_sv = sv + df["GA"]
-    df["Save%"] = (sv / denom_sv * 100).where(denom_sv > 0, 0.0)
-    df["GF Conv%"] = (df["GF"] / shf * 100).where(shf > 0, 0.0)
-    df["GA Conv%"] = (df["GA"] / sha * 100).where(sha > 0, 0.0)
-
-    # Add game number and opponent info
-    df["Game #"] = range(1, len(df) + 1)
-    df["Opponent"] = df.get("opponent", "")
-    df["Date"] = df["date"]
-    
-    # Mark last 3 games
-    df["Last 3 Games"] = df.index >= (len(df) - 3)
-    
-    return df[["Game #", "Date", "Opponent", "GF", "GA", "Save%", "GF Conv%", "GA Conv%", "Last 3 Games"]]
+def build_individual_game_trends(matches: pd.DataFrame, form: FormSettings = FormSettings()) -> pd.DataFrame:
+    """Build individual game data points, with their form series, for trend analysis."""
+    return game_points(metric_matrix(matches), last_n=form.primary, form=form_metrics(matches, form))
 
 # --- AI: match summary ---
 def generate_ai_game_summary(match_row: pd.Series,
                              notes_row: Optional[pd.Series],
                              events: pd.DataFrame) -> Optional[str]:
     api_key = os.getenv("GROQ_API_KEY", "").strip()
-    if not api_key or Groq is None:
+    if not api_key or not _groq_installed():
         if DEBUG_AI:
             _record_ai_error(
                 "generate_ai_game_summary",
@@ -793,7 +704,7 @@ def generate_ai_conceded_summary(ga_df: pd.DataFrame,
                                  matches: pd.DataFrame,
                                  players: pd.DataFrame) -> Optional[str]:
     api_key = os.getenv("GROQ_API_KEY", "").strip()
-    if not api_key or Groq is None:
+    if not api_key or not _groq_installed():
         if DEBUG_AI:
             _record_ai_error(
                 "generate_ai_conceded_summary",
@@ -820,7 +731,7 @@ def generate_ai_conceded_summary(ga_df: pd.DataFrame,
             tmp["date"] = ""
 
         tmp["minute_bucket"] = tmp["minute"].apply(_minute_bucket)
-        by_situation = tmp["situation"].fillna("").str.title().replace({"": "Unspecified"}).value_counts().to_dict()
+        by_situation = tmp["situation"].astype(object).fillna("").str.title().replace({"": "Unspecified"}).value_counts().to_dict()
         by_bucket = tmp["minute_bucket"].value_counts().to_dict()
         by_goalie = tmp["goalie_name"].fillna("").replace({"": "Unspecified"}).value_counts().to_dict()
 
@@ -852,10 +763,11 @@ def generate_ai_team_analysis(query: str,
                              players: pd.DataFrame,
                              events: pd.DataFrame,
                              plays_df: pd.DataFrame,
-                             goals_allowed: pd.DataFrame) -> Optional[str]:
+                             goals_allowed: pd.DataFrame,
+                             player_stats: Optional[PlayerMatchCube] = None) -> Optional[str]:
     """Generate AI analysis based on user query about team performance."""
     api_key = os.getenv("GROQ_API_KEY", "").strip()
-    if not api_key or Groq is None:
+    if not api_key or not _groq_installed():
         if DEBUG_AI:
             _record_ai_error(
                 "generate_ai_team_analysis",
@@ -865,32 +777,19 @@ def generate_ai_team_analysis(query: str,
     
     try:
         # Prepare comprehensive team data
-        # Build top scorers with player names, not IDs
+        # Top scorers with player names, not IDs, from the season's player-by-match cube
         top_scorers = []
         if not events.empty:
-            ev_norm = events.copy()
-            ev_norm.columns = [c.strip().lower() for c in ev_norm.columns]
-            if "assist" in ev_norm.columns and "assists" not in ev_norm.columns:
-                ev_norm = ev_norm.rename(columns={"assist": "assists"})
-            agg = ev_norm.groupby("player_id", as_index=False)[[c for c in ["goals","assists"] if c in ev_norm.columns]].sum()
-            # map names
-            pl_map = {}
-            if not players.empty and "player_id" in players.columns and "name" in players.columns:
-                tmp = players[["player_id","name"]].copy()
-                tmp["player_id"] = tmp["player_id"].astype(str)
-                pl_map = dict(zip(tmp["player_id"], tmp["name"].astype(str)))
-            agg["name"] = agg["player_id"].astype(str).map(pl_map).fillna(agg["player_id"].astype(str))
-            top_scorers = agg.sort_values("goals", ascending=False).head(5)[["name","goals","assists"]].to_dict("records")
+            if player_stats is None:
+                player_stats = PlayerMatchCube(events, players)
+            match_ids = events["match_id"] if "match_id" in events.columns else None
+            top_scorers = player_stats.top_scorers(5, match_ids)[["name","goals","assists"]].to_dict("records")
 
         team_data = {
             "matches": {
                 "total_games": len(matches),
-                "record": _team_record_text(matches),
-                "goals_for": int(matches.get("goals_for", pd.Series(dtype=int)).sum()) if not matches.empty else 0,
-                "goals_against": int(matches.get("goals_against", pd.Series(dtype=int)).sum()) if not matches.empty else 0,
-                "shots_for": int(matches.get("shots_for", pd.Series(dtype=int)).sum()) if not matches.empty else 0,
-                "shots_against": int(matches.get("shots_against", pd.Series(dtype=int)).sum()) if not matches.empty else 0,
-                "saves": int(matches.get("saves", pd.Series(dtype=int)).sum()) if not matches.empty else 0,
+                # Same bundle as the KPI header, so the prompt cannot disagree with it
+                **team_kpis(matches).as_dict(),
                 "recent_games": matches.tail(3)[["date", "opponent", "goals_for", "goals_against", "result"]].to_dict("records") if len(matches) >= 3 else []
             },
             "players": {
@@ -904,13 +803,13 @@ def generate_ai_team_analysis(query: str,
             },
             "goals_allowed": {
                 "total_conceded": len(goals_allowed),
-                "by_situation": goals_allowed["situation"].value_counts().to_dict() if not goals_allowed.empty else {},
+                "by_situation": goals_allowed["situation"].astype(object).value_counts().to_dict() if not goals_allowed.empty else {},
                 "by_minute": goals_allowed["minute"].apply(_minute_bucket).value_counts().to_dict() if not goals_allowed.empty else {}
             },
             "set_pieces": {
                 "total_attempts": len(plays_df),
                 "goals_created": int(plays_df.get("goal_created", pd.Series(dtype=bool)).sum()) if not plays_df.empty else 0,
-                "by_type": plays_df["set_piece"].value_counts().to_dict() if not plays_df.empty else {}
+                "by_type": plays_df["set_piece"].astype(object).value_counts().to_dict() if not plays_df.empty else {}
             }
         }
 
@@ -969,13 +868,15 @@ def get_next_opponent_from_schedule() -> Optional[Dict[str, str]]:
     except Exception:
         return None
 
-def analyze_opponent_from_data(opponent_name: str, matches: pd.DataFrame) -> Dict[str, any]:
+def analyze_opponent_from_data(
+    opponent_name: str, matches: pd.DataFrame, opponents: Optional[OpponentRegistry] = None
+) -> Dict[str, any]:
     """Analyze opponent based on historical match data."""
     if matches.empty or not opponent_name:
         return {}
     
-    # Find matches against this opponent
-    opponent_matches = matches[matches["opponent"].str.contains(opponent_name, case=False, na=False)]
+    # Find matches against this opponent (any spelling the registry ties to it)
+    opponent_matches = matches[opponent_mask(matches["opponent"], opponent_name, registry=opponents)]
     
     if opponent_matches.empty:
         return {"found": False, "message": f"No historical data found for {opponent_name}"}
@@ -1007,23 +908,36 @@ def _extract_links_with_text(html: str) -> list[tuple[str,str]]:
         pass
     return pairs
 
+@st.cache_data(ttl=3600)
+def _maxpreps_team_schedules() -> tuple[OpponentRegistry, Dict[str, str]]:
+    """Index the team links on Milton's schedule page by canonical team id."""
+    html = fetch_html(MAXPREPS_SCHEDULE_URL)
+    names, urls = [], {}
+    for href, text in _extract_links_with_text(html):
+        if "/soccer/" not in href:
+            continue
+        team_url = urljoin(MAXPREPS_SCHEDULE_URL, href).split("?")[0]
+        if "/match/" in team_url:
+            continue
+        if not team_url.endswith("/"):
+            team_url += "/"
+        names.append(text)
+        urls.setdefault(text, team_url if team_url.endswith("/schedule/") else team_url + "schedule/")
+    registry = OpponentRegistry(names)
+    return registry, {team: urls[registry.name(team)] for team in registry.teams()}
+
 def find_opponent_schedule_url(opponent_name: str) -> Optional[str]:
     """Find an opponent's MaxPreps schedule URL from Milton's schedule page."""
     try:
-        html = fetch_html(MAXPREPS_SCHEDULE_URL)
-        links = _extract_links_with_text(html)
-        target = opponent_name.lower().strip()
-        for href, text in links:
-            if target in text.lower() and "/soccer/" in href:
-                team_url = urljoin(MAXPREPS_SCHEDULE_URL, href).split("?")[0]
-                if "/match/" in team_url:
-                    continue
-                if not team_url.endswith("/"):
-                    team_url += "/"
-                return team_url if team_url.endswith("/schedule/") else team_url + "schedule/"
+        registry, urls = _maxpreps_team_schedules()
+        team = registry.resolve(opponent_name)
+        if team is None:
+            # A partial name only links a schedule when it picks out one team.
+            matched = registry.match(opponent_name)
+            team = next(iter(matched)) if len(matched) == 1 else None
+        return urls.get(team) if team else None
     except Exception:
         return None
-    return None
 
 def scrape_team_schedule_stats(schedule_url: str) -> Optional[Dict[str, any]]:
     """Fetch a MaxPreps team schedule and derive rough W-L-D, GF, GA and opponents.
@@ -1061,7 +975,9 @@ def scrape_team_schedule_stats(schedule_url: str) -> Optional[Dict[str, any]]:
     except Exception:
         return None
 
-def summarize_vs_common_opponents(opponent_stats: Dict[str, any], our_matches: pd.DataFrame) -> Dict[str, any]:
+def summarize_vs_common_opponents(
+    opponent_stats: Dict[str, any], our_matches: pd.DataFrame, opponents: Optional[OpponentRegistry] = None
+) -> Dict[str, any]:
     """Compute opponent's record vs teams we have on our schedule (common opponents), using scraped opponent games.
     Returns dict with list of common opponents and opponent W-L-D and GF/GA vs those opponents.
     """
@@ -1069,8 +985,9 @@ def summarize_vs_common_opponents(opponent_stats: Dict[str, any], our_matches: p
     try:
         if not opponent_stats or our_matches is None or our_matches.empty:
             return out
-        our_opps = set(our_matches.get("opponent", pd.Series(dtype=str)).astype(str).str.strip().str.lower().unique())
-        common_games = [g for g in opponent_stats.get("games", []) if str(g.get("opponent"," ")).strip().lower() in our_opps]
+        if opponents is None:
+            opponents = OpponentRegistry.from_series(our_matches.get("opponent"))
+        common_games = [g for g in opponent_stats.get("games", []) if opponents.resolve(g.get("opponent"))]
         if not common_games:
             return out
         out["common"] = common_games
@@ -1083,11 +1000,17 @@ def summarize_vs_common_opponents(opponent_stats: Dict[str, any], our_matches: p
     except Exception:
         return out
 
-def predict_vs_opponent(matches: pd.DataFrame, opponent_name: str) -> Dict[str, float]:
+def predict_vs_opponent(
+    matches: pd.DataFrame,
+    opponent_name: str,
+    opponents: Optional[OpponentRegistry] = None,
+    form: FormSettings = FormSettings(),
+) -> Dict[str, float]:
     """Simple prediction using available data only (our schedule):
     - Head-to-head averages vs opponent (if any)
     - Season averages
-    - Recent 3 games averages
+    - Recent form: the shortest rolling window's average, or the EWMA if set
+      (the same cached series the Trends tab shows)
     Returns suggested expected GF/GA.
     """
     out = {"gf_pred": 0.0, "ga_pred": 0.0}
@@ -1102,13 +1025,13 @@ def predict_vs_opponent(matches: pd.DataFrame, opponent_name: str) -> Dict[str,
     season_gf = float(df["GF"].mean()) if len(df) else 0.0
     season_ga = float(df["GA"].mean()) if len(df) else 0.0
 
-    # Recent form (last 3)
-    recent = df.tail(3)
-    recent_gf = float(recent["GF"].mean()) if len(recent) else season_gf
-    recent_ga = float(recent["GA"].mean()) if len(recent) else season_ga
+    # Recent form
+    latest_form = form_metrics(matches, form).iloc[-1]
+    recent_gf = float(latest_form[form.recent_column("GF")])
+    recent_ga = float(latest_form[form.recent_column("GA")])
 
     # Head-to-head
-    h2h = df[df["opponent"].astype(str).str.contains(opponent_name, case=False, na=False)]
+    h2h = df[opponent_mask(df["opponent"], opponent_name, registry=opponents)]
     h2h_gf = float(h2h["GF"].mean()) if not h2h.empty else None
     h2h_ga = float(h2h["GA"].mean()) if not h2h.empty else None
 
@@ -1135,10 +1058,12 @@ def predict_vs_opponent(matches: pd.DataFrame, opponent_name: str) -> Dict[str,
 
 def generate_ai_opponent_analysis(opponent_name: str,
                                  matches: pd.DataFrame,
-                                 next_opponent_data: Optional[Dict[str, str]] = None) -> Optional[str]:
+                                 next_opponent_data: Optional[Dict[str, str]] = None,
+                                 opponents: Optional[OpponentRegistry] = None,
+                                 form: Optional[FormSettings] = None) -> Optional[str]:
     """Generate AI analysis of upcoming opponent."""
     api_key = os.getenv("GROQ_API_KEY", "").strip()
-    if not api_key or Groq is None:
+    if not api_key or not _groq_installed():
         if DEBUG_AI:
             _record_ai_error(
                 "generate_ai_opponent_analysis",
@@ -1148,13 +1073,15 @@ def generate_ai_opponent_analysis(opponent_name: str,
     
     try:
         # Get historical data about opponent + simple prediction
-        opponent_analysis = analyze_opponent_from_data(opponent_name, matches)
-        prediction = predict_vs_opponent(matches, opponent_name)
+        if opponents is None:
+            opponents = OpponentRegistry.from_series(matches.get("opponent"))
+        opponent_analysis = analyze_opponent_from_data(opponent_name, matches, opponents)
+        prediction = predict_vs_opponent(matches, opponent_name, opponents, form or _trend_form_settings())
 
         # Try to enrich with scraped opponent season and common-opponent stats
         opponent_schedule_url = find_opponent_schedule_url(opponent_name)
         opponent_stats = scrape_team_schedule_stats(opponent_schedule_url) if opponent_schedule_url else None
-        common_vs = summarize_vs_common_opponents(opponent_stats, matches) if opponent_stats else {}
+        common_vs = summarize_vs_common_opponents(opponent_stats, matches, opponents) if opponent_stats else {}
         
         # Get next opponent info
         if not next_opponent_data:
@@ -1169,7 +1096,7 @@ def generate_ai_opponent_analysis(opponent_name: str,
             "opponent_name": opponent_name,
             "historical_data": opponent_analysis,
             "next_opponent_info": next_opponent_data,
-            "team_record": _team_record_text(matches),
+            "team_record": team_kpis(matches).record,
             "recent_form": matches.tail(3)[["opponent", "result", "goals_for", "goals_against"]].to_dict("records") if len(matches) >= 3 else [],
             "prediction": prediction,
             "opponent_stats": opponent_stats or {},
@@ -1204,7 +1131,7 @@ def generate_ai_set_piece_summary(plays_df: pd.DataFrame,
                                   matches: pd.DataFrame,
                                   players: pd.DataFrame) -> Optional[str]:
     api_key = os.getenv("GROQ_API_KEY", "").strip()
-    if not api_key or Groq is None:
+    if not api_key or not _groq_installed():
         if DEBUG_AI:
             _record_ai_error(
                 "generate_ai_set_piece_summary",
@@ -1226,7 +1153,7 @@ def generate_ai_set_piece_summary(plays_df: pd.DataFrame,
             df["taker_id"] = ""
         
         df["set_piece"] = _normalize_set_piece(df["set_piece"]) 
-        df["goal_created"] = _bool_col(df["goal_created"]) 
+        df["goal_created"] = parse_bool(df["goal_created"]) 
 
         # Get player names if available
         pl = players.set_index("player_id") if "player_id" in players.columns else pd.DataFrame()
@@ -1299,36 +1226,26 @@ def _team_kpis(
     d2_rank: Optional[int] = None,
     compact: bool = False,
     season_id: str = "",
+    totals: Optional[Dict[str, int]] = None,
 ):
-    # --- aggregate
-    gf = int(matches_view.get("goals_for", pd.Series(dtype=int)).sum()) if not matches_view.empty else 0
-    ga = int(matches_view.get("goals_against", pd.Series(dtype=int)).sum()) if not matches_view.empty else 0
-    sh_for = int(matches_view.get("shots_for", pd.Series(dtype=int)).sum()) if not matches_view.empty else 0
-    sh_ag  = int(matches_view.get("shots_against", pd.Series(dtype=int)).sum()) if not matches_view.empty else 0
-    sv = int(matches_view.get("saves", pd.Series(dtype=int)).sum()) if not matches_view.empty else 0
-    games = int(len(matches_view))
-
-    save_denom = sv + ga
-    save_pct = (sv / save_denom * 100.0) if save_denom > 0 else 0.0
+    # --- aggregate (from the range index's prefix sums when the caller has them)
+    kpis = TeamKpis.from_totals(totals) if totals is not None else team_kpis(matches_view)
+    shots_target_pct, shots_against_target_pct = kpis.shots_target_pcts
     show_shot_on_target_kpis = supports_shot_on_target_kpis(season_id)
-    shots_target_pct, shots_against_target_pct = calculate_shot_on_target_percentages(matches_view)
-    conv_for_pct = (gf / sh_for * 100.0) if sh_for > 0 else 0.0
-    conv_agn_pct = (ga / sh_ag  * 100.0) if sh_ag  > 0 else 0.0
-    record_str = _team_record_text(matches_view)
 
     if compact:
         # ---------- Mobile / Compact: card grid ----------
         items = [
-            ("Games", games),
-            ("Record", record_str),
-            ("GF", gf),
-            ("GA", ga),
-            ("Shots (For)", sh_for),
-            ("Shots (Agst)", sh_ag),
-            ("Saves", sv),
-            ("Save%", f"{save_pct:.1f}%"),
-            ("Conv% (For)", f"{conv_for_pct:.1f}%"),
-            ("Conv% (Agst)", f"{conv_agn_pct:.1f}%"),
+            ("Games", kpis.games),
+            ("Record", kpis.record),
+            ("GF", kpis.goals_for),
+            ("GA", kpis.goals_against),
+            ("Shots (For)", kpis.shots_for),
+            ("Shots (Agst)", kpis.shots_against),
+            ("Saves", kpis.saves),
+            ("Save%", f"{kpis.save_pct:.1f}%"),
+            ("Conv% (For)", f"{kpis.conv_for_pct:.1f}%"),
+            ("Conv% (Agst)", f"{kpis.conv_against_pct:.1f}%"),
         ]
         if show_shot_on_target_kpis:
             items[6:6] = [
@@ -1347,12 +1264,12 @@ def _team_kpis(
 
     # ---------- Desktop: separate volume from efficiency for legibility ----------
     volume_cols = st.columns(7)
-    volume_cols[0].metric("Games", games)
-    volume_cols[1].metric("Record", record_str)
-    volume_cols[2].metric("GF", gf)
-    volume_cols[3].metric("GA", ga)
-    volume_cols[4].metric("Shots (For)", sh_for)
-    volume_cols[5].metric("Shots (Agst)", sh_ag)
+    volume_cols[0].metric("Games", kpis.games)
+    volume_cols[1].metric("Record", kpis.record)
+    volume_cols[2].metric("GF", kpis.goals_for)
+    volume_cols[3].metric("GA", kpis.goals_against)
+    volume_cols[4].metric("Shots (For)", kpis.shots_for)
+    volume_cols[5].metric("Shots (Agst)", kpis.shots_against)
     if d2_rank:
         volume_cols[6].metric("D2 Rank", f"{d2_rank}{_suffix(d2_rank)}")
     else:
@@ -1368,10 +1285,10 @@ def _team_kpis(
         )
     efficiency_metrics.extend(
         [
-            ("Conv% (For)", f"{conv_for_pct:.1f}%"),
-            ("Conv% (Agst)", f"{conv_agn_pct:.1f}%"),
-            ("Saves", sv),
-            ("Save%", f"{save_pct:.1f}%"),
+            ("Conv% (For)", f"{kpis.conv_for_pct:.1f}%"),
+            ("Conv% (Agst)", f"{kpis.conv_against_pct:.1f}%"),
+            ("Saves", kpis.saves),
+            ("Save%", f"{kpis.save_pct:.1f}%"),
         ]
     )
     efficiency_cols = st.columns(len(efficiency_metrics))
@@ -1455,36 +1372,32 @@ def render_games_table(matches: pd.DataFrame, compact: bool=False):
         export_cols = [c for c in ["season_id","date","match_id","opponent","home_away","division_game","GF-GA","shots_for","saves"] if c in view.columns]
         csv = view[export_cols].to_csv(index=False).encode('utf-8')
         st.download_button("Download games (CSV)", data=csv, file_name="games.csv", mime="text/csv")
+        kpi_csv = team_kpis(matches).to_frame().to_csv(index=False).encode('utf-8')
+        st.download_button("Download KPIs (CSV)", data=kpi_csv, file_name="kpis.csv", mime="text/csv")
     except Exception:
         pass
 
-def render_points_leaderboard(events: pd.DataFrame, players: pd.DataFrame, top_n: int = 5, compact: bool=False):
+def render_points_leaderboard(
+    events: pd.DataFrame,
+    players: pd.DataFrame,
+    top_n: int = 5,
+    compact: bool = False,
+    player_stats: Optional[PlayerMatchCube] = None,
+):
     st.subheader("Points Leaderboard")
     if events.empty or players.empty:
         st.info("No events/players yet.")
         return
 
-    ev = events.copy(); pl = players.copy()
-    ev.columns = [c.strip().lower() for c in ev.columns]
-    pl.columns = [c.strip().lower() for c in pl.columns]
-    if "assist" in ev.columns and "assists" not in ev.columns:
-        ev = ev.rename(columns={"assist": "assists"})
-    for n in ["goals","assists","shots","fouls"]:
-        if n not in ev.columns: ev[n] = 0
-        ev[n] = pd.to_numeric(ev[n], errors="coerce").fillna(0).astype(int)
-    if "player_id" in ev.columns: ev["player_id"] = ev["player_id"].astype(str)
-    if "player_id" in pl.columns: pl["player_id"] = pl["player_id"].astype(str)
-
-    num_cols = [c for c in ["goals","assists","shots","fouls"] if c in ev.columns]
-    agg = ev.groupby("player_id", as_index=False)[num_cols].sum()
-    pidx = pl.set_index("player_id")[["name","jersey"]].copy()
-    pidx.index = pidx.index.astype(str)
-    df = agg.set_index("player_id").join(pidx, how="left").fillna({"jersey":0,"name":"Unknown"})
-    df["points"] = 2*df.get("goals", 0) + df.get("assists", 0)
-
+    # Season totals per player come from the snapshot's player-by-match cube;
+    # the view's matches select which of its rows count.
+    if player_stats is None:
+        player_stats = PlayerMatchCube(events, players)
+    match_ids = events["match_id"] if "match_id" in events.columns else None
+    full = player_stats.leaderboard(match_ids)
+    num_cols = list(STAT_COLUMNS)
     cols_full = ["jersey","name"] + num_cols + ["points"]
-    full = df.reset_index()[cols_full] \
-             .sort_values(["points","goals","assists","jersey"], ascending=[False,False,False,True])
+    full = full[cols_full]
 
     def _medal(i: int) -> str:
         return "1" if i == 0 else ("2" if i == 1 else ("3" if i == 2 else ""))
@@ -1507,6 +1420,8 @@ def render_points_leaderboard(events: pd.DataFrame, players: pd.DataFrame, top_n
         top_for_chart = top.copy()
         top_for_chart["name"] = top_for_chart["name"].astype(str)
 
+        import altair as alt
+
         label_axis = alt.Axis(labelAngle=-45) if compact else alt.Axis()
         h = 240 if compact else 280
 
@@ -1552,7 +1467,7 @@ def _set_piece_type_stats(df: pd.DataFrame, sp_type: str) -> tuple[int, float]:
         return 0, 0.0
     # Normalize before computing
     sp = _normalize_set_piece(df["set_piece"]) if "set_piece" in df.columns else pd.Series([], dtype=str)
-    gc = _bool_col(df["goal_created"]) if "goal_created" in df.columns else pd.Series([], dtype=bool)
+    gc = parse_bool(df["goal_created"]) if "goal_created" in df.columns else pd.Series([], dtype=bool)
     sub_mask = (sp == sp_type)
     total = int(sub_mask.sum())
     pct = float(gc[sub_mask].mean() * 100) if total > 0 else 0.0
@@ -1563,7 +1478,7 @@ def _set_piece_type_counts(df: pd.DataFrame, sp_type: str) -> tuple[int, int]:
     if df.empty or "set_piece" not in df.columns:
         return 0, 0
     sp = _normalize_set_piece(df["set_piece"]) if "set_piece" in df.columns else pd.Series([], dtype=str)
-    gc = _bool_col(df.get("goal_created", pd.Series([], dtype=bool)))
+    gc = parse_bool(df.get("goal_created", pd.Series([], dtype=bool)))
     mask = (sp == sp_type)
     total = int(mask.sum())
     goals = int(gc[mask].sum()) if total > 0 else 0
@@ -1576,7 +1491,7 @@ def _set_piece_aggregate(df: pd.DataFrame, include_penalties: bool = True) -> tu
     if df.empty:
         return 0, 0
     sp = _normalize_set_piece(df.get("set_piece", pd.Series([], dtype=str)))
-    gc = _bool_col(df.get("goal_created", pd.Series([], dtype=bool)))
+    gc = parse_bool(df.get("goal_created", pd.Series([], dtype=bool)))
     allowed = {"corner", "fk_direct", "fk_indirect"}
     if include_penalties:
         allowed.add("penalty")
@@ -1608,7 +1523,7 @@ def render_set_piece_analysis_from_plays(
     if "goal_created" not in df.columns:
         df["goal_created"] = False
     df["set_piece"] = _normalize_set_piece(df["set_piece"])
-    df["goal_created"] = _bool_col(df["goal_created"])
+    df["goal_created"] = parse_bool(df["goal_created"])
 
     # ---- KPI tiles (mobile-friendly card grid) ----
     # Show values for current filters (df) and season totals for clarity
@@ -1619,7 +1534,7 @@ def render_set_piece_analysis_from_plays(
     if "goal_created" not in season_df.columns:
         season_df["goal_created"] = False
     season_df["set_piece"] = _normalize_set_piece(season_df["set_piece"]) 
-    season_df["goal_created"] = _bool_col(season_df["goal_created"]) 
+    season_df["goal_created"] = parse_bool(season_df["goal_created"]) 
 
     def build_row_kpi(label: str, key: str):
         sz_total, sz_goals = _set_piece_type_counts(season_df, key)
@@ -1710,6 +1625,8 @@ def render_set_piece_analysis_from_plays(
 
     # ---- Chart (unchanged) ----
     if not tbl.empty:
+        import altair as alt
+
         # Keep Goal% on Y, but order by attempts (desc) on X
         chart = alt.Chart(tbl).mark_bar().encode(
             x=alt.X("Play Call:N", sort=alt.SortField(field="attempts", order="descending"), title="Play Call"),
@@ -1807,11 +1724,13 @@ def render_goals_allowed_analysis(ga_df: pd.DataFrame,
     c3.metric("GA / Game", f"{ga_per_game:.2f}")
     c4.metric("Shutouts", f"{shutouts}", delta=f"{shutout_rate:.0f}%", help="Matches with 0 goals against")
 
+    import altair as alt
+
     label_axis = alt.Axis(labelAngle=-30) if compact else alt.Axis()
     h = 260 if compact else 300
 
-    by_sit = view.groupby("situation", as_index=False).size().rename(columns={"size":"count"})
-    by_sit["situation"] = by_sit["situation"].fillna("").replace({"": "Unspecified"}).str.title()
+    by_sit = view.groupby("situation", as_index=False, observed=True).size().rename(columns={"size":"count"})
+    by_sit["situation"] = by_sit["situation"].astype(object).fillna("").replace({"": "Unspecified"}).str.title()
     chart_sit = alt.Chart(by_sit).mark_bar().encode(
         x=alt.X("situation:N", sort="-y", title="Situation", axis=label_axis),
         y=alt.Y("count:Q", title="Goals Conceded"),
@@ -1867,30 +1786,24 @@ def render_goals_allowed_analysis(ga_df: pd.DataFrame,
 # ---------------------------------------------------------------------
 # MAIN
 # ---------------------------------------------------------------------
-all_seasons = load_seasons(SPREADSHEET_KEY)
-all_matches = load_matches(SPREADSHEET_KEY)
-all_players = load_players(SPREADSHEET_KEY)
-all_events = load_events(SPREADSHEET_KEY)
-all_plays_simple = load_plays_simple(SPREADSHEET_KEY)
-all_summaries = load_summaries(SPREADSHEET_KEY)
-all_goals_allowed = load_goals_allowed(SPREADSHEET_KEY)
-
-from data.seasons import build_season_catalog, resolve_season_id, season_is_active, season_label
+# One snapshot per run keeps every table on the same data version.
+data_snapshot = load_data_snapshot(SPREADSHEET_KEY)
+all_players = data_snapshot.table("players")
+
 from data.views import (
     apply_match_filters,
     derive_related_views,
-    filter_by_season,
     filter_players_for_season,
     get_match_id,
+    match_view_memo,
+    match_views_key,
+    query_match_views,
 )
-from ui.sidebar import render_sidebar
+from ui.sidebar import render_range_filters, render_sidebar
 
-season_catalog = build_season_catalog(all_seasons, all_matches)
-season_options = season_catalog["season_id"].astype(str).tolist()
-season_labels = dict(zip(season_options, season_catalog["label"].astype(str)))
-active_season_id = resolve_season_id(None, season_catalog)
-requested_season = _qparams_get().get("season")
-default_season = resolve_season_id(requested_season, season_catalog)
+season_catalog = data_snapshot.season_catalog
+active_season_id = season_catalog.resolve(None)
+default_season = season_catalog.resolve(_qparams_get().get("season"))
 
 # Sidebar (clean labels)
 compact, div_only, selected_season = render_sidebar(
@@ -1898,26 +1811,19 @@ compact, div_only, selected_season = render_sidebar(
     qp_bool=_qp_bool,
     qparams_set=_qparams_set,
     qparams_merge_update=_qparams_merge_update,
-    season_options=season_options,
-    season_labels=season_labels,
+    season_options=list(season_catalog.ids),
+    season_labels=season_catalog.labels,
     default_season=default_season,
     schedule_url=MAXPREPS_SCHEDULE_URL,
     rankings_url=MAXPREPS_D2_URL,
 )
 
-# Scope every table before applying match filters so IDs can safely repeat by season.
-matches = filter_by_season(all_matches, selected_season)
 players = filter_players_for_season(
     all_players,
     selected_season,
     active_season_id=active_season_id,
 )
-events = filter_by_season(all_events, selected_season)
-plays_simple = filter_by_season(all_plays_simple, selected_season)
-summaries = filter_by_season(all_summaries, selected_season)
-goals_allowed = filter_by_season(all_goals_allowed, selected_season)
 
-# Apply filters (division/date/opponent/H-A)
 qp = _qparams_get()
 opp_filter = str(qp.get("opp", ""))
 if isinstance(opp_filter, list):
@@ -1927,23 +1833,85 @@ ha_val = str(qp.get("ha", "any")).lower()
 if isinstance(ha_val, list):
     ha_val = ha_val[0]
 
-matches_view = apply_match_filters(matches, div_only=div_only, opp_filter=opp_filter, ha_val=ha_val)
+# Scope every table before applying match filters so IDs can safely repeat by season.
+# Tables are split by season once per snapshot, so this is a lookup, not a scan.
+matches = data_snapshot.season_table("matches", selected_season)
+events = data_snapshot.season_table("events", selected_season)
+plays_simple = data_snapshot.season_table("plays_simple", selected_season)
+summaries = data_snapshot.season_table("summaries", selected_season)
+goals_allowed = data_snapshot.season_table("goals_allowed", selected_season)
+
+# Game-number/date ranges are slices of the season's matches sorted by date.
+match_ranges = data_snapshot.match_ranges(selected_season)
+match_range = render_range_filters(
+    qparams_get=_qparams_get,
+    qparams_merge_update=_qparams_merge_update,
+    game_count=len(match_ranges),
+    date_bounds=match_ranges.date_bounds(),
+)
+range_positions = match_ranges.positions(match_range)
+
+# Apply filters (range/division/opponent/H-A) and derive related views by match_id.
+# The SQLite history store evaluates them in the database when it holds this
+# snapshot's version; otherwise, or for a range (already a slice in memory),
+# filter in memory.
+# Results are memoized per data version and filter set, so plain reruns skip both.
+def _compute_match_views():
+    history = None if match_range.active else load_history_store(SPREADSHEET_KEY, data_snapshot)
+    if history is not None:
+        with history.reading(data_snapshot.version) as current:
+            if current:
+                return query_match_views(
+                    history,
+                    selected_season,
+                    div_only=div_only,
+                    opp_filter=opp_filter,
+                    ha_val=ha_val,
+                    opponents=data_snapshot.opponents,
+                )
+    filtered = apply_match_filters(
+        match_ranges.rows(range_positions) if match_range.active else matches,
+        div_only=div_only,
+        opp_filter=opp_filter,
+        ha_val=ha_val,
+        opponents=data_snapshot.opponents,
+    )
+    return (
+        filtered,
+        *derive_related_views(
+            matches_view=filtered,
+            events=events,
+            plays_simple=plays_simple,
+            goals_allowed=goals_allowed,
+        ),
+    )
 
-# Derive related views by match_id
-events_view, plays_view, ga_view = derive_related_views(
-    matches_view=matches_view,
-    events=events,
-    plays_simple=plays_simple,
-    goals_allowed=goals_allowed,
+
+matches_view, events_view, plays_view, ga_view = match_view_memo.get(
+    match_views_key(
+        data_snapshot.version,
+        selected_season,
+        div_only=div_only,
+        opp_filter=opp_filter,
+        ha_val=ha_val,
+        match_range=match_range,
+    ),
+    _compute_match_views,
 )
 
+# With no other match filter, the view is exactly the range, so its KPIs come
+# straight from the prefix sums.
+match_totals = None
+if not div_only and not opp_filter.strip() and ha_val not in ("h", "home", "a", "away"):
+    match_totals = match_ranges.totals(range_positions)
+
 # Drill-in param
 qp = _qparams_get()
 match_id = get_match_id(qp)
 
 # D2 rank (KPI only)
 our_rank = None
-if season_is_active(season_catalog, selected_season):
+if season_catalog.is_active(selected_season):
     try:
         rankings_html = fetch_html(MAXPREPS_RANKINGS_URL)
         our_rank = parse_maxpreps_division_rank(rankings_html)
@@ -1958,8 +1926,8 @@ ctx = AppContext(
     compact=compact,
     div_only=div_only,
     season_id=selected_season,
-    season_label=season_label(season_catalog, selected_season),
-    season_is_active=season_is_active(season_catalog, selected_season),
+    season_label=season_catalog.label(selected_season),
+    season_is_active=season_catalog.is_active(selected_season),
     matches=matches,
     players=players,
     events=events,
@@ -1972,6 +1940,9 @@ ctx = AppContext(
     ga_view=ga_view,
     match_id=match_id,
     our_rank=our_rank,
+    data_status=data_status(SPREADSHEET_KEY),
+    match_totals=match_totals,
+    player_stats=data_snapshot.player_stats(selected_season),
 )
 
 handlers = HomeHandlers(
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Mapping, Optional
 
 import pandas as pd
 
+from data.player_stats import PlayerMatchCube
+from loaders import DataStatus
+
 
 @dataclass(frozen=True)
 class AppContext:
@@ -34,3 +37,12 @@ class AppContext:
 
     # Enrichment
     our_rank: Optional[int]
+
+    # Data freshness
+    data_status: Optional[DataStatus] = None
+
+    # Range index totals for matches_view, when no other match filter applies
+    match_totals: Optional[Mapping[str, int]] = None
+
+    # Season's player-by-match totals; leaderboard, drilldown and AI slice it
+    player_stats: Optional[PlayerMatchCube] = None
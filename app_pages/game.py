@@ -8,11 +8,14 @@ All app-local helpers (query param reset, AI helpers, formatting) are injected.
 
 from __future__ import annotations
 
+from typing import Optional
 from urllib.parse import urlencode
 
 import pandas as pd
 import streamlit as st
 
+from data.player_stats import PlayerMatchCube
+
 
 def render_coach_notes_and_summary(
     *,
@@ -65,6 +68,7 @@ def render_game_drilldown(
     generate_ai_game_summary,
     ai_user_error_message,
     render_ai_debug,
+    player_stats: Optional[PlayerMatchCube] = None,
 ) -> None:
     row = matches.loc[matches["match_id"] == match_id]
     if row.empty:
@@ -118,27 +122,23 @@ def render_game_drilldown(
     else:
         st.info("📹 No game recording available for this match.")
 
-    by_player = events.query("match_id == @match_id").copy() if "match_id" in events.columns else pd.DataFrame()
+    # The season's player-by-match cube already holds this game's sums and roster details.
+    if player_stats is None:
+        player_stats = PlayerMatchCube(events, players)
+    by_player = player_stats.for_match(match_id)
     if by_player.empty:
         base = players[["player_id", "name", "jersey", "position"]].copy()
         base["shots"] = base["goals"] = base["assists"] = base["points"] = 0
         view = base[["jersey", "name", "position", "shots", "goals", "assists", "points"]]
     else:
-        sums = by_player.groupby("player_id", as_index=False)[["shots", "goals", "assists"]].sum()
-        sums["points"] = 2 * sums["goals"] + sums["assists"]
-        view = (
-            sums.set_index("player_id")
-            .join(players.set_index("player_id")[["name", "jersey", "position"]], how="left")
-            .fillna({"name": "Unknown", "position": "", "jersey": 0})
-        )
-        view = view.reset_index()[["jersey", "name", "position", "shots", "goals", "assists", "points"]]
+        view = by_player[["jersey", "name", "position", "shots", "goals", "assists", "points"]]
         view = view.sort_values(["points", "goals", "shots"], ascending=[False, False, False])
 
     st.subheader("Per-Player Breakdown")
     st.dataframe(view, width="stretch", hide_index=True)
 
     st.subheader("Set-Play Attempts (this game)")
-    sp = plays_df.query("match_id == @match_id") if not plays_df.empty else pd.DataFrame()
+    sp = plays_df.loc[plays_df["match_id"] == match_id] if not plays_df.empty else pd.DataFrame()
     if sp.empty:
         st.info("No set-play rows for this match.")
     else:
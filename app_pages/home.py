@@ -11,7 +11,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from html import escape
-from typing import Callable, Optional
+from typing import Callable, Mapping, Optional
 
 import pandas as pd
 import streamlit as st
@@ -21,6 +21,9 @@ from app_pages.home_tabs.goals_allowed import render_home_tab_goals_allowed
 from app_pages.home_tabs.leaders import render_home_tab_leaders
 from app_pages.home_tabs.set_pieces import render_home_tab_set_pieces
 from app_pages.home_tabs.trends import render_home_tab_trends
+from data.player_stats import PlayerMatchCube
+from data.views import match_view_memo
+from loaders import DataStatus, clear_caches
 
 
 @dataclass(frozen=True)
@@ -44,6 +47,39 @@ class HomeHandlers:
     render_ai_debug: Callable[..., None]
 
 
+def _format_age(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "unknown"
+    if seconds < 60:
+        return "under a minute"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60} min"
+
+
+def _format_bytes(n: int) -> str:
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024**2:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / 1024**2:.1f} MB"
+
+
+def _footprint_frame(data_status: DataStatus) -> pd.DataFrame:
+    rows = [
+        {
+            "Table": name,
+            "Rows": fp.rows,
+            "Before": _format_bytes(fp.expanded_bytes),
+            "After": _format_bytes(fp.compact_bytes),
+            "Saved": f"{1 - fp.compact_bytes / fp.expanded_bytes:.0%}" if fp.expanded_bytes else "",
+        }
+        for name, fp in data_status.footprint.items()
+    ]
+    return pd.DataFrame(rows, columns=["Table", "Rows", "Before", "After", "Saved"])
+
+
 def render_home(
     *,
     title: str,
@@ -61,6 +97,9 @@ def render_home(
     our_rank: Optional[int],
     compact: bool,
     handlers: HomeHandlers,
+    data_status: Optional[DataStatus] = None,
+    match_totals: Optional[Mapping[str, int]] = None,
+    player_stats: Optional[PlayerMatchCube] = None,
 ) -> None:
     st.markdown(
         f"""
@@ -82,11 +121,31 @@ def render_home(
         c4.metric("Plays", len(plays_simple))
         c5.metric("Summaries", len(summaries))
         c6.metric("Goals Allowed", len(goals_allowed))
-        st.caption("Sheets cached for up to 5 minutes. Use Refresh in sidebar to reload.")
+        st.caption("Sheets are re-checked for edits every minute and only re-read when changed. Use Refresh now to reload.")
+        if data_status is not None:
+            freshness = f"Data age: {_format_age(data_status.age_seconds)}"
+            if data_status.refreshing:
+                freshness += " · refreshing in the background"
+            st.caption(freshness)
+            if data_status.last_error:
+                st.caption(f"Last refresh failed, showing previous data: {data_status.last_error}")
+            for table, drift in data_status.header_drift.items():
+                changes = [f"missing {c}" for c in drift.missing] + [f"new {c}" for c in drift.unexpected]
+                st.warning(f"{table} header changed: {', '.join(changes) or 'columns reordered'}")
+            if data_status.footprint:
+                total = sum(fp.compact_bytes for fp in data_status.footprint.values())
+                st.caption(f"In memory: {_format_bytes(total)} (before is plain strings and 64-bit counts)")
+                st.dataframe(_footprint_frame(data_status), hide_index=True, width="stretch")
+        memo = match_view_memo.stats()
+        if memo.hit_rate is not None:
+            st.caption(
+                f"Filter cache: {memo.hit_rate:.0%} hit rate "
+                f"({memo.hits} hits, {memo.misses} misses, {memo.size}/{memo.maxsize} entries)"
+            )
         if "cache_cleared_at" in st.session_state:
             st.caption(f"Last manual refresh: {st.session_state['cache_cleared_at']}")
         if st.button("Refresh now"):
-            st.cache_data.clear()
+            clear_caches()
             st.rerun()
 
     handlers.team_kpis(
@@ -94,6 +153,7 @@ def render_home(
         d2_rank=our_rank,
         compact=compact,
         season_id=season_id,
+        totals=match_totals,
     )
 
     tab_labels = ["Games", "Trends", "Leaders", "Goals Allowed", "Set Pieces"]
@@ -116,6 +176,7 @@ def render_home(
             plays_view,
             ga_view,
             compact=compact,
+            player_stats=player_stats,
             render_games_table=handlers.render_games_table,
             generate_ai_team_analysis=handlers.generate_ai_team_analysis,
             ai_user_error_message=handlers.ai_user_error_message,
@@ -133,6 +194,7 @@ def render_home(
                 events_view,
                 players,
                 compact=compact,
+                player_stats=player_stats,
                 render_points_leaderboard=handlers.render_points_leaderboard,
             ),
             "Goals Allowed": lambda: render_home_tab_goals_allowed(
@@ -13,6 +13,7 @@ def render_home_tab_games(
     generate_ai_team_analysis,
     ai_user_error_message,
     render_ai_debug,
+    player_stats=None,
 ) -> None:
     # Refactor-only extraction: keep widget/layout order and session_state keys identical.
 
@@ -93,6 +94,7 @@ def render_home_tab_games(
                 events_view,
                 plays_view,
                 ga_view,
+                player_stats=player_stats,
             )
 
         # Add AI response to history
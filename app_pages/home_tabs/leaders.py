@@ -7,6 +7,7 @@ def render_home_tab_leaders(
     *,
     compact: bool,
     render_points_leaderboard,
+    player_stats=None,
 ) -> None:
     # Refactor-only extraction: preserve behavior by delegating to existing renderer.
-    render_points_leaderboard(events_view, players, top_n=5, compact=compact)
+    render_points_leaderboard(events_view, players, top_n=5, compact=compact, player_stats=player_stats)
@@ -1,6 +1,7 @@
-import altair as alt
 import streamlit as st
 
+from data.trends import DEFAULT_WINDOWS, TREND_METRICS, WINDOW_CHOICES, FormSettings
+
 
 def render_home_tab_trends(
     matches_view,
@@ -9,17 +10,35 @@ def render_home_tab_trends(
     build_comparison_trend_frame,
     build_individual_game_trends,
 ) -> None:
-    # NOTE: Keep widget/chart construction order identical to the original inline
-    # Trends tab block (refactor-only extraction).
+    import altair as alt  # Imported on first chart render to keep cold start light.
 
     if matches_view.empty:
         st.info("No games yet to build trends.")
     else:
-        # Comparison between all games vs last 3 games
-        comparison_df = build_comparison_trend_frame(matches_view)
-        individual_df = build_individual_game_trends(matches_view)
+        # Form settings; the keys are shared with the opponent prediction.
+        c1, c2 = st.columns([2, 1])
+        windows = c1.multiselect(
+            "Rolling windows (games)",
+            list(WINDOW_CHOICES),
+            default=list(DEFAULT_WINDOWS),
+            key="trend_windows",
+        )
+        halflife = c2.number_input(
+            "EWMA half-life (games, 0 = off)",
+            min_value=0.0,
+            max_value=10.0,
+            value=0.0,
+            step=0.5,
+            key="trend_halflife",
+        )
+        form = FormSettings(tuple(windows) or DEFAULT_WINDOWS, halflife or None)
+        recent_label = f"Last {form.primary} Games"
+
+        # Comparison between all games and each recent window
+        comparison_df = build_comparison_trend_frame(matches_view, form)
+        individual_df = build_individual_game_trends(matches_view, form)
 
-        st.subheader("All Games vs Last 3 Games Comparison")
+        st.subheader(f"All Games vs {recent_label} Comparison")
 
         # Display comparison table
         st.dataframe(
@@ -36,7 +55,7 @@ def render_home_tab_trends(
         # Melt the comparison data for better charting
         comparison_melted = comparison_df.melt(
             id_vars=["Metric"],
-            value_vars=["All Games", "Last 3 Games"],
+            value_vars=[c for c in comparison_df.columns if c not in ("Metric", "Difference")],
             var_name="Period",
             value_name="Value",
         )
@@ -46,6 +65,7 @@ def render_home_tab_trends(
             x=alt.X("Metric:N", title="Metric", axis=label_axis),
             y=alt.Y("Value:Q", title="Value"),
             color=alt.Color("Period:N", title="Period"),
+            xOffset="Period:N",
             tooltip=["Metric", "Period", "Value"],
         ).properties(height=h)
         st.altair_chart(comparison_chart, width="stretch")
@@ -53,23 +73,20 @@ def render_home_tab_trends(
         st.subheader("Individual Game Performance")
 
         # Individual game trends
-        for col, title in [
-            ("GF", "Goals For"),
-            ("GA", "Goals Against"),
-            ("Save%", "Save %"),
-            ("GF Conv%", "Conversion % (For)"),
-            ("GA Conv%", "Conversion % (Against)"),
-        ]:
-            # Create chart with different colors for last 3 games
+        for col, title in zip(
+            TREND_METRICS,
+            ["Goals For", "Goals Against", "Save %", "Conversion % (For)", "Conversion % (Against)"],
+        ):
+            # Create chart with different colors for the most recent games
             chart = alt.Chart(individual_df).mark_circle(size=60).encode(
                 x=alt.X("Game #:O", title="Game Number"),
                 y=alt.Y(f"{col}:Q", title=title),
                 color=alt.Color(
-                    "Last 3 Games:N",
+                    f"{recent_label}:N",
                     scale=alt.Scale(domain=[True, False], range=["#ff6b6b", "#4ecdc4"]),
-                    title="Last 3 Games",
+                    title=recent_label,
                 ),
-                tooltip=["Game #", "Date", "Opponent", col, "Last 3 Games"],
+                tooltip=["Game #", "Date", "Opponent", col, recent_label],
             ).properties(height=h)
 
             # Add trend line
@@ -78,5 +95,16 @@ def render_home_tab_trends(
                 y=alt.Y(f"{col}:Q"),
             ).properties(height=h)
 
-            final_chart = (chart + trend_line).resolve_scale(color="independent")
+            # One line per form series (rolling windows, EWMA)
+            form_columns = [c for c in individual_df.columns if c.endswith(f" {col}") and c != col]
+            form_lines = alt.Chart(individual_df).transform_fold(
+                form_columns, as_=["Series", "Form"]
+            ).mark_line(opacity=0.6).encode(
+                x=alt.X("Game #:O"),
+                y=alt.Y("Form:Q"),
+                color=alt.Color("Series:N", title="Form"),
+                strokeDash=alt.StrokeDash("Series:N", legend=None),
+            ).properties(height=h)
+
+            final_chart = (chart + trend_line + form_lines).resolve_scale(color="independent")
             st.altair_chart(final_chart, width="stretch")
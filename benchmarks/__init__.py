@@ -0,0 +1 @@
+# Micro-benchmarks (run from the repo root: python -m benchmarks.<name>).
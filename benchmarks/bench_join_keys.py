@@ -0,0 +1,149 @@
+"""Compare string join keys with the shared integer-coded keys.
+
+Times the three cross-table paths that match on match_id / player_id:
+deriving the related views, the points-leaderboard join, and the drilldown
+filter. Tables are scaled from a two-season baseline.
+
+Usage:
+    python -m benchmarks.bench_join_keys [--scales 1 10 100] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from data.schema import encode_join_keys
+from data.views import derive_related_views
+
+# Roughly two seasons of the current sheet.
+_BASE_ROWS = {"matches": 40, "players": 30, "events": 200, "plays_simple": 160, "goals_allowed": 60}
+
+
+def _synthetic_tables(scale: int, rnd: random.Random) -> dict[str, pd.DataFrame]:
+    rows = {name: count * scale for name, count in _BASE_ROWS.items()}
+    match_ids = [str(i) for i in range(rows["matches"])]
+    player_ids = [f"p{i}" for i in range(rows["players"])]
+
+    def pick(ids: list[str], n: int) -> pd.Series:
+        return pd.Series([rnd.choice(ids) for _ in range(n)], dtype="str")
+
+    return {
+        "matches": pd.DataFrame({"match_id": pd.Series(match_ids, dtype="str")}),
+        "players": pd.DataFrame(
+            {
+                "player_id": pd.Series(player_ids, dtype="str"),
+                "name": [f"Player {i}" for i in range(rows["players"])],
+                "jersey": range(rows["players"]),
+            }
+        ),
+        "events": pd.DataFrame(
+            {
+                "match_id": pick(match_ids, rows["events"]),
+                "player_id": pick(player_ids, rows["events"]),
+                "goals": [rnd.randint(0, 2) for _ in range(rows["events"])],
+                "assists": [rnd.randint(0, 2) for _ in range(rows["events"])],
+            }
+        ),
+        "plays_simple": pd.DataFrame({"match_id": pick(match_ids, rows["plays_simple"])}),
+        "goals_allowed": pd.DataFrame(
+            {
+                "match_id": pick(match_ids, rows["goals_allowed"]),
+                "goalie_player_id": pick(player_ids, rows["goals_allowed"]),
+            }
+        ),
+    }
+
+
+def _legacy_related_views(matches_view, events, plays_simple, goals_allowed):
+    keep = set(matches_view["match_id"].astype(str))
+    return (
+        events[events["match_id"].astype(str).isin(keep)],
+        plays_simple[plays_simple["match_id"].astype(str).isin(keep)],
+        goals_allowed[goals_allowed["match_id"].astype(str).isin(keep)],
+    )
+
+
+def _legacy_leaderboard(events, players):
+    ev = events.copy()
+    pl = players.copy()
+    ev["player_id"] = ev["player_id"].astype(str)
+    pl["player_id"] = pl["player_id"].astype(str)
+    agg = ev.groupby("player_id", as_index=False)[["goals", "assists"]].sum()
+    pidx = pl.set_index("player_id")[["name", "jersey"]].copy()
+    pidx.index = pidx.index.astype(str)
+    return agg.set_index("player_id").join(pidx, how="left")
+
+
+def _legacy_drilldown(events, match_id):
+    return events.query("match_id == @match_id")
+
+
+def _leaderboard(events, players):
+    agg = events.groupby("player_id", as_index=False)[["goals", "assists"]].sum()
+    return agg.set_index("player_id").join(players.set_index("player_id")[["name", "jersey"]], how="left")
+
+
+def _legacy_cases(tables: dict[str, pd.DataFrame]) -> dict[str, object]:
+    matches_view = tables["matches"].iloc[::2]
+    match_id = tables["matches"]["match_id"].iloc[len(tables["matches"]) // 2]
+    return {
+        "related views": lambda: _legacy_related_views(
+            matches_view, tables["events"], tables["plays_simple"], tables["goals_allowed"]
+        ),
+        "leaderboard": lambda: _legacy_leaderboard(tables["events"], tables["players"]),
+        "drilldown": lambda: _legacy_drilldown(tables["events"], match_id),
+    }
+
+
+def _cases(tables: dict[str, pd.DataFrame]) -> dict[str, object]:
+    matches_view = tables["matches"].iloc[::2]
+    match_id = tables["matches"]["match_id"].iloc[len(tables["matches"]) // 2]
+    return {
+        "related views": lambda: derive_related_views(
+            matches_view=matches_view,
+            events=tables["events"],
+            plays_simple=tables["plays_simple"],
+            goals_allowed=tables["goals_allowed"],
+        ),
+        "leaderboard": lambda: _leaderboard(tables["events"], tables["players"]),
+        "drilldown": lambda: tables["events"].loc[tables["events"]["match_id"] == match_id],
+    }
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'path':<14} {'scale':>5} {'events':>8} {'strings (ms)':>13} {'codes (ms)':>11} {'speedup':>8}")
+    for scale in args.scales:
+        strings = _synthetic_tables(scale, random.Random(7))
+        codes = {name: df.copy() for name, df in strings.items()}
+        encode_join_keys(codes)
+
+        current = _cases(codes)
+        for path, legacy_fn in _legacy_cases(strings).items():
+            legacy_s = _best_of(legacy_fn, args.repeat)
+            current_s = _best_of(current[path], args.repeat)
+            print(
+                f"{path:<14} {scale:>5} {len(strings['events']):>8} {legacy_s * 1e3:>13.2f} "
+                f"{current_s * 1e3:>11.2f} {legacy_s / current_s:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
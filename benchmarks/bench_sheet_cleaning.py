@@ -0,0 +1,171 @@
+"""Compare the original row/cell-wise cleaning with the current loaders.
+
+Usage:
+    python -m benchmarks.bench_sheet_cleaning [--rows 100000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from google_sheets_adapter import _values_to_df
+from loaders import _clean_table
+
+
+def _synthetic_matches(rows: int, rnd: random.Random) -> list[list[str]]:
+    values = [
+        [
+            "match_id", "season_id", "date", "opponent", "home_away", "division_game", "goals_for",
+            "goals_against", "shots", "shots_target", "shots_against", "shots_against_target", "saves",
+        ]
+    ]
+    for i in range(rows):
+        values.append(
+            [
+                str(i),
+                rnd.choice(["2025", "2026"]),
+                f"2026-09-{rnd.randint(1, 28):02d}",
+                f"Opponent {rnd.randrange(20)}",
+                rnd.choice(["H", "Away"]),
+                rnd.choice(["TRUE", "FALSE"]),
+                *(str(rnd.randint(0, 12)) for _ in range(7)),
+            ]
+        )
+    return values
+
+
+def _synthetic_events(rows: int, rnd: random.Random) -> list[list[str]]:
+    values = [["event_id", "season_id", "match_id", "player_id", "goals", "assists", "shots", "fouls"]]
+    for i in range(rows):
+        values.append(
+            [
+                f"e{i}",
+                f" {rnd.choice(['2025', '2026'])} ",
+                str(rnd.randrange(40)),
+                f"p{rnd.randrange(30)} ",
+                str(rnd.randint(0, 2)),
+                str(rnd.randint(0, 2)),
+                str(rnd.randint(0, 4)),
+                "",
+            ]
+        )
+    return values
+
+
+def _synthetic_plays(rows: int, rnd: random.Random) -> list[list[str]]:
+    values = [["match_id", "season_id", "set_piece", "play_call_id", "taker_id", "play type", "goal_created"]]
+    for _ in range(rows):
+        values.append(
+            [
+                str(rnd.randrange(40)),
+                rnd.choice(["2025", "2026"]),
+                rnd.choice([" corner", "Direct ", "fk indirect", "pk"]),
+                f"call{rnd.randrange(12)}",
+                f"p{rnd.randrange(30)}",
+                " set play ",
+                rnd.choice(["TRUE", "no", ""]),
+            ]
+        )
+    return values
+
+
+def _legacy_values_to_df(values: list) -> pd.DataFrame:
+    header, *rows = values
+    df = pd.DataFrame(rows, columns=[str(c).strip() for c in header])
+    return df.map(lambda x: x.strip() if isinstance(x, str) else x)
+
+
+def _legacy_clean_matches(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = df.columns.astype(str).str.strip()
+    df = df.rename(columns={"shots": "shots_for"})
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["division_game"] = df["division_game"].astype(str).str.lower().isin(["true", "1", "yes", "y", "t"])
+    df["home_away"] = df["home_away"].astype(str).str.lower().map({"h": "H", "home": "H", "a": "A", "away": "A"})
+    for c in ["goals_for", "goals_against", "shots_for", "shots_target", "shots_against", "shots_against_target", "saves"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
+    df["result"] = df.apply(
+        lambda r: "W" if r.goals_for > r.goals_against else ("L" if r.goals_for < r.goals_against else "D"), axis=1
+    )
+    df["match_id"] = df["match_id"].astype(str)
+    return df
+
+
+def _legacy_clean_events(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [c.strip().lower() for c in df.columns]
+    for k in ["event_id", "match_id", "player_id"]:
+        df[k] = df[k].astype(str)
+    for n in ["goals", "assists", "shots", "fouls"]:
+        df[n] = pd.to_numeric(df[n], errors="coerce").fillna(0).astype(int)
+    df["season_id"] = df["season_id"].astype(str).str.strip()
+    return df
+
+
+def _legacy_clean_plays(raw: pd.DataFrame) -> pd.DataFrame:
+    raw.columns = [c.lower().strip() for c in raw.columns]
+    raw = raw.rename(columns={"play type": "play_type"})
+    sp = raw["set_piece"].astype(str).str.strip().str.lower()
+    raw["set_piece"] = sp.replace(
+        {"direct": "fk_direct", "indirect": "fk_indirect", "fk direct": "fk_direct", "fk indirect": "fk_indirect"}
+    )
+    raw["taker_notes"] = raw["taker_id"].astype(str).fillna("")
+    raw["goal_created"] = (
+        raw["goal_created"]
+        .astype(str)
+        .str.strip()
+        .str.lower()
+        .map({"true": True, "yes": True, "y": True, "1": True, "no": False, "false": False, "0": False})
+        .fillna(False)
+    )
+    for k in ["match_id", "play_call_id", "play_type"]:
+        raw[k] = raw[k].astype(str).fillna("").str.strip()
+    raw["season_id"] = raw["season_id"].astype(str).str.strip()
+    return raw
+
+
+def _best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    cases = {
+        "matches": (
+            _synthetic_matches(args.rows, rnd),
+            lambda values: _legacy_clean_matches(_legacy_values_to_df(values)),
+            lambda values: _clean_table({"matches": _values_to_df(values)}, "matches"),
+        ),
+        "events": (
+            _synthetic_events(args.rows, rnd),
+            lambda values: _legacy_clean_events(_legacy_values_to_df(values)),
+            lambda values: _clean_table({"events": _values_to_df(values)}, "events"),
+        ),
+        "plays": (
+            _synthetic_plays(args.rows, rnd),
+            lambda values: _legacy_clean_plays(_legacy_values_to_df(values)),
+            lambda values: _clean_table({"plays": _values_to_df(values)}, "plays_simple"),
+        ),
+    }
+
+    print(f"{'tab':<8} {'rows':>8} {'original (s)':>13} {'current (s)':>15} {'speedup':>8}")
+    for tab, (values, legacy, current) in cases.items():
+        legacy_s = _best_of(lambda: legacy(values), args.repeat)
+        current_s = _best_of(lambda: current(values), args.repeat)
+        print(f"{tab:<8} {args.rows:>8} {legacy_s:>13.3f} {current_s:>15.3f} {legacy_s / current_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure the cold-start import time of app.py's module-level imports.
+
+Runs a fresh interpreter with ``-X importtime`` over every module app.py
+imports at module level and reports what each one costs. It also reports
+which packages the time is actually spent in, so a new top-level import of
+something heavy shows up.
+
+Usage:
+    python -m benchmarks.bench_startup [--top 12] [--budget 3.0]
+
+With ``--budget`` (seconds), exits non-zero if the imports take longer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import re
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def startup_imports(app_path: Path = REPO_ROOT / "app.py") -> list[str]:
+    """Return the modules an app script imports at module level, in order.
+
+    Imports inside functions are skipped: they are deferred until first use.
+    """
+
+    modules: list[str] = []
+
+    def visit(statements: list[ast.stmt]) -> None:
+        for node in statements:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules.append(node.module)
+            elif isinstance(node, (ast.Try, ast.If, ast.With)):
+                for block in (node.body, getattr(node, "orelse", []), getattr(node, "finalbody", [])):
+                    visit(block)
+                for handler in getattr(node, "handlers", []):
+                    visit(handler.body)
+
+    visit(ast.parse(app_path.read_text(encoding="utf-8")).body)
+    return list(dict.fromkeys(m for m in modules if m != "__future__"))
+
+
+def _importtime(code: str) -> list[tuple[int, int, int, str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, name))
+    return rows
+
+
+def measure_imports(modules: list[str]) -> list[tuple[int, int, int, str]]:
+    """Import ``modules`` in a fresh interpreter; return (self_us, cumulative_us, depth, name) rows.
+
+    Modules the bare interpreter loads at startup are left out.
+    """
+
+    interpreter = {row[3] for row in _importtime("pass")}
+    return [row for row in _importtime("\n".join(f"import {m}" for m in modules)) if row[3] not in interpreter]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=12, help="how many packages to list")
+    parser.add_argument("--budget", type=float, help="fail if imports take longer than this many seconds")
+    args = parser.parse_args()
+
+    modules = startup_imports()
+    rows = measure_imports(modules)
+
+    # Depth-0 rows are what app.py's own import statements triggered (first importer pays).
+    by_import: Counter[str] = Counter()
+    by_package: Counter[str] = Counter()
+    for self_us, cumulative_us, depth, name in rows:
+        root = name.split(".")[0]
+        if depth == 0:
+            by_import[root] += cumulative_us
+        by_package[root] += self_us
+    total_s = sum(by_import.values()) / 1e6
+
+    print(f"{'app.py import':<28} {'ms':>8}")
+    for root, us in by_import.most_common(args.top):
+        print(f"{root:<28} {us / 1000:>8.1f}")
+    print(f"\n{'time spent in package':<28} {'ms':>8}")
+    for root, us in by_package.most_common(args.top):
+        print(f"{root:<28} {us / 1000:>8.1f}")
+    print(f"\n{'total':<28} {total_s * 1000:>8.1f}")
+
+    if args.budget is not None and total_s > args.budget:
+        print(f"over budget: {total_s:.2f}s > {args.budget:.2f}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional, Sequence
+
+import pandas as pd
+
+
+HISTORY_FORMAT_VERSION = 1
+# Tables that grow with every season; seasons and players stay in memory.
+HISTORY_TABLES = ("matches", "events", "plays_simple", "goals_allowed", "summaries")
+_INDEXES = (("season_id", "match_id"), ("player_id",))
+_ROW_COLUMN = "_row"
+_META_TABLE = "_history_meta"
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """One pushed-down condition: ``eq``, ``in`` or case-insensitive ``contains``."""
+
+    column: str
+    op: str
+    value: object
+
+
+def _dtype_spec(series: pd.Series) -> dict:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return {"dtype": "category", "categories": [str(c) for c in series.cat.categories]}
+    return {"dtype": str(series.dtype)}
+
+
+def _parse_dtype(spec: dict):
+    if spec["dtype"] == "category":
+        return pd.CategoricalDtype(spec["categories"])
+    return spec["dtype"]
+
+
+def _restore_column(values: pd.Series, dtype) -> pd.Series:
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = dtype.categories.get_indexer(values)
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype, validate=False), index=values.index)
+    if dtype.startswith("datetime64"):
+        return pd.to_datetime(values).astype(dtype)
+    return values.astype(dtype)
+
+
+class HistoryStore:
+    """SQLite copy of the multi-season tables, queried with pushed-down filters.
+
+    ``sync`` writes a whole snapshot into a new database file and swaps it in
+    with ``os.replace``, so every query sees one consistent version. Rows come
+    back with the dtypes, categories and index labels they had in memory.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        # One read-only connection and its parsed metadata, shared by every
+        # query until the file is swapped for a newer sync. ``reading`` holds
+        # the (re-entrant) lock across several queries.
+        self._lock = threading.RLock()
+        self._pinned = False
+        self._conn: Optional[sqlite3.Connection] = None
+        self._schema_meta: dict = {}
+        self._file_id: Optional[tuple[int, int]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+
+    def _meta(self, conn: sqlite3.Connection) -> dict:
+        rows = conn.execute(f"SELECT key, value FROM {_META_TABLE}").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def _reader(self) -> tuple[sqlite3.Connection, dict]:
+        """Return the open connection and metadata, reopening after the file changed.
+
+        Call with ``_lock`` held. Inside ``reading`` the open file is kept
+        even if a sync has swapped in a newer one.
+        """
+        if self._pinned and self._conn is not None:
+            return self._conn, self._schema_meta
+        stat = os.stat(self.path)
+        file_id = (stat.st_ino, stat.st_mtime_ns)
+        if self._conn is None or file_id != self._file_id:
+            self._close_reader()
+            conn = self._connect()
+            try:
+                meta = self._meta(conn)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            # Column dtypes (and their category lists) are built once per file.
+            meta["dtypes"] = {
+                table: {column: _parse_dtype(spec) for column, spec in schema.items()}
+                for table, schema in meta.get("schemas", {}).items()
+            }
+            self._conn, self._schema_meta, self._file_id = conn, meta, file_id
+        return self._conn, self._schema_meta
+
+    def _close_reader(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        self._conn, self._schema_meta, self._file_id = None, {}, None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_reader()
+
+    @contextmanager
+    def reading(self, version: str) -> Iterator[bool]:
+        """Pin the store to one file for a series of queries.
+
+        Yields whether that file holds ``version``; callers fall back to the
+        in-memory tables when it does not. Other threads' queries wait until
+        the block ends.
+        """
+        with self._lock:
+            current = self.version() == version
+            self._pinned = current
+            try:
+                yield current
+            finally:
+                self._pinned = False
+
+    def version(self) -> Optional[str]:
+        """Return the snapshot version held by the store, or None if it has none."""
+        try:
+            with self._lock:
+                _, meta = self._reader()
+        except (OSError, sqlite3.Error):
+            return None
+        if meta.get("format") != HISTORY_FORMAT_VERSION:
+            return None
+        return meta.get("version")
+
+    def sync(self, tables: Mapping[str, pd.DataFrame], version: str) -> bool:
+        """Replace the stored tables unless they already hold ``version``."""
+
+        if self.version() == version:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        schemas = {}
+        try:
+            with closing(sqlite3.connect(tmp_path)) as conn:
+                for name in HISTORY_TABLES:
+                    if name not in tables:
+                        continue
+                    df = tables[name]
+                    df.to_sql(name, conn, index=True, index_label=_ROW_COLUMN)
+                    for columns in _INDEXES:
+                        if set(columns) <= set(df.columns):
+                            conn.execute(
+                                f'CREATE INDEX "ix_{name}_{"_".join(columns)}" ON "{name}" '
+                                f"({', '.join(columns)})"
+                            )
+                    schemas[name] = {column: _dtype_spec(df[column]) for column in df.columns}
+                conn.execute(f"CREATE TABLE {_META_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+                conn.executemany(
+                    f"INSERT INTO {_META_TABLE} VALUES (?, ?)",
+                    [
+                        ("format", json.dumps(HISTORY_FORMAT_VERSION)),
+                        ("version", json.dumps(version)),
+                        ("schemas", json.dumps(schemas)),
+                    ],
+                )
+                conn.commit()
+            os.replace(tmp_path, self.path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return True
+
+    def columns(self, table: str) -> list[str]:
+        """Return a stored table's columns, or an empty list if it is not stored."""
+        with self._lock:
+            _, meta = self._reader()
+            return list(meta["schemas"].get(table, {}))
+
+    def select(self, table: str, predicates: Iterable[Predicate] = ()) -> pd.DataFrame:
+        """Return the rows of ``table`` that satisfy every predicate."""
+
+        with self._lock:
+            conn, meta = self._reader()
+            schema, dtypes = meta["schemas"][table], meta["dtypes"][table]
+            clauses, params = _where(schema, predicates)
+            sql = f'SELECT * FROM "{table}"'
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            df = pd.read_sql_query(sql + f" ORDER BY {_ROW_COLUMN}", conn, params=params)
+        df = df.set_index(_ROW_COLUMN).rename_axis(None)
+        for column, dtype in dtypes.items():
+            df[column] = _restore_column(df[column], dtype)
+        return df
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _where(schema: Mapping[str, dict], predicates: Iterable[Predicate]) -> tuple[list[str], list]:
+    clauses: list[str] = []
+    params: list = []
+    for predicate in predicates:
+        if predicate.column not in schema:
+            raise KeyError(predicate.column)
+        column = f'"{predicate.column}"'
+        if predicate.op == "eq":
+            clauses.append(f"{column} = ?")
+            params.append(predicate.value)
+        elif predicate.op == "in":
+            values: Sequence = list(predicate.value)
+            if not values:
+                clauses.append("0")
+                continue
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        elif predicate.op == "contains":
+            # LIKE is case-insensitive for ASCII, like the in-memory filter.
+            clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(str(predicate.value))}%")
+        else:
+            raise ValueError(f"Unsupported predicate op: {predicate.op}")
+    return clauses, params
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
+import time
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 
 
@@ -19,12 +23,58 @@ MAXPREPS_RANKINGS_URL = (
 MAXPREPS_MILTON_SCHOOL_ID = "5aee9a87-4784-4552-9902-7fecbbf920d0"
 MAXPREPS_D2_CONTEXT = "Vermont Division II"
 
+# Fetched pages are kept on disk so a warmup run can prefetch them for the server.
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", os.path.join(".cache", "pages"))
+PAGE_MAX_AGE_SECONDS = 3600
+
 _NEXT_DATA_PATTERN = re.compile(
     r'<script[^>]+id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
     flags=re.IGNORECASE | re.DOTALL,
 )
 
 
+def _page_cache_path(cache_dir: str | os.PathLike, url: str) -> Path:
+    return Path(cache_dir) / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.html"
+
+
+def fetch_page(
+    url: str,
+    *,
+    cache_dir: str | os.PathLike = PAGE_CACHE_DIR,
+    max_age_seconds: float = PAGE_MAX_AGE_SECONDS,
+) -> str:
+    """Return a page's HTML, reusing the copy on disk if it is recent enough."""
+
+    path = _page_cache_path(cache_dir, url)
+    try:
+        if time.time() - path.stat().st_mtime < max_age_seconds:
+            return path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    import requests  # Only needed on a cache miss.
+
+    response = requests.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
+    response.raise_for_status()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(response.text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The cache is best-effort; the fetched page is still returned.
+    return response.text
+
+
+def clear_page_cache(cache_dir: str | os.PathLike = PAGE_CACHE_DIR) -> None:
+    """Delete every cached page so the next ``fetch_page`` goes to the network."""
+
+    for path in Path(cache_dir).glob("*.html"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
 def _page_props(page_html: str) -> dict:
     if not page_html:
         return {}
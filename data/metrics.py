@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import asdict, dataclass
+from typing import Mapping
+
+import numpy as np
 import pandas as pd
 
+from data.views import RANGE_TOTAL_COLUMNS, LruMemo, view_fingerprint
+
 
 def _numeric_total(dataframe: pd.DataFrame, column: str) -> float:
     if dataframe is None or dataframe.empty or column not in dataframe.columns:
@@ -12,10 +18,17 @@ def _numeric_total(dataframe: pd.DataFrame, column: str) -> float:
 def calculate_shot_on_target_percentages(matches: pd.DataFrame) -> tuple[float, float]:
     """Return team and opponent shots-on-target percentages for a match set."""
 
-    total_shots = _numeric_total(matches, "shots_for")
-    shots_on_target = _numeric_total(matches, "shots_target")
-    total_shots_against = _numeric_total(matches, "shots_against")
-    shots_on_target_against = _numeric_total(matches, "shots_against_target")
+    columns = ("shots_for", "shots_target", "shots_against", "shots_against_target")
+    return shot_on_target_percentages({column: _numeric_total(matches, column) for column in columns})
+
+
+def shot_on_target_percentages(totals: Mapping[str, float]) -> tuple[float, float]:
+    """Return the same percentages from precomputed shot totals."""
+
+    total_shots = totals.get("shots_for", 0)
+    shots_on_target = totals.get("shots_target", 0)
+    total_shots_against = totals.get("shots_against", 0)
+    shots_on_target_against = totals.get("shots_against_target", 0)
 
     shots_on_target_pct = shots_on_target / total_shots * 100.0 if total_shots > 0 else 0.0
     shots_on_target_against_pct = (
@@ -24,3 +37,107 @@ def calculate_shot_on_target_percentages(matches: pd.DataFrame) -> tuple[float,
         else 0.0
     )
     return shots_on_target_pct, shots_on_target_against_pct
+
+
+@dataclass(frozen=True)
+class TeamKpis:
+    """Team totals for one filtered matches view, and the rates derived from them.
+
+    The KPI header, the AI prompts and the KPI export all read this one
+    aggregate, so they cannot disagree about a view's numbers.
+    """
+
+    games: int = 0
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    shots_for: int = 0
+    shots_target: int = 0
+    shots_against: int = 0
+    shots_against_target: int = 0
+    saves: int = 0
+
+    @classmethod
+    def from_matches(cls, matches: pd.DataFrame) -> TeamKpis:
+        """Sum every count column in one reduction over the view's numeric block.
+
+        The schema has already coerced these columns to numbers; missing
+        columns and blanks count as zero.
+        """
+
+        if matches is None or matches.empty:
+            return cls()
+        block = matches.reindex(columns=list(RANGE_TOTAL_COLUMNS))
+        sums = np.nansum(block.to_numpy(dtype=float, na_value=np.nan), axis=0)
+        results = matches["result"].value_counts() if "result" in matches.columns else pd.Series(dtype="int64")
+        return cls(
+            games=len(matches),
+            wins=int(results.get("W", 0)),
+            losses=int(results.get("L", 0)),
+            draws=int(results.get("D", 0)),
+            **{column: int(total) for column, total in zip(RANGE_TOTAL_COLUMNS, sums)},
+        )
+
+    @classmethod
+    def from_totals(cls, totals: Mapping[str, int]) -> TeamKpis:
+        """Build from ``MatchRangeIndex.totals``, which already holds every count."""
+
+        return cls(**{name: int(totals.get(name, 0)) for name in cls.__dataclass_fields__})
+
+    @property
+    def record(self) -> str:
+        if not self.games:
+            return "0-0"
+        if self.draws:
+            return f"{self.wins}-{self.losses}-{self.draws}"
+        return f"{self.wins}-{self.losses}"
+
+    @property
+    def save_pct(self) -> float:
+        faced = self.saves + self.goals_against
+        return self.saves / faced * 100.0 if faced > 0 else 0.0
+
+    @property
+    def conv_for_pct(self) -> float:
+        return self.goals_for / self.shots_for * 100.0 if self.shots_for > 0 else 0.0
+
+    @property
+    def conv_against_pct(self) -> float:
+        return self.goals_against / self.shots_against * 100.0 if self.shots_against > 0 else 0.0
+
+    @property
+    def shots_target_pcts(self) -> tuple[float, float]:
+        """Team and opponent shots-on-target percentages."""
+        return shot_on_target_percentages(asdict(self))
+
+    def as_dict(self) -> dict[str, object]:
+        """Counts plus record and rates, for AI prompts and exports."""
+
+        shots_target_pct, shots_against_target_pct = self.shots_target_pcts
+        return {
+            **asdict(self),
+            "record": self.record,
+            "save_pct": round(self.save_pct, 1),
+            "conv_for_pct": round(self.conv_for_pct, 1),
+            "conv_against_pct": round(self.conv_against_pct, 1),
+            "shots_target_pct": round(shots_target_pct, 1),
+            "shots_against_target_pct": round(shots_against_target_pct, 1),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """One-row frame of ``as_dict`` for the CSV export."""
+        return pd.DataFrame([self.as_dict()])
+
+
+# Keyed by the fingerprint of the columns the totals read, so every caller
+# holding the same games shares one aggregate.
+_KPI_COLUMNS = (*RANGE_TOTAL_COLUMNS, "result")
+kpi_memo = LruMemo(maxsize=16)
+
+
+def team_kpis(matches: pd.DataFrame) -> TeamKpis:
+    """Return the (memoized) KPI bundle for a filtered matches view."""
+
+    return kpi_memo.get(view_fingerprint(matches, _KPI_COLUMNS), lambda: TeamKpis.from_matches(matches))
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import bisect
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Iterable, Optional
+
+import pandas as pd
+
+
+# Lookups below this similarity are treated as different teams.
+FUZZY_CUTOFF = 0.85
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_APOSTROPHES = re.compile(r"['’]")
+_TOKEN_ALIASES = {"saint": "st", "mount": "mt", "mtn": "mt"}
+# Words the sheet and MaxPreps add or drop freely around the same school.
+_FILLER_TOKENS = frozenset({"the", "high", "school", "hs", "union", "varsity", "boys", "soccer"})
+# Fuzzy candidates share at least this much of a token's start.
+_FUZZY_PREFIX = 2
+
+
+def team_tokens(name: object) -> tuple[str, ...]:
+    """Split a team name into normalized tokens.
+
+    "BFA-St. Albans", "BFA St Albans" and "B.F.A. Saint Albans High School"
+    differ only in punctuation, case and filler words, so they tokenize the
+    same way.
+    """
+
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return ()
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    raw: list[str] = []
+    in_acronym = False
+    for token in _TOKEN_PATTERN.findall(_APOSTROPHES.sub("", text.casefold())):
+        single_letter = len(token) == 1 and token.isalpha()
+        if single_letter and in_acronym:
+            # Dotted acronyms ("B.F.A.") rejoin into one token ("bfa").
+            raw[-1] += token
+        else:
+            raw.append(_TOKEN_ALIASES.get(token, token))
+        in_acronym = single_letter
+    tokens = tuple(token for token in raw if token not in _FILLER_TOKENS)
+    return tokens or tuple(raw)
+
+
+def team_id(name: object) -> str:
+    """Return the canonical id for a team name ("" for a blank name)."""
+
+    return "-".join(team_tokens(name))
+
+
+class OpponentRegistry:
+    """Opponent names mapped to canonical team ids through a token index.
+
+    Built once per snapshot from the sheet's opponent column (see
+    ``DataSnapshot.opponents``). ``match`` resolves a query, whether it is
+    typed in the sidebar, copied from the sheet or scraped from MaxPreps, to
+    team ids: an exact id is a dictionary lookup, a partial name is a prefix
+    search over the sorted tokens, and anything else falls back to a fuzzy
+    comparison with the few teams that share a token prefix.
+    """
+
+    def __init__(self, names: Iterable[object] = ()):
+        self._tokens_by_team: dict[str, tuple[str, ...]] = {}
+        self._spellings: dict[str, list[str]] = {}
+        self._teams_by_token: dict[str, set[str]] = {}
+        # "U-32" and "U32" share one spacing-free key.
+        self._teams_by_compact: dict[str, str] = {}
+        for name in names:
+            tokens = team_tokens(name)
+            if not tokens:
+                continue
+            canonical = "-".join(tokens)
+            spellings = self._spellings.setdefault(canonical, [])
+            if str(name) not in spellings:
+                spellings.append(str(name))
+            if canonical not in self._tokens_by_team:
+                self._tokens_by_team[canonical] = tokens
+                self._teams_by_compact.setdefault("".join(tokens), canonical)
+                for token in tokens:
+                    self._teams_by_token.setdefault(token, set()).add(canonical)
+        self._sorted_tokens = sorted(self._teams_by_token)
+
+    @classmethod
+    def from_series(cls, names: Optional[pd.Series]) -> OpponentRegistry:
+        if names is None or names.empty:
+            return cls()
+        return cls(names.dropna().unique())
+
+    def __len__(self) -> int:
+        return len(self._tokens_by_team)
+
+    def __contains__(self, canonical: object) -> bool:
+        return canonical in self._tokens_by_team
+
+    def teams(self) -> list[str]:
+        return list(self._tokens_by_team)
+
+    def name(self, canonical: str) -> str:
+        """Return the first spelling the sheet used for a team."""
+        return self._spellings[canonical][0]
+
+    def spellings(self, canonicals: Iterable[str]) -> list[str]:
+        """Return every raw spelling of the given teams, for ``isin`` filters."""
+        return [spelling for canonical in canonicals for spelling in self._spellings.get(canonical, ())]
+
+    def _teams_with_prefix(self, prefix: str) -> set[str]:
+        teams: set[str] = set()
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            teams |= self._teams_by_token[token]
+        return teams
+
+    def resolve(self, name: object) -> Optional[str]:
+        """Return the one team a full name refers to, or None.
+
+        An exact canonical id (or the same id without spaces) wins; otherwise
+        the closest team sharing a token prefix is accepted if its name
+        contains every query token ("BFA-St. Albans Comets" is not; "Rice" is
+        for "Rice Memorial") or the names are at least ``FUZZY_CUTOFF``
+        similar. A candidate whose tokens are only a subset of the query's is
+        a different school ("Burlington" for "South Burlington") unless it is
+        that similar.
+        """
+
+        tokens = team_tokens(name)
+        if not tokens:
+            return None
+        canonical = "-".join(tokens)
+        if canonical in self._tokens_by_team:
+            return canonical
+        if "".join(tokens) in self._teams_by_compact:
+            return self._teams_by_compact["".join(tokens)]
+
+        candidates: set[str] = set()
+        for token in tokens:
+            candidates |= self._teams_with_prefix(token[:_FUZZY_PREFIX])
+        query = " ".join(tokens)
+        best, best_score = None, (False, 0.0)
+        for candidate in sorted(candidates):
+            candidate_tokens = self._tokens_by_team[candidate]
+            contained = set(tokens) <= set(candidate_tokens)
+            score = (contained, SequenceMatcher(None, query, " ".join(candidate_tokens)).ratio())
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is not None and (best_score[0] or best_score[1] >= FUZZY_CUTOFF):
+            return best
+        return None
+
+    def match(self, query: object) -> frozenset[str]:
+        """Return the teams a (possibly partial) name refers to.
+
+        Every query token must start one of a team's tokens, so "rice" finds
+        "Rice Memorial" and "st alb" finds "BFA-St. Albans". A query that no
+        team covers token by token goes through ``resolve``.
+        """
+
+        tokens = team_tokens(query)
+        if not tokens:
+            return frozenset()
+        teams: Optional[set[str]] = None
+        for token in tokens:
+            found = self._teams_with_prefix(token)
+            teams = found if teams is None else teams & found
+            if not teams:
+                break
+        if teams:
+            return frozenset(teams)
+        resolved = self.resolve(query)
+        return frozenset({resolved}) if resolved else frozenset()
+
+
+def opponent_mask(
+    opponents: pd.Series,
+    query: object,
+    *,
+    registry: Optional[OpponentRegistry] = None,
+) -> pd.Series:
+    """Return which rows' opponent is one of the teams ``query`` matches.
+
+    ``registry`` should be the snapshot's prebuilt one; without it, one is
+    built from the distinct values of ``opponents``.
+    """
+
+    if registry is None:
+        registry = OpponentRegistry.from_series(opponents)
+    return opponents.isin(registry.spellings(registry.match(query)))
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Optional
+
+import pandas as pd
+
+from data.views import key_isin
+
+
+# Per-event counts summed into the cube, in leaderboard order.
+STAT_COLUMNS = ("goals", "assists", "shots", "fouls")
+ROSTER_COLUMNS = ("name", "jersey", "position")
+_ROSTER_DEFAULTS = {"name": "Unknown", "jersey": 0, "position": ""}
+_LEADERBOARD_ORDER = (["points", "goals", "assists", "jersey"], [False, False, False, True])
+
+
+def _roster_frame(players: Optional[pd.DataFrame]) -> pd.DataFrame:
+    if players is None or players.empty or "player_id" not in players.columns:
+        return pd.DataFrame(columns=list(ROSTER_COLUMNS), index=pd.Index([], name="player_id"))
+    roster = players.dropna(subset=["player_id"]).drop_duplicates("player_id")
+    return roster.set_index("player_id").reindex(columns=list(ROSTER_COLUMNS))
+
+
+class PlayerMatchCube:
+    """Event totals per player and match for one season, with roster details joined.
+
+    Built once per snapshot and season (see ``DataSnapshot.player_stats``).
+    Rows are sorted by match, then player, so one game's breakdown is a
+    slice found with a dictionary lookup; leaderboards and top scorers sum
+    the rows of the matches in view instead of re-reading the events.
+    """
+
+    def __init__(self, events: Optional[pd.DataFrame], players: Optional[pd.DataFrame]):
+        roster = _roster_frame(players)
+        if events is None or events.empty or not {"match_id", "player_id"}.issubset(events.columns):
+            events = pd.DataFrame(columns=["match_id", "player_id", *STAT_COLUMNS])
+        keys = events[["match_id", "player_id"]]
+        # Snapshot tables share one player_id encoding; other inputs compare as strings.
+        if keys["player_id"].dtype != roster.index.dtype:
+            keys = keys.assign(player_id=keys["player_id"].astype(str))
+            roster.index = roster.index.astype(str)
+        counts = events.reindex(columns=list(STAT_COLUMNS)).apply(pd.to_numeric, errors="coerce").fillna(0)
+        cube = (
+            pd.concat([keys, counts.astype("int64")], axis=1)
+            .groupby(["match_id", "player_id"], observed=True, sort=True)
+            .sum()
+            .reset_index()
+        )
+        cube["points"] = 2 * cube["goals"] + cube["assists"]
+        cube = cube.join(roster, on="player_id").fillna(_ROSTER_DEFAULTS)
+
+        self.frame = cube
+        self._roster = roster
+        self._match_rows = {
+            str(match_id): slice(rows[0], rows[-1] + 1)
+            for match_id, rows in cube.groupby("match_id", observed=True, sort=False).indices.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def for_match(self, match_id: object) -> pd.DataFrame:
+        """One game's per-player rows (empty if nobody recorded an event)."""
+        rows = self._match_rows.get(str(match_id))
+        return self.frame.iloc[rows] if rows is not None else self.frame.iloc[0:0]
+
+    def _player_totals(self, match_ids: Optional[pd.Series]) -> pd.DataFrame:
+        if match_ids is None:
+            return self._season_totals
+        rows = self.frame[key_isin(self.frame["match_id"], match_ids)]
+        if len(rows) == len(self.frame):
+            return self._season_totals
+        return self._sum_by_player(rows)
+
+    @cached_property
+    def _season_totals(self) -> pd.DataFrame:
+        return self._sum_by_player(self.frame)
+
+    def _sum_by_player(self, rows: pd.DataFrame) -> pd.DataFrame:
+        columns = [*STAT_COLUMNS, "points"]
+        totals = rows.groupby("player_id", observed=True, sort=True)[columns].sum()
+        totals = totals.join(self._roster).fillna(_ROSTER_DEFAULTS)
+        return totals.reset_index()[["player_id", *ROSTER_COLUMNS, *columns]]
+
+    def leaderboard(self, match_ids: Optional[pd.Series] = None) -> pd.DataFrame:
+        """Per-player totals over the given matches (all of them by default), best first."""
+        by, ascending = _LEADERBOARD_ORDER
+        return self._player_totals(match_ids).sort_values(by, ascending=ascending)
+
+    def top_scorers(self, n: int = 5, match_ids: Optional[pd.Series] = None) -> pd.DataFrame:
+        """The ``n`` players with the most goals, selected without sorting everyone."""
+        return self._player_totals(match_ids).nlargest(n, "goals", keep="first")
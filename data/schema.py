@@ -0,0 +1,404 @@
+"""Declarative sheet schemas and the shared coercion routine.
+
+Every worksheet the dashboard reads is described once here: canonical column
+names, header aliases, dtypes, defaults for missing columns and explicit date
+formats. ``compile_schema`` turns a description into a single-pass cleaner
+that all loaders share, and header fingerprints flag when a sheet's header
+row drifts from the documented contract (docs/SHEET_SCHEMA_SNAPSHOT.md).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+
+TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+
+# Formats the Sheets API renders dates in, tried in order before falling back
+# to per-value inference for anything left over.
+SHEET_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y %H:%M:%S")
+
+# Text columns become categoricals only when they repeat this much.
+CATEGORY_MAX_RATIO = 0.5
+
+
+def parse_bool(series: pd.Series) -> pd.Series:
+    """Parse sheet-style truthy strings (TRUE, yes, 1, ...) into booleans."""
+    return series.astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+
+
+def parse_dates(series: pd.Series, formats: tuple[str, ...] = SHEET_DATE_FORMATS) -> pd.Series:
+    """Parse dates against explicit formats instead of inferring per element."""
+    text = series.astype(str).str.strip()
+    parsed = pd.to_datetime(text, format=formats[0], errors="coerce")
+    for fmt in formats[1:]:
+        pending = parsed.isna() & text.ne("")
+        if not pending.any():
+            return parsed
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors="coerce")
+    leftover = parsed.isna() & text.ne("") & ~text.str.lower().isin(["nan", "none", "nat"])
+    if leftover.any():
+        parsed[leftover] = pd.to_datetime(text[leftover], format="mixed", errors="coerce")
+    return parsed
+
+
+def compact_int_dtype(low: int, high: int) -> np.dtype:
+    """Smallest of int16/int32/int64 holding ``[low, high]``.
+
+    int8 is skipped on purpose: sheet counts are summed and differenced
+    element-wise downstream, and int16 leaves room for that.
+    """
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def coerce_int_block(block: pd.DataFrame) -> pd.DataFrame:
+    """Coerce several count columns to integers in one pass.
+
+    The whole block is parsed by a single ``pd.to_numeric`` call; blanks and
+    junk become 0 and fractions are truncated, as ``astype(int)`` did.
+    """
+    flat = pd.to_numeric(pd.Series(block.to_numpy(dtype=object).ravel()), errors="coerce")
+    values = flat.to_numpy(dtype=float, na_value=0.0)
+    values = np.trunc(np.where(np.isfinite(values), values, 0.0)).reshape(block.shape)
+    dtype = compact_int_dtype(int(values.min()), int(values.max())) if values.size else np.dtype(np.int16)
+    return pd.DataFrame(values.astype(dtype), index=block.index, columns=block.columns)
+
+
+def to_category(series: pd.Series) -> pd.Series:
+    """Store a repetitive text column as a categorical.
+
+    Columns whose distinct values exceed ``CATEGORY_MAX_RATIO`` of the rows
+    stay plain strings, where a categorical would only add overhead.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.empty:
+        return series
+    if series.nunique(dropna=True) > len(series) * CATEGORY_MAX_RATIO:
+        return series
+    return series.astype("category")
+
+
+@dataclass(frozen=True)
+class TableFootprint:
+    rows: int
+    # Bytes as plain strings / int64, and as actually stored.
+    expanded_bytes: int
+    compact_bytes: int
+
+
+def memory_footprint(df: pd.DataFrame) -> TableFootprint:
+    """Measure a table's memory, and what it would take without compaction."""
+    compact = int(df.memory_usage(index=True, deep=True).sum())
+    expanded = int(df.index.memory_usage(deep=True))
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            expanded += int(column.astype(object).memory_usage(index=False, deep=True))
+        elif pd.api.types.is_integer_dtype(column.dtype):
+            expanded += len(column) * 8
+        else:
+            expanded += int(column.memory_usage(index=False, deep=True))
+    return TableFootprint(rows=len(df), expanded_bytes=expanded, compact_bytes=compact)
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    kind: str = "str"  # str | lower | int | float | bool | date; ints are coerced together
+    aliases: tuple[str, ...] = ()
+    # Created with this value when the sheet lacks the column; None leaves it absent.
+    default: object = None
+    # Lower-cased value replacements; with ``strict`` unmapped values become NaN.
+    values: Optional[Mapping[str, object]] = None
+    strict: bool = False
+    date_formats: tuple[str, ...] = SHEET_DATE_FORMATS
+    # Store as a pandas categorical when the column's values repeat enough.
+    categorical: bool = False
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    name: str
+    worksheets: tuple[str, ...]
+    columns: tuple[Column, ...]
+    # Documented header row, used to detect drift.
+    header: tuple[str, ...] = ()
+    # Missing worksheet yields an empty frame instead of an error.
+    optional: bool = False
+    # Drop columns that are not declared (in declaration order).
+    keep_declared_only: bool = False
+    # Columns of the empty frame returned for a missing optional worksheet.
+    empty_columns: tuple[str, ...] = ()
+
+    def empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=list(self.empty_columns))
+
+
+@dataclass(frozen=True)
+class HeaderDrift:
+    table: str
+    expected: str
+    actual: str
+    missing: tuple[str, ...]
+    unexpected: tuple[str, ...]
+
+
+def normalize_header(columns) -> list[str]:
+    return [str(column).strip().lower() for column in columns]
+
+
+def header_fingerprint(columns) -> str:
+    """Return a short, order-sensitive fingerprint of a header row."""
+    joined = "\x1f".join(normalize_header(columns))
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:12]
+
+
+def detect_header_drift(schema: TableSchema, columns) -> Optional[HeaderDrift]:
+    """Compare a sheet's header row against the documented one."""
+    if not schema.header:
+        return None
+    expected = header_fingerprint(schema.header)
+    actual = header_fingerprint(columns)
+    if expected == actual:
+        return None
+    found = normalize_header(columns)
+    return HeaderDrift(
+        table=schema.name,
+        expected=expected,
+        actual=actual,
+        missing=tuple(c for c in schema.header if c not in found),
+        unexpected=tuple(c for c in found if c not in schema.header),
+    )
+
+
+class CompiledSchema:
+    """A schema pre-resolved into a single-pass column coercion routine."""
+
+    def __init__(self, schema: TableSchema):
+        self.schema = schema
+        self._columns = schema.columns
+        self._declared = [column.name for column in schema.columns]
+        self._categorical = [column.name for column in schema.columns if column.categorical]
+
+    def __call__(self, raw: pd.DataFrame) -> pd.DataFrame:
+        df = raw.copy()
+        df.columns = normalize_header(df.columns)
+
+        renames = {}
+        for column in self._columns:
+            if column.name in df.columns:
+                continue
+            source = next((alias for alias in column.aliases if alias in df.columns), None)
+            if source is not None:
+                renames[source] = column.name
+        if renames:
+            df = df.rename(columns=renames)
+
+        int_columns = []
+        for column in self._columns:
+            if column.name not in df.columns:
+                if column.default is None:
+                    continue
+                df[column.name] = column.default
+            if column.kind == "int":
+                int_columns.append(column.name)
+            else:
+                df[column.name] = self._coerce(df[column.name], column)
+        if int_columns:
+            df[int_columns] = coerce_int_block(df[int_columns])
+        for name in self._categorical:
+            if name in df.columns:
+                df[name] = to_category(df[name])
+
+        if self.schema.keep_declared_only:
+            df = df[[name for name in self._declared if name in df.columns]].copy()
+        return df
+
+    @staticmethod
+    def _coerce(series: pd.Series, column: Column) -> pd.Series:
+        kind = column.kind
+        if kind == "float":
+            return pd.to_numeric(series, errors="coerce")
+        if kind == "bool":
+            if column.values is not None:
+                lowered = series.astype(str).str.strip().str.lower()
+                return lowered.map(column.values).fillna(False).astype(bool)
+            return parse_bool(series)
+        if kind == "date":
+            return parse_dates(series, column.date_formats)
+
+        text = series.astype(str)
+        if kind == "lower":
+            text = text.str.lower()
+        if column.values is not None:
+            return text.map(column.values) if column.strict else text.replace(dict(column.values))
+        return text
+
+
+def compile_schema(schema: TableSchema) -> CompiledSchema:
+    return CompiledSchema(schema)
+
+
+_SEASON_ID = Column("season_id", categorical=True)
+_MATCH_ID = Column("match_id", categorical=True)
+
+SCHEMAS: dict[str, TableSchema] = {
+    "seasons": TableSchema(
+        name="seasons",
+        worksheets=("seasons",),
+        columns=(_SEASON_ID,),
+        header=("season_id", "label", "active"),
+        optional=True,
+        empty_columns=("season_id", "label", "active"),
+    ),
+    "matches": TableSchema(
+        name="matches",
+        worksheets=("matches",),
+        columns=(
+            Column("match_id"),
+            _SEASON_ID,
+            Column("date", kind="date"),
+            Column("opponent", categorical=True),
+            Column("division_game", kind="bool"),
+            Column(
+                "home_away",
+                kind="lower",
+                values={"h": "H", "home": "H", "a": "A", "away": "A"},
+                strict=True,
+                categorical=True,
+            ),
+            Column("goals_for", kind="int"),
+            Column("goals_against", kind="int"),
+            Column("shots_for", kind="int", aliases=("shots",)),
+            Column("shots_target", kind="int"),
+            Column("shots_against", kind="int"),
+            Column("shots_against_target", kind="int"),
+            Column("saves", kind="int"),
+        ),
+        header=(
+            "match_id", "season_id", "date", "opponent", "home_away", "division_game", "result",
+            "goals_for", "goals_against", "shots", "shots_target", "shots_against",
+            "shots_against_target", "saves", "url",
+        ),
+    ),
+    "players": TableSchema(
+        name="players",
+        worksheets=("players",),
+        columns=(
+            Column("player_id"),
+            Column("player_status", kind="lower"),
+            Column("jersey", kind="int"),
+            _SEASON_ID,
+        ),
+        header=("player_id", "player_status", "name", "position", "jersey"),
+    ),
+    "events": TableSchema(
+        name="events",
+        worksheets=("events",),
+        columns=(
+            Column("event_id"),
+            _SEASON_ID,
+            _MATCH_ID,
+            Column("player_id", categorical=True),
+            Column("goals", kind="int", default=0),
+            Column("assists", kind="int", aliases=("assist",), default=0),
+            Column("shots", kind="int", default=0),
+            Column("fouls", kind="int", default=0),
+        ),
+        header=("event_id", "season_id", "match_id", "player_id", "goals", "assists", "shots", "fouls"),
+    ),
+    "plays_simple": TableSchema(
+        name="plays_simple",
+        worksheets=("plays",),
+        columns=(
+            _SEASON_ID,
+            _MATCH_ID,
+            Column(
+                "set_piece",
+                kind="lower",
+                values={
+                    "direct": "fk_direct",
+                    "indirect": "fk_indirect",
+                    "fk direct": "fk_direct",
+                    "fk indirect": "fk_indirect",
+                },
+                categorical=True,
+            ),
+            Column("play_call_id", categorical=True),
+            Column("play_type", aliases=("play type",), categorical=True),
+            Column("taker_notes", aliases=("taker_id",), default=""),
+            Column(
+                "goal_created",
+                kind="bool",
+                values={"true": True, "yes": True, "y": True, "1": True, "no": False, "false": False, "0": False},
+            ),
+        ),
+        header=("match_id", "season_id", "set_piece", "play_call_id", "taker_id", "play type", "goal_created"),
+        optional=True,
+        keep_declared_only=True,
+    ),
+    "summaries": TableSchema(
+        name="summaries",
+        worksheets=("summary", "summaries"),
+        columns=(Column("match_id"), _SEASON_ID),
+        header=(
+            "match_id", "season_id", "opp_formation", "our_formation", "opp_style_notes",
+            "opp_key_players", "opp_seniors_count", "next_year_players_to_watch",
+            "our_player_of_game", "injuries_absences", "tactical_adjustments", "misc_notes",
+        ),
+        optional=True,
+    ),
+    "goals_allowed": TableSchema(
+        name="goals_allowed",
+        worksheets=("goals_allowed",),
+        columns=(
+            _MATCH_ID,
+            _SEASON_ID,
+            Column("goal_id"),
+            Column("description", aliases=("description_of_goal",), default=""),
+            Column("goalie_player_id", aliases=("goalkeeper_player_id", "goalie"), default="", categorical=True),
+            Column("minute", kind="float", default=pd.NA),
+            Column("situation", default="", categorical=True),
+        ),
+        header=("match_id", "season_id", "goal_id", "description", "goalie_player_id", "minute", "situation"),
+        optional=True,
+    ),
+}
+
+COMPILED_SCHEMAS: dict[str, CompiledSchema] = {name: compile_schema(schema) for name, schema in SCHEMAS.items()}
+
+# Join keys and the columns, in any table, that hold them.
+JOIN_KEYS: dict[str, tuple[str, ...]] = {
+    "match_id": ("match_id",),
+    "player_id": ("player_id", "goalie_player_id"),
+}
+
+
+def encode_join_keys(tables: dict[str, pd.DataFrame]) -> dict[str, pd.CategoricalDtype]:
+    """Give each join key one categorical encoding shared by every table, in place.
+
+    Every column holding a key gets the same sorted category list, so filters,
+    groupbys and joins across tables compare integer codes. The categories are
+    the lookup table back to the original strings. Returns the dtype per key.
+    """
+
+    dtypes = {}
+    for key, columns in JOIN_KEYS.items():
+        found = [(df, column) for df in tables.values() for column in columns if column in df.columns]
+        if not found:
+            continue
+        values = set()
+        for df, column in found:
+            values.update(df[column].dropna().astype(str).unique())
+        dtype = dtypes[key] = pd.CategoricalDtype(sorted(values))
+        for df, column in found:
+            df[column] = df[column].astype(str).astype(dtype)
+    return dtypes
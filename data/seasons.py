@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
 import pandas as pd
 
+from data.schema import TRUE_VALUES
+
 
 LEGACY_SEASON_ID = "2025"
 SHOT_ON_TARGET_KPI_START_SEASON = 2026
@@ -15,7 +21,103 @@ def supports_shot_on_target_kpis(season_id: object) -> bool:
         return False
 
 
-_TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+def _numeric_sort_key(season_id: str) -> tuple[float, str]:
+    number = pd.to_numeric(season_id, errors="coerce")
+    return (-1.0 if pd.isna(number) else float(number), season_id)
+
+
+@dataclass(frozen=True)
+class SeasonCatalog:
+    """Normalized season metadata with dictionary lookups, newest season first.
+
+    Built once per data revision (see ``DataSnapshot.season_catalog``), so
+    the per-rerun label and active checks are lookups instead of scans of the
+    catalog DataFrame.
+    """
+
+    ids: tuple[str, ...]
+    labels: Mapping[str, str]
+    active_ids: frozenset[str]
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "labels", MappingProxyType(dict(self.labels)))
+
+    @classmethod
+    def from_tables(
+        cls,
+        seasons: pd.DataFrame,
+        matches: pd.DataFrame,
+        *,
+        legacy_season_id: str = LEGACY_SEASON_ID,
+    ) -> SeasonCatalog:
+        """Build the catalog from the seasons worksheet and the matches table.
+
+        The matches table is also inspected so an existing season remains
+        available if the optional ``seasons`` worksheet is incomplete.
+        """
+
+        labels: dict[str, str] = {}
+        active_ids: set[str] = set()
+        if seasons is not None and not seasons.empty:
+            source = seasons.copy(deep=False)
+            source.columns = [str(column).strip().lower() for column in source.columns]
+
+            def column(name: str) -> list[object]:
+                return source[name].tolist() if name in source.columns else [""] * len(source)
+
+            for raw_id, raw_label, raw_active in zip(column("season_id"), column("label"), column("active")):
+                season_id = str(raw_id).strip()
+                if not season_id:
+                    continue
+                label = str(raw_label).strip()
+                # A mismatched copied label is more confusing than a derived one.
+                if not label or season_id not in label:
+                    label = f"{season_id} season"
+                labels[season_id] = label
+                if str(raw_active).strip().lower() in TRUE_VALUES:
+                    active_ids.add(season_id)
+                else:
+                    active_ids.discard(season_id)
+
+        if matches is not None and not matches.empty and "season_id" in matches.columns:
+            for value in matches["season_id"].dropna().astype(str).unique():
+                season_id = value.strip()
+                if season_id and season_id not in labels:
+                    labels[season_id] = f"{season_id} season"
+
+        if not labels:
+            labels[legacy_season_id] = f"{legacy_season_id} season"
+            active_ids.add(legacy_season_id)
+
+        ids = tuple(sorted(labels, key=_numeric_sort_key, reverse=True))
+        return cls(ids=ids, labels=labels, active_ids=frozenset(active_ids))
+
+    def __contains__(self, season_id: object) -> bool:
+        return str(season_id) in self.labels
+
+    def label(self, season_id: object) -> str:
+        season_id = str(season_id)
+        return self.labels.get(season_id, f"{season_id} season")
+
+    def is_active(self, season_id: object) -> bool:
+        return str(season_id) in self.active_ids
+
+    def resolve(self, requested: object) -> str:
+        """Resolve a requested season, falling back to active then newest."""
+
+        requested_id = str(requested or "").strip()
+        if requested_id in self.labels:
+            return requested_id
+        return next((season_id for season_id in self.ids if season_id in self.active_ids), self.ids[0])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "season_id": list(self.ids),
+                "label": [self.labels[season_id] for season_id in self.ids],
+                "active": [season_id in self.active_ids for season_id in self.ids],
+            }
+        )
 
 
 def build_season_catalog(
@@ -24,48 +126,9 @@ def build_season_catalog(
     *,
     legacy_season_id: str = LEGACY_SEASON_ID,
 ) -> pd.DataFrame:
-    """Return normalized season metadata, newest season first.
-
-    The matches table is also inspected so an existing season remains
-    available if the optional ``seasons`` worksheet is incomplete.
-    """
+    """Return normalized season metadata as a DataFrame, newest season first."""
 
-    rows: dict[str, dict[str, object]] = {}
-    if seasons is not None and not seasons.empty:
-        source = seasons.copy()
-        source.columns = [str(column).strip().lower() for column in source.columns]
-        for _, row in source.iterrows():
-            season_id = str(row.get("season_id", "")).strip()
-            if not season_id:
-                continue
-            label = str(row.get("label", "")).strip()
-            # A mismatched copied label is more confusing than a derived one.
-            if not label or season_id not in label:
-                label = f"{season_id} season"
-            active = str(row.get("active", "")).strip().lower() in _TRUE_VALUES
-            rows[season_id] = {"season_id": season_id, "label": label, "active": active}
-
-    if matches is not None and not matches.empty and "season_id" in matches.columns:
-        for value in matches["season_id"].dropna().astype(str):
-            season_id = value.strip()
-            if season_id and season_id not in rows:
-                rows[season_id] = {
-                    "season_id": season_id,
-                    "label": f"{season_id} season",
-                    "active": False,
-                }
-
-    if not rows:
-        rows[legacy_season_id] = {
-            "season_id": legacy_season_id,
-            "label": f"{legacy_season_id} season",
-            "active": True,
-        }
-
-    catalog = pd.DataFrame(rows.values())
-    catalog["_numeric_sort"] = pd.to_numeric(catalog["season_id"], errors="coerce").fillna(-1)
-    catalog = catalog.sort_values(["_numeric_sort", "season_id"], ascending=[False, False])
-    return catalog.drop(columns="_numeric_sort").reset_index(drop=True)
+    return SeasonCatalog.from_tables(seasons, matches, legacy_season_id=legacy_season_id).to_frame()
 
 
 def resolve_season_id(requested: object, catalog: pd.DataFrame) -> str:
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+
+# Bump whenever the stored columns or dtypes change, so older snapshots are
+# re-fetched instead of being served with the previous layout.
+SNAPSHOT_FORMAT_VERSION = 2
+_POINTER_FILE = "current.json"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    spreadsheet_key: str
+    fetched_at: datetime
+    tables: dict[str, pd.DataFrame]
+    revision: Optional[str] = None
+
+
+def snapshot_root(base_dir: str | os.PathLike, spreadsheet_key: str) -> Path:
+    """Return the directory holding snapshots for one spreadsheet."""
+    digest = hashlib.sha256(spreadsheet_key.encode("utf-8")).hexdigest()[:16]
+    return Path(base_dir) / digest
+
+
+def save_snapshot(
+    base_dir: str | os.PathLike,
+    spreadsheet_key: str,
+    tables: dict[str, pd.DataFrame],
+    *,
+    fetched_at: datetime,
+    revision: Optional[str] = None,
+) -> Path:
+    """Write every table as Parquet and atomically publish the new snapshot.
+
+    Tables go into a fresh version directory; ``current.json`` is swapped to
+    point at it only once all files are written, so readers never see a
+    half-written snapshot.
+    """
+
+    root = snapshot_root(base_dir, spreadsheet_key)
+    root.mkdir(parents=True, exist_ok=True)
+    version = fetched_at.strftime("%Y%m%dT%H%M%S%fZ")
+    version_dir = root / version
+    version_dir.mkdir(exist_ok=True)
+    for name, table in tables.items():
+        table.to_parquet(version_dir / f"{name}.parquet")
+
+    pointer = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "spreadsheet_key": spreadsheet_key,
+        "fetched_at": fetched_at.isoformat(),
+        "revision": revision,
+        "version": version,
+        "tables": sorted(tables),
+    }
+    tmp_pointer = root / f"{_POINTER_FILE}.{os.getpid()}.tmp"
+    tmp_pointer.write_text(json.dumps(pointer), encoding="utf-8")
+    os.replace(tmp_pointer, root / _POINTER_FILE)
+
+    for stale in root.iterdir():
+        if stale.is_dir() and stale.name != version:
+            shutil.rmtree(stale, ignore_errors=True)
+    return version_dir
+
+
+def load_snapshot(base_dir: str | os.PathLike, spreadsheet_key: str) -> Optional[Snapshot]:
+    """Return the published snapshot for a spreadsheet, or None if unusable."""
+
+    root = snapshot_root(base_dir, spreadsheet_key)
+    try:
+        pointer = json.loads((root / _POINTER_FILE).read_text(encoding="utf-8"))
+        if pointer.get("format") != SNAPSHOT_FORMAT_VERSION:
+            return None
+        if pointer.get("spreadsheet_key") != spreadsheet_key:
+            return None
+        version_dir = root / str(pointer["version"])
+        tables = {
+            name: pd.read_parquet(version_dir / f"{name}.parquet")
+            for name in pointer.get("tables", [])
+        }
+        fetched_at = datetime.fromisoformat(pointer["fetched_at"])
+    except (ImportError, OSError, KeyError, TypeError, ValueError):
+        return None
+    return Snapshot(
+        spreadsheet_key=spreadsheet_key,
+        fetched_at=fetched_at,
+        tables=tables,
+        revision=pointer.get("revision"),
+    )
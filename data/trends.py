@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data.views import LruMemo, view_fingerprint
+
+
+# Per-game metrics every trend view is derived from, in display order.
+TREND_METRICS = ("GF", "GA", "Save%", "GF Conv%", "GA Conv%")
+# Rolling windows (in games) the Trends tab offers, and the default one.
+WINDOW_CHOICES = (3, 5, 8)
+DEFAULT_WINDOWS = (3,)
+# Columns a metric matrix reads; a view's fingerprint covers exactly these.
+_SOURCE_COLUMNS = ("match_id", "date", "opponent", "goals_for", "goals_against", "saves", "shots_for", "shots_against")
+
+
+def _column(matches: pd.DataFrame, name: str) -> pd.Series:
+    if name in matches.columns:
+        return matches[name]
+    return pd.Series(0, index=matches.index, dtype="int64")
+
+
+def build_metric_matrix(matches: pd.DataFrame) -> pd.DataFrame:
+    """Compute one row of trend metrics per game, in date order.
+
+    Columns are ``Game #``, ``Date``, ``Opponent`` and ``TREND_METRICS``; the
+    index keeps the match rows' labels.
+    """
+
+    if matches.empty:
+        return pd.DataFrame(columns=["Game #", "Date", "Opponent", *TREND_METRICS])
+    df = matches.sort_values("date", kind="stable") if "date" in matches.columns else matches
+    gf = _column(df, "goals_for")
+    ga = _column(df, "goals_against")
+    sv = _column(df, "saves")
+    shf = _column(df, "shots_for")
+    sha = _column(df, "shots_against")
+
+    denom_sv = sv + ga
+    return pd.DataFrame(
+        {
+            "Game #": np.arange(1, len(df) + 1),
+            "Date": df["date"] if "date" in df.columns else pd.NaT,
+            "Opponent": df["opponent"] if "opponent" in df.columns else "",
+            "GF": gf,
+            "GA": ga,
+            "Save%": (sv / denom_sv * 100).where(denom_sv > 0, 0.0),
+            "GF Conv%": (gf / shf * 100).where(shf > 0, 0.0),
+            "GA Conv%": (ga / sha * 100).where(sha > 0, 0.0),
+        },
+        index=df.index,
+    )
+
+
+# Matrices are small; entries are keyed by view fingerprint so every tab and
+# rerun showing the same games shares one.
+trend_memo = LruMemo(maxsize=16)
+
+
+def metric_matrix(matches: pd.DataFrame) -> pd.DataFrame:
+    """Return the (memoized) metric matrix for a filtered matches view."""
+
+    return trend_memo.get(view_fingerprint(matches, _SOURCE_COLUMNS), lambda: build_metric_matrix(matches)).copy(deep=False)
+
+
+def metric_averages(matrix: pd.DataFrame, last_n: Optional[int] = None) -> pd.Series:
+    """Mean of each metric over all games, or over the last ``last_n``."""
+
+    rows = matrix if last_n is None else matrix.tail(last_n)
+    return rows[list(TREND_METRICS)].mean()
+
+
+@dataclass(frozen=True)
+class FormSettings:
+    """Which recent-form series to compute: rolling windows and an optional EWMA.
+
+    ``halflife`` is in games; None leaves the EWMA out. The shortest window is
+    the primary one, used for "last N games" comparisons and predictions.
+    """
+
+    windows: tuple[int, ...] = DEFAULT_WINDOWS
+    halflife: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        windows = tuple(sorted({int(w) for w in self.windows if int(w) > 0})) or DEFAULT_WINDOWS
+        object.__setattr__(self, "windows", windows)
+        if self.halflife is not None and float(self.halflife) <= 0:
+            object.__setattr__(self, "halflife", None)
+
+    @property
+    def primary(self) -> int:
+        return self.windows[0]
+
+    def recent_column(self, metric: str) -> str:
+        """The form column predictions read: the EWMA if set, else the primary window."""
+        return f"EWMA {metric}" if self.halflife is not None else f"R{self.primary} {metric}"
+
+
+def build_form_frame(matrix: pd.DataFrame, settings: FormSettings = FormSettings()) -> pd.DataFrame:
+    """Rolling means for every window, plus the EWMA, in one pass over the metric array.
+
+    Rolling means come from one cumulative sum: for each window the mean at
+    game i is ``(csum[i] - csum[i - w]) / w``, with fewer games at the start
+    of the season (like ``rolling(w, min_periods=1)``). All windows are
+    broadcast together. The EWMA is a single weighted sum with pandas'
+    default ``adjust=True`` weights.
+    """
+
+    columns = [f"R{w} {metric}" for w in settings.windows for metric in TREND_METRICS]
+    if settings.halflife is not None:
+        columns += [f"EWMA {metric}" for metric in TREND_METRICS]
+    if matrix.empty:
+        return pd.DataFrame(columns=columns)
+
+    values = matrix[list(TREND_METRICS)].to_numpy(dtype=float)
+    games = len(values)
+    csum = np.vstack([np.zeros((1, values.shape[1])), values.cumsum(axis=0)])
+    ends = np.arange(1, games + 1)[None, :]
+    starts = np.maximum(ends - np.asarray(settings.windows)[:, None], 0)
+    rolled = (csum[ends] - csum[starts]) / (ends - starts)[..., None]
+    blocks = [rolled.transpose(1, 0, 2).reshape(games, -1)]
+
+    if settings.halflife is not None:
+        decay = 0.5 ** (1.0 / float(settings.halflife))
+        lag = np.arange(games)[:, None] - np.arange(games)[None, :]
+        weights = np.where(lag >= 0, decay ** np.maximum(lag, 0), 0.0)
+        blocks.append(weights @ values / weights.sum(axis=1, keepdims=True))
+
+    return pd.DataFrame(np.hstack(blocks), index=matrix.index, columns=columns)
+
+
+def form_metrics(matches: pd.DataFrame, settings: FormSettings = FormSettings()) -> pd.DataFrame:
+    """Return the (memoized) form series for a filtered matches view."""
+
+    key = (view_fingerprint(matches, _SOURCE_COLUMNS), settings)
+    return trend_memo.get(key, lambda: build_form_frame(metric_matrix(matches), settings)).copy(deep=False)
+
+
+def rolling_frame(matrix: pd.DataFrame, window: int = 3) -> pd.DataFrame:
+    """Rolling mean of each metric, as ``R<window> <metric>`` columns."""
+
+    return build_form_frame(matrix, FormSettings((window,)))
+
+
+def comparison_frame(
+    matrix: pd.DataFrame,
+    form: Optional[pd.DataFrame] = None,
+    settings: FormSettings = FormSettings(),
+) -> pd.DataFrame:
+    """All-games averages next to each window's last-N average and the EWMA.
+
+    The last row of a form series is the average over the last N games (all
+    of them when fewer than N were played). ``Difference`` is the primary
+    window minus all games.
+    """
+
+    if matrix.empty:
+        return pd.DataFrame()
+    if form is None:
+        form = build_form_frame(matrix, settings)
+    overall = metric_averages(matrix).to_numpy()
+    latest = form.iloc[-1]
+    data = {"Metric": list(TREND_METRICS), "All Games": overall}
+    for window in settings.windows:
+        data[f"Last {window} Games"] = latest[[f"R{window} {m}" for m in TREND_METRICS]].to_numpy(dtype=float)
+    if settings.halflife is not None:
+        data[f"EWMA (half-life {settings.halflife:g})"] = latest[[f"EWMA {m}" for m in TREND_METRICS]].to_numpy(
+            dtype=float
+        )
+    data["Difference"] = data[f"Last {settings.primary} Games"] - overall
+    return pd.DataFrame(data)
+
+
+def game_points(matrix: pd.DataFrame, last_n: int = 3, form: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Per-game points for the trend charts, flagging the last ``last_n`` games.
+
+    ``form`` columns, when given, are added alongside for the rolling lines.
+    """
+
+    if matrix.empty:
+        return pd.DataFrame()
+    points = matrix.copy()
+    points[f"Last {last_n} Games"] = np.arange(len(points)) >= len(points) - last_n
+    if form is not None:
+        points = points.join(form)
+    return points
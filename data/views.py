@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Hashable, Iterable, Optional
 
+import numpy as np
 import pandas as pd
 
+from data.history import HistoryStore, Predicate
+from data.opponents import OpponentRegistry, opponent_mask
 from data.seasons import LEGACY_SEASON_ID
 
 
@@ -24,6 +32,163 @@ def filter_by_season(
     return dataframe.loc[values == str(season_id)].copy()
 
 
+class SeasonIndex:
+    """One table split by season once, so each season is a dictionary lookup.
+
+    ``get`` returns what ``filter_by_season`` would, as a shallow copy of the
+    stored partition instead of a fresh scan and copy of the whole table.
+    """
+
+    def __init__(self, dataframe: Optional[pd.DataFrame], *, legacy_season_id: str = LEGACY_SEASON_ID):
+        if dataframe is None:
+            dataframe = pd.DataFrame()
+        self._empty = dataframe.iloc[0:0]
+        if dataframe.empty:
+            self._partitions: dict[str, pd.DataFrame] = {}
+        elif "season_id" not in dataframe.columns:
+            self._partitions = {legacy_season_id: dataframe}
+        else:
+            keys = dataframe["season_id"].astype(str).str.strip()
+            self._partitions = {str(key): part for key, part in dataframe.groupby(keys, sort=False)}
+
+    def seasons(self) -> list[str]:
+        return list(self._partitions)
+
+    def get(self, season_id: str) -> pd.DataFrame:
+        return self._partitions.get(str(season_id), self._empty).copy(deep=False)
+
+
+# Per-match counts ``MatchRangeIndex`` keeps running totals of.
+RANGE_TOTAL_COLUMNS = (
+    "goals_for",
+    "goals_against",
+    "shots_for",
+    "shots_target",
+    "shots_against",
+    "shots_against_target",
+    "saves",
+)
+_RESULT_TOTALS = {"wins": "W", "losses": "L", "draws": "D"}
+
+
+@dataclass(frozen=True)
+class MatchRange:
+    """A contiguous stretch of a season: game numbers and/or dates, both inclusive."""
+
+    first_game: Optional[int] = None
+    last_game: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @property
+    def active(self) -> bool:
+        return any(bound is not None for bound in astuple(self))
+
+    @classmethod
+    def from_query(cls, games: object = "", start: object = "", end: object = "") -> MatchRange:
+        """Parse the ``games`` ("6-12"), ``from`` and ``to`` (ISO date) query params.
+
+        Malformed values are ignored rather than raised, like the other filters.
+        """
+
+        first_game = last_game = None
+        first, dash, last = str(games or "").partition("-")
+        if first.strip().isdigit():
+            first_game = int(first)
+        if last.strip().isdigit():
+            last_game = int(last)
+        elif first_game is not None and not dash:
+            last_game = first_game  # "7" is game 7 alone
+
+        def parse_date(value: object) -> Optional[date]:
+            try:
+                return date.fromisoformat(str(value).strip())
+            except ValueError:
+                return None
+
+        return cls(first_game, last_game, parse_date(start), parse_date(end))
+
+    def to_query(self) -> dict[str, str]:
+        games = ""
+        if self.first_game is not None or self.last_game is not None:
+            games = f"{self.first_game or 1}-{self.last_game or ''}"
+        return {
+            "games": games,
+            "from": self.start_date.isoformat() if self.start_date else "",
+            "to": self.end_date.isoformat() if self.end_date else "",
+        }
+
+
+class MatchRangeIndex:
+    """One season's matches sorted by date, with running totals of the counts.
+
+    Game numbers follow date order, with undated matches last. A game or date
+    range becomes a ``slice`` of the sorted rows after at most two binary
+    searches, and ``totals`` over that slice is a subtraction of two prefix
+    sums per column, so the KPIs of any contiguous range never re-filter or
+    re-sum the matches.
+    """
+
+    def __init__(self, matches: Optional[pd.DataFrame]):
+        if matches is None:
+            matches = pd.DataFrame()
+        if "date" in matches.columns:
+            matches = matches.sort_values("date", kind="stable", na_position="last")
+            self._dates = matches["date"].dropna().to_numpy(dtype="datetime64[ns]")
+        else:
+            self._dates = np.array([], dtype="datetime64[ns]")
+        self._matches = matches
+        self._prefix: dict[str, np.ndarray] = {}
+        for column in RANGE_TOTAL_COLUMNS:
+            values = (
+                pd.to_numeric(matches[column], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+                if column in matches.columns
+                else np.zeros(len(matches), dtype=np.int64)
+            )
+            self._prefix[column] = np.concatenate(([0], np.cumsum(values)))
+        results = matches["result"].astype(str).to_numpy() if "result" in matches.columns else None
+        for name, code in _RESULT_TOTALS.items():
+            hits = (results == code).astype(np.int64) if results is not None else np.zeros(len(matches), dtype=np.int64)
+            self._prefix[name] = np.concatenate(([0], np.cumsum(hits)))
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def date_bounds(self) -> Optional[tuple[date, date]]:
+        if not len(self._dates):
+            return None
+        return pd.Timestamp(self._dates[0]).date(), pd.Timestamp(self._dates[-1]).date()
+
+    def positions(self, match_range: MatchRange) -> slice:
+        """Return the sorted rows a range covers (game numbers are 1-based)."""
+
+        lo, hi = 0, len(self._matches)
+        if match_range.first_game is not None:
+            lo = max(lo, match_range.first_game - 1)
+        if match_range.last_game is not None:
+            hi = min(hi, match_range.last_game)
+        if match_range.start_date is not None or match_range.end_date is not None:
+            hi = min(hi, len(self._dates))
+        if match_range.start_date is not None:
+            start = np.datetime64(match_range.start_date, "ns")
+            lo = max(lo, int(np.searchsorted(self._dates, start, side="left")))
+        if match_range.end_date is not None:
+            end = np.datetime64(match_range.end_date + timedelta(days=1), "ns")
+            hi = min(hi, int(np.searchsorted(self._dates, end, side="left")))
+        return slice(lo, max(lo, hi))
+
+    def rows(self, positions: slice) -> pd.DataFrame:
+        return self._matches.iloc[positions].copy(deep=False)
+
+    def totals(self, positions: slice) -> dict[str, int]:
+        """Sum every ``RANGE_TOTAL_COLUMNS`` count and the W/L/D tally over a slice."""
+
+        lo, hi = positions.start, positions.stop
+        totals = {name: int(prefix[hi] - prefix[lo]) for name, prefix in self._prefix.items()}
+        totals["games"] = hi - lo
+        return totals
+
+
 def filter_players_for_season(
     players: pd.DataFrame,
     season_id: str,
@@ -48,8 +213,13 @@ def apply_match_filters(
     div_only: bool,
     opp_filter: str,
     ha_val: str,
+    opponents: Optional[OpponentRegistry] = None,
 ) -> pd.DataFrame:
-    """Apply current filters to matches and return a filtered copy."""
+    """Apply current filters to matches and return a filtered copy.
+
+    The opponent filter goes through ``opponents`` (the snapshot's registry),
+    so spelling variants of a team match each other.
+    """
 
     matches_view = matches.copy()
 
@@ -58,9 +228,7 @@ def apply_match_filters(
 
     opp_filter = (opp_filter or "").strip()
     if opp_filter and not matches_view.empty and "opponent" in matches_view:
-        matches_view = matches_view[
-            matches_view["opponent"].astype(str).str.contains(opp_filter, case=False, na=False)
-        ]
+        matches_view = matches_view[opponent_mask(matches_view["opponent"], opp_filter, registry=opponents)]
 
     ha_val = (ha_val or "any").lower()
     if ha_val in ("h", "home", "a", "away") and not matches_view.empty and "home_away" in matches_view:
@@ -70,6 +238,19 @@ def apply_match_filters(
     return matches_view
 
 
+def key_isin(column: pd.Series, keys: pd.Series) -> pd.Series:
+    """Membership test for join keys such as match_id.
+
+    Keys encoded with the snapshot's shared categories (see
+    ``data.schema.encode_join_keys``) are compared as integer codes; anything
+    else falls back to comparing the values as strings.
+    """
+
+    if isinstance(column.dtype, pd.CategoricalDtype) and column.dtype == keys.dtype:
+        return pd.Series(np.isin(column.cat.codes.to_numpy(), keys.cat.codes.unique()), index=column.index)
+    return column.astype(str).isin(set(keys.astype(str)))
+
+
 def derive_related_views(
     *,
     matches_view: pd.DataFrame,
@@ -80,18 +261,10 @@ def derive_related_views(
     """Filter events/plays/goals_allowed to match the currently-filtered matches."""
 
     if not matches_view.empty and "match_id" in matches_view:
-        keep = set(matches_view["match_id"].astype(str))
-        events_view = (
-            events[events["match_id"].astype(str).isin(keep)] if "match_id" in events.columns else events
-        )
-        plays_view = (
-            plays_simple[plays_simple["match_id"].astype(str).isin(keep)] if not plays_simple.empty else plays_simple
-        )
-        ga_view = (
-            goals_allowed[goals_allowed["match_id"].astype(str).isin(keep)]
-            if not goals_allowed.empty
-            else goals_allowed
-        )
+        keep = matches_view["match_id"]
+        events_view = events[key_isin(events["match_id"], keep)] if "match_id" in events.columns else events
+        plays_view = plays_simple[key_isin(plays_simple["match_id"], keep)] if not plays_simple.empty else plays_simple
+        ga_view = goals_allowed[key_isin(goals_allowed["match_id"], keep)] if not goals_allowed.empty else goals_allowed
     else:
         events_view = events.iloc[0:0].copy()
         plays_view = plays_simple.iloc[0:0].copy()
@@ -100,6 +273,165 @@ def derive_related_views(
     return events_view, plays_view, ga_view
 
 
+def query_season(
+    store: HistoryStore,
+    table: str,
+    season_id: str,
+    *,
+    predicates: Iterable[Predicate] = (),
+    legacy_season_id: str = LEGACY_SEASON_ID,
+) -> pd.DataFrame:
+    """Like ``filter_by_season``, but only the season's rows leave the history store."""
+
+    columns = store.columns(table)
+    if not columns:
+        return pd.DataFrame()
+    if "season_id" not in columns:
+        rows = store.select(table, predicates)
+        return rows if str(season_id) == legacy_season_id else rows.iloc[0:0]
+    return store.select(table, [Predicate("season_id", "eq", str(season_id)), *predicates])
+
+
+def query_match_views(
+    store: HistoryStore,
+    season_id: str,
+    *,
+    div_only: bool,
+    opp_filter: str,
+    ha_val: str,
+    opponents: Optional[OpponentRegistry] = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """``apply_match_filters`` plus ``derive_related_views``, evaluated in the history store.
+
+    Returns the filtered matches and their events, plays and goals allowed.
+    The opponent filter is resolved to the matching teams' spellings through
+    ``opponents`` and sent to the store as an ``in`` predicate.
+    """
+
+    columns = set(store.columns("matches"))
+    predicates = []
+    if div_only and "division_game" in columns:
+        predicates.append(Predicate("division_game", "eq", True))
+    opp_filter = (opp_filter or "").strip()
+    if opp_filter and "opponent" in columns:
+        if opponents is None:
+            opponents = OpponentRegistry.from_series(query_season(store, "matches", season_id)["opponent"])
+        predicates.append(Predicate("opponent", "in", opponents.spellings(opponents.match(opp_filter))))
+    ha_val = (ha_val or "any").lower()
+    if ha_val in ("h", "home", "a", "away") and "home_away" in columns:
+        predicates.append(Predicate("home_away", "eq", "H" if ha_val.startswith("h") else "A"))
+    matches_view = query_season(store, "matches", season_id, predicates=predicates)
+
+    keep = set()
+    if not matches_view.empty and "match_id" in matches_view:
+        keep = set(matches_view["match_id"].astype(str))
+    related = []
+    for table in ("events", "plays_simple", "goals_allowed"):
+        match_predicates = [Predicate("match_id", "in", sorted(keep))] if "match_id" in store.columns(table) else []
+        view = query_season(store, table, season_id, predicates=match_predicates)
+        related.append(view if keep else view.iloc[0:0])
+    return (matches_view, *related)
+
+
+MatchViews = tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]
+
+
+def match_views_key(
+    data_version: str,
+    season_id: str,
+    *,
+    div_only: bool,
+    opp_filter: str,
+    ha_val: str,
+    match_range: MatchRange = MatchRange(),
+) -> tuple:
+    """Cache key for one season's filtered views; equivalent filter spellings share a key."""
+
+    ha_val = (ha_val or "any").lower()
+    venue = ("H" if ha_val.startswith("h") else "A") if ha_val in ("h", "home", "a", "away") else None
+    return (data_version, str(season_id), bool(div_only), (opp_filter or "").strip().lower(), venue, match_range)
+
+
+@dataclass(frozen=True)
+class MemoStats:
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+def view_fingerprint(matches: pd.DataFrame, columns: Iterable[str]) -> str:
+    """Return a content hash of a view's rows and the given columns, for memo keys."""
+
+    columns = [column for column in columns if column in matches.columns]
+    digest = hashlib.sha1(",".join(columns).encode("utf-8"))
+    if len(matches):
+        digest.update(pd.util.hash_pandas_object(matches[columns], index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class LruMemo:
+    """Bounded, thread-safe LRU of computed values, shared by every session in the process.
+
+    Values are returned as stored, so they must not be modified by callers.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            found = key in self._entries
+            if found:
+                value = self._entries[key]
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        if not found:
+            value = compute()
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> MemoStats:
+        with self._lock:
+            return MemoStats(self._hits, self._misses, len(self._entries), self.maxsize)
+
+    def clear(self) -> None:
+        """Drop cached values; the hit/miss counters keep counting."""
+        with self._lock:
+            self._entries.clear()
+
+
+class MatchViewMemo(LruMemo):
+    """Bounded LRU of filtered match views, shared by every session in the process.
+
+    Entries are keyed by ``match_views_key``, which includes the data version,
+    so a refresh never serves views of older tables. Callers get shallow
+    copies and cannot modify the cached frames.
+    """
+
+    def get(self, key: Hashable, compute: Callable[[], MatchViews]) -> MatchViews:
+        views = super().get(key, lambda: tuple(compute()))
+        return tuple(df.copy(deep=False) for df in views)
+
+
+match_view_memo = MatchViewMemo()
+
+
 def get_match_id(qp: dict) -> Optional[str]:
     """Extract match_id from query params."""
 
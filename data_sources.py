@@ -0,0 +1,145 @@
+"""Where the dashboard's worksheets come from.
+
+The loaders talk to a ``DataSource`` rather than to Google directly. A normal
+``SPREADSHEET_KEY`` (sheet ID or URL) selects the Google Sheets source; a
+``file://`` key selects a local source that reads the same tab names from a
+directory of CSV/Parquet files or from a SQLite database, which lets the app,
+tests and benchmarks run without Google credentials.
+
+Both sources return the same shape as the Sheets adapter: one DataFrame per
+tab, string cells with surrounding whitespace stripped, missing tabs omitted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, Protocol
+
+import pandas as pd
+
+
+LOCAL_SCHEME = "file://"
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+# Preferred file format when a tab exists in more than one.
+LOCAL_FILE_SUFFIXES = (".parquet", ".csv")
+
+
+class DataSource(Protocol):
+    def read_tabs(self, worksheet_names: Iterable[str]) -> dict[str, pd.DataFrame]:
+        """Return the requested tabs that exist, keyed by worksheet name."""
+        ...
+
+    def revision(self) -> str:
+        """Return a token that changes whenever the underlying data changes."""
+        ...
+
+
+class SheetsSource:
+    """Worksheets read from a Google spreadsheet.
+
+    The Sheets client stack (gspread, google-auth, requests) is imported on
+    first read, so ``file://`` deployments never load it.
+    """
+
+    def __init__(self, spreadsheet_key: str):
+        self.spreadsheet_key = spreadsheet_key
+
+    def read_tabs(self, worksheet_names: Iterable[str]) -> dict[str, pd.DataFrame]:
+        from google_sheets_adapter import read_sheets_to_dfs
+
+        return read_sheets_to_dfs(self.spreadsheet_key, worksheet_names)
+
+    def revision(self) -> str:
+        from google_sheets_adapter import read_spreadsheet_revision
+
+        return read_spreadsheet_revision(self.spreadsheet_key)
+
+
+def _as_sheet_cells(df: pd.DataFrame) -> pd.DataFrame:
+    """Render typed local data the way the Sheets adapter returns it."""
+    return pd.DataFrame(
+        {
+            str(column).strip(): df[column].astype(object).where(df[column].notna(), "").astype("str").str.strip()
+            for column in df.columns
+        },
+        index=pd.RangeIndex(len(df)),
+    )
+
+
+class LocalFilesSource:
+    """Worksheets read from local files.
+
+    ``path`` is either a directory holding ``<tab>.parquet`` / ``<tab>.csv``
+    files or a SQLite database with one table per tab.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.path.suffix.lower() in SQLITE_SUFFIXES
+
+    def _tab_file(self, worksheet_name: str) -> Path | None:
+        for suffix in LOCAL_FILE_SUFFIXES:
+            candidate = self.path / f"{worksheet_name}{suffix}"
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def read_tabs(self, worksheet_names: Iterable[str]) -> dict[str, pd.DataFrame]:
+        names = list(worksheet_names)
+        if self.is_sqlite:
+            return self._read_sqlite(names)
+        if not self.path.is_dir():
+            raise FileNotFoundError(f"Data directory '{self.path}' not found")
+
+        tabs = {}
+        for name in names:
+            tab_file = self._tab_file(name)
+            if tab_file is None:
+                continue
+            if tab_file.suffix == ".csv":
+                raw = pd.read_csv(tab_file, dtype=str, keep_default_na=False)
+            else:
+                raw = pd.read_parquet(tab_file)
+            tabs[name] = _as_sheet_cells(raw)
+        return tabs
+
+    def _read_sqlite(self, names: list[str]) -> dict[str, pd.DataFrame]:
+        if not self.path.is_file():
+            raise FileNotFoundError(f"SQLite database '{self.path}' not found")
+        with closing(sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)) as conn:
+            existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+            return {
+                name: _as_sheet_cells(pd.read_sql_query(f'SELECT * FROM "{name}"', conn))
+                for name in names
+                if name in existing
+            }
+
+    def revision(self) -> str:
+        if self.is_sqlite:
+            files = [self.path]
+        else:
+            files = [path for path in self.path.iterdir() if path.suffix in LOCAL_FILE_SUFFIXES]
+        stamps = "\n".join(sorted(f"{path.name}:{path.stat().st_mtime_ns}" for path in files))
+        return "mtime:" + hashlib.sha256(stamps.encode("utf-8")).hexdigest()[:16]
+
+
+def is_local_key(spreadsheet_key: str) -> bool:
+    return str(spreadsheet_key).startswith(LOCAL_SCHEME)
+
+
+def open_data_source(spreadsheet_key: str) -> DataSource:
+    """Return the data source selected by a ``SPREADSHEET_KEY`` value.
+
+    ``file:///abs/path`` and ``file://relative/path`` select local files;
+    anything else is treated as a Google Sheet ID or URL.
+    """
+    if is_local_key(spreadsheet_key):
+        return LocalFilesSource(spreadsheet_key[len(LOCAL_SCHEME):])
+    return SheetsSource(spreadsheet_key)
@@ -1,11 +1,22 @@
 # google_sheets_adapter.py
 import os
 import json
+import random
+import threading
 import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 import gspread
+import requests
+from gspread.urls import DRIVE_FILES_API_V3_URL
+from gspread.utils import absolute_range_name, extract_id_from_url
 from google.oauth2.service_account import Credentials
 from google.auth.transport.requests import Request
+from requests.adapters import HTTPAdapter
 
 _SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets.readonly",
@@ -30,36 +41,136 @@ def _build_credentials() -> Credentials:
         )
     return Credentials.from_service_account_file(key_path, scopes=_SCOPES)
 
+# Refresh the OAuth token this long before it expires so no request races expiry.
+_TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# Keep-alive connections to the Google APIs shared by every Streamlit session.
+_HTTP_POOL_SIZE = 16
+
+_client: Optional[gspread.Client] = None
+_token_request: Optional[Request] = None
+_client_lock = threading.Lock()
+
+def _token_expiring(creds: Credentials) -> bool:
+    if not creds.token or creds.expiry is None:
+        return True
+    # google-auth stores expiry as a naive UTC datetime.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return creds.expiry - now <= _TOKEN_REFRESH_MARGIN
+
 def _authorize_client() -> gspread.Client:
-    creds = _build_credentials()
-    if not creds.valid:
-        creds.refresh(Request())
-    return gspread.authorize(creds)
+    """Return the process-wide gspread client.
+
+    The client (credentials, token and pooled HTTP session) is built once and
+    shared by all sessions; the lock serializes creation and token refresh.
+    """
+    global _client, _token_request
+    with _client_lock:
+        if _client is None:
+            creds = _build_credentials()
+            client = gspread.authorize(creds)
+            pool = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+            client.http_client.session.mount("https://", pool)
+            # Token refreshes get their own keep-alive session, separate from the API one.
+            _token_request = Request()
+            _client = client
+        creds = _client.http_client.auth
+        if _token_expiring(creds):
+            creds.refresh(_token_request)
+        return _client
+
+# Sheets allows 60 read requests per minute per user; every session in this
+# process shares the service account, so they share one budget.
+SHEETS_REQUESTS_PER_MINUTE = int(os.getenv("SHEETS_REQUESTS_PER_MINUTE", "60"))
+# Worksheet titles rarely change; re-list them at most this often.
+_TITLES_TTL_SECONDS = 600
+_MAX_RETRY_DELAY = 30.0
+_TRANSIENT_STATUS = {408, 429, 500, 502, 503, 504}
+
+class _TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a request may go out."""
+
+    def __init__(self, rate_per_minute: int, *, burst: Optional[int] = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, rate_per_minute // 6))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
 
-def _retry(fn, *, tries=3, delay=0.8, backoff=2.0):
-    last_exc = None
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+_sheets_bucket = _TokenBucket(SHEETS_REQUESTS_PER_MINUTE)
+
+def _status_code(exc: Exception) -> Optional[int]:
+    response = getattr(exc, "response", None)
+    code = getattr(response, "status_code", None)
+    if code is None and isinstance(exc, gspread.exceptions.APIError):
+        code = exc.code
+    return code if isinstance(code, int) else None
+
+def _is_transient(exc: Exception) -> bool:
+    """Rate limits, server errors and dropped connections are worth retrying."""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return _status_code(exc) in _TRANSIENT_STATUS
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def _retry(fn, *, tries=4, delay=0.8, backoff=2.0, limiter: Optional[_TokenBucket] = None):
+    """Call ``fn``, retrying only transient failures.
+
+    429/5xx responses and connection errors are retried with jittered
+    exponential backoff, honoring ``Retry-After`` when the API sends one.
+    Anything else (missing worksheet, 4xx, bad key) is raised immediately.
+    """
     _delay = delay
-    for _ in range(tries):
+    for attempt in range(tries):
+        if limiter is not None:
+            limiter.acquire()
         try:
             return fn()
         except Exception as e:
-            last_exc = e
-            time.sleep(_delay)
+            if attempt == tries - 1 or not _is_transient(e):
+                raise
+            wait = _retry_after_seconds(e)
+            if wait is None:
+                wait = _delay / 2 + random.uniform(0, _delay / 2)
+            time.sleep(min(wait, _MAX_RETRY_DELAY))
             _delay *= backoff
-    raise last_exc
 
-def _open_spreadsheet(client: gspread.Client, key_or_url: str):
-    if key_or_url.startswith("http://") or key_or_url.startswith("https://"):
-        return _retry(lambda: client.open_by_url(key_or_url))
-    else:
-        return _retry(lambda: client.open_by_key(key_or_url))
+def _sheets_call(fn):
+    return _retry(fn, limiter=_sheets_bucket)
 
-def read_sheet_to_df(spreadsheet_key_or_url: str, worksheet_name: str) -> pd.DataFrame:
-    client = _authorize_client()
-    sh = _open_spreadsheet(client, spreadsheet_key_or_url)
-    ws = _retry(lambda: sh.worksheet(worksheet_name))
-    values = _retry(lambda: ws.get_all_values())
+def _spreadsheet_id(key_or_url: str) -> str:
+    if key_or_url.startswith("http://") or key_or_url.startswith("https://"):
+        return extract_id_from_url(key_or_url)
+    return key_or_url
 
+def _values_to_df(values: list) -> pd.DataFrame:
     if not values:
         return pd.DataFrame()
 
@@ -67,8 +178,90 @@ def read_sheet_to_df(spreadsheet_key_or_url: str, worksheet_name: str) -> pd.Dat
     if not header:
         return pd.DataFrame()
 
-    df = pd.DataFrame(rows, columns=[str(c).strip() for c in header])
+    # values:batchGet drops trailing empty cells; pad to a rectangle like get_all_values().
+    width = max(len(row) for row in values)
+    columns = [str(c).strip() for c in header] + [""] * (width - len(header))
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    rows = [row if len(row) == width else list(row) + [""] * (width - len(row)) for row in rows]
 
-    # Strip whitespace from string cells. (applymap is deprecated; use DataFrame.map)
-    df = df.map(lambda x: x.strip() if isinstance(x, str) else x)
+    # Strip whitespace column by column with vectorized string ops; a per-cell
+    # Python call used to dominate load time on the larger tabs.
+    grid = np.array(rows, dtype=object)
+    df = pd.DataFrame(
+        {i: pd.Series(grid[:, i], dtype="str").str.strip() for i in range(width)}
+    )
+    df.columns = columns
     return df
+
+_titles_cache: dict[str, tuple[float, frozenset[str]]] = {}
+_titles_lock = threading.Lock()
+
+def _worksheet_titles(client: gspread.Client, spreadsheet_id: str, *, refresh: bool = False) -> frozenset[str]:
+    with _titles_lock:
+        cached = _titles_cache.get(spreadsheet_id)
+    if cached is not None and not refresh and time.monotonic() - cached[0] < _TITLES_TTL_SECONDS:
+        return cached[1]
+    metadata = _sheets_call(
+        lambda: client.http_client.fetch_sheet_metadata(
+            spreadsheet_id, params={"fields": "sheets.properties.title"}
+        )
+    )
+    titles = frozenset(sheet["properties"]["title"] for sheet in metadata.get("sheets", []))
+    with _titles_lock:
+        _titles_cache[spreadsheet_id] = (time.monotonic(), titles)
+    return titles
+
+def list_worksheet_titles(spreadsheet_key_or_url: str) -> frozenset[str]:
+    """Return the spreadsheet's worksheet titles (cached for a few minutes)."""
+    return _worksheet_titles(_authorize_client(), _spreadsheet_id(spreadsheet_key_or_url))
+
+def read_sheet_to_df(spreadsheet_key_or_url: str, worksheet_name: str) -> pd.DataFrame:
+    client = _authorize_client()
+    spreadsheet_id = _spreadsheet_id(spreadsheet_key_or_url)
+    if worksheet_name not in _worksheet_titles(client, spreadsheet_id):
+        raise gspread.exceptions.WorksheetNotFound(worksheet_name)
+    payload = _sheets_call(
+        lambda: client.http_client.values_get(spreadsheet_id, absolute_range_name(worksheet_name))
+    )
+    return _values_to_df(payload.get("values", []))
+
+def read_sheets_to_dfs(spreadsheet_key_or_url: str, worksheet_names) -> dict[str, pd.DataFrame]:
+    """Read several worksheets with one ``values:batchGet`` request.
+
+    Worksheets missing from the spreadsheet are left out of the result, so
+    optional tabs cost nothing and never fail the whole batch.
+    """
+    client = _authorize_client()
+    spreadsheet_id = _spreadsheet_id(spreadsheet_key_or_url)
+    names = list(dict.fromkeys(worksheet_names))
+    for refresh in (False, True):
+        titles = _worksheet_titles(client, spreadsheet_id, refresh=refresh)
+        wanted = [name for name in names if name in titles]
+        if not wanted:
+            return {}
+        try:
+            payload = _sheets_call(
+                lambda: client.http_client.values_batch_get(
+                    spreadsheet_id, [absolute_range_name(name) for name in wanted]
+                )
+            )
+            break
+        except gspread.exceptions.APIError as e:
+            # A tab renamed since the titles were cached; re-list once and retry.
+            if refresh or _status_code(e) != 400:
+                raise
+    value_ranges = payload.get("valueRanges", [])
+    return {name: _values_to_df(vr.get("values", [])) for name, vr in zip(wanted, value_ranges)}
+
+def read_spreadsheet_revision(spreadsheet_key_or_url: str) -> str:
+    """Return a token that changes whenever the spreadsheet is edited.
+
+    This is one small Drive metadata request (``version``, falling back to
+    ``modifiedTime``), cheap enough to make before deciding to re-read tabs.
+    """
+    client = _authorize_client()
+    url = f"{DRIVE_FILES_API_V3_URL}/{_spreadsheet_id(spreadsheet_key_or_url)}"
+    params = {"fields": "version,modifiedTime", "supportsAllDrives": True}
+    metadata = _retry(lambda: client.http_client.request("get", url, params=params).json())
+    return str(metadata.get("version") or metadata.get("modifiedTime") or "")
@@ -1,196 +1,486 @@
 """Cached data loaders.
 
-This module centralizes all Google Sheets reads and light cleaning.
+This module centralizes all worksheet reads and light cleaning.
 The goal is to keep app.py focused on UI and analysis.
 
+Worksheets come from the data source selected by the spreadsheet key: Google
+Sheets, or local files for a ``file://`` key (see ``data_sources``). Every
+worksheet is fetched together in one batch; each table is then coerced by its
+declarative schema in ``data.schema``. Cleaned tables are also persisted as an
+on-disk snapshot so a freshly started process can serve data immediately.
+
+Loading is stale-while-revalidate: page renders get the last good tables
+without waiting, and a background thread re-checks the source's revision (the
+Drive revision for Sheets, file mtimes for local files), re-reading the tabs
+only after an edit.
+
 Behavior should match the original inline loader functions.
 """
 
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from google_sheets_adapter import read_sheet_to_df
+from data.history import HistoryStore
+from data.maxpreps import clear_page_cache
+from data.schema import (
+    COMPILED_SCHEMAS,
+    SCHEMAS,
+    HeaderDrift,
+    TableFootprint,
+    TableSchema,
+    detect_header_drift,
+    encode_join_keys,
+    memory_footprint,
+)
+from data.opponents import OpponentRegistry
+from data.player_stats import PlayerMatchCube
+from data.seasons import SeasonCatalog
+from data.snapshots import load_snapshot, save_snapshot, snapshot_root
+from data.views import MatchRangeIndex, SeasonIndex, filter_players_for_season
+from data_sources import open_data_source
 
+logger = logging.getLogger(__name__)
 
-def _bool_col(series: pd.Series) -> pd.Series:
-    return series.astype(str).str.strip().str.lower().isin(["true", "1", "yes", "y", "t"])
+# Every worksheet the loaders read, fetched together in one batch request.
+SHEET_TABS = (
+    "seasons",
+    "matches",
+    "players",
+    "events",
+    "plays",
+    "summary",
+    "summaries",
+    "goals_allowed",
+)
 
+CACHE_TTL_SECONDS = 300
+# How often the spreadsheet's revision is re-checked before cached data is reused.
+REVALIDATE_SECONDS = 60
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(".cache", "snapshots"))
+HISTORY_FILE = "history.sqlite"
 
-def _strip_and_alias_matches(df: pd.DataFrame) -> pd.DataFrame:
-    df.columns = df.columns.astype(str).str.strip()
-    if "shots_for" not in df.columns and "shots" in df.columns:
-        df = df.rename(columns={"shots": "shots_for"})
-    return df
 
+def _raw_tab(tabs: dict[str, pd.DataFrame], schema: TableSchema) -> Optional[pd.DataFrame]:
+    for worksheet_name in schema.worksheets:
+        if worksheet_name in tabs:
+            return tabs[worksheet_name]
+    if schema.optional:
+        return None
+    raise KeyError(f"Worksheet '{schema.worksheets[0]}' not found")
 
-def _normalize_season_id(df: pd.DataFrame) -> pd.DataFrame:
-    if "season_id" in df.columns:
-        df["season_id"] = df["season_id"].astype(str).str.strip()
+
+def _derive_matches(df: pd.DataFrame) -> pd.DataFrame:
+    if {"goals_for", "goals_against"}.issubset(df):
+        goals_for = df["goals_for"].to_numpy()
+        goals_against = df["goals_against"].to_numpy()
+        df["result"] = np.select([goals_for > goals_against, goals_for < goals_against], ["W", "L"], default="D")
+    if "match_id" not in df:
+        df["match_id"] = df.index.astype(str)
     return df
 
 
-@st.cache_data(ttl=300)
-def load_seasons(spreadsheet_key: str) -> pd.DataFrame:
+# Table-specific columns computed after the schema has coerced the sheet.
+_DERIVED_COLUMNS = {
+    "matches": _derive_matches,
+}
+
+
+def _clean_table(tabs: dict[str, pd.DataFrame], name: str) -> pd.DataFrame:
+    schema = SCHEMAS[name]
+    raw = _raw_tab(tabs, schema)
+    if raw is None:
+        return schema.empty_frame()
+    df = COMPILED_SCHEMAS[name](raw)
+    derive = _DERIVED_COLUMNS.get(name)
+    return derive(df) if derive else df
+
+
+def _check_header_drift(tabs: dict[str, pd.DataFrame]) -> dict[str, HeaderDrift]:
+    drift = {}
+    for name, schema in SCHEMAS.items():
+        raw = next((tabs[w] for w in schema.worksheets if w in tabs), None)
+        if raw is None:
+            continue
+        found = detect_header_drift(schema, raw.columns)
+        if found is not None:
+            logger.warning(
+                "Header drift in %s: missing=%s unexpected=%s", name, list(found.missing), list(found.unexpected)
+            )
+            drift[name] = found
+    return drift
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """One consistent, versioned set of cleaned tables shared by every session.
+
+    A snapshot is never modified after it is built; a refresh publishes a new
+    one. ``table`` hands out shallow copies: under pandas copy-on-write they
+    share the underlying arrays, and any change a caller makes (new columns,
+    renamed headers, in-place edits) copies just what it touches instead of
+    leaking into other sessions.
+    """
+
+    tables: Mapping[str, pd.DataFrame]
+    revision: str
+    fetched_at: datetime
+    header_drift: Mapping[str, HeaderDrift] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tables", MappingProxyType(dict(self.tables)))
+        object.__setattr__(self, "header_drift", MappingProxyType(dict(self.header_drift)))
+
+    @property
+    def version(self) -> str:
+        return f"{self.revision}@{self.fetched_at.isoformat()}"
+
+    def table(self, name: str) -> pd.DataFrame:
+        # Copy-on-write (pandas>=3) keeps the caller's edits off the shared table.
+        return self.tables[name].copy(deep=False)
+
+    def season_table(self, name: str, season_id: str) -> pd.DataFrame:
+        """Return one season's rows of a table, split out once per snapshot."""
+        return self._season_indexes[name].get(season_id)
+
+    @cached_property
+    def _season_indexes(self) -> dict[str, SeasonIndex]:
+        return {name: SeasonIndex(df) for name, df in self.tables.items()}
+
+    def match_ranges(self, season_id: str) -> MatchRangeIndex:
+        """One season's matches sorted by date with running totals, built on first use."""
+        key = str(season_id)
+        if key not in self._match_ranges:
+            self._match_ranges[key] = MatchRangeIndex(self._season_indexes["matches"].get(key))
+        return self._match_ranges[key]
+
+    @cached_property
+    def _match_ranges(self) -> dict[str, MatchRangeIndex]:
+        return {}
+
+    def player_stats(self, season_id: str) -> PlayerMatchCube:
+        """One season's player-by-match event totals with roster names, built on first use."""
+        key = str(season_id)
+        if key not in self._player_stats:
+            events = self._season_indexes["events"].get(key) if "events" in self.tables else None
+            roster = filter_players_for_season(
+                self.tables.get("players", pd.DataFrame()),
+                key,
+                active_season_id=self.season_catalog.resolve(None),
+            )
+            self._player_stats[key] = PlayerMatchCube(events, roster)
+        return self._player_stats[key]
+
+    @cached_property
+    def _player_stats(self) -> dict[str, PlayerMatchCube]:
+        return {}
+
+    @cached_property
+    def season_catalog(self) -> SeasonCatalog:
+        """Season ids, labels and active flags, built once per snapshot."""
+        return SeasonCatalog.from_tables(self.tables.get("seasons"), self.tables.get("matches"))
+
+    @cached_property
+    def opponents(self) -> OpponentRegistry:
+        """Every opponent the sheet names, indexed once per snapshot."""
+        matches = self.tables.get("matches")
+        return OpponentRegistry.from_series(matches.get("opponent") if matches is not None else None)
+
+    @cached_property
+    def footprint(self) -> dict[str, TableFootprint]:
+        """Per-table memory use, measured once per snapshot."""
+        return {name: memory_footprint(df) for name, df in self.tables.items()}
+
+
+@dataclass(frozen=True)
+class DataStatus:
+    """What the Data Health panel reports about the loaded tables."""
+
+    fetched_at: Optional[datetime]
+    revision: Optional[str]
+    refreshing: bool
+    last_error: Optional[str] = None
+    header_drift: dict[str, HeaderDrift] = field(default_factory=dict)
+    footprint: dict[str, TableFootprint] = field(default_factory=dict)
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        if self.fetched_at is None:
+            return None
+        return max(0.0, (datetime.now(timezone.utc) - self.fetched_at).total_seconds())
+
+
+def _probe_revision(spreadsheet_key: str) -> str:
+    """Return the source's current revision token.
+
+    If the metadata probe fails, a token that rolls over every
+    ``CACHE_TTL_SECONDS`` is returned so data still refreshes on a timer.
+    """
     try:
-        df = read_sheet_to_df(spreadsheet_key, "seasons")
+        revision = open_data_source(spreadsheet_key).revision()
     except Exception:
-        return pd.DataFrame(columns=["season_id", "label", "active"])
-    df.columns = [str(column).strip().lower() for column in df.columns]
-    return _normalize_season_id(df)
+        revision = ""
+    return revision or f"ttl:{int(time.time() // CACHE_TTL_SECONDS)}"
 
 
-@st.cache_data(ttl=300)
-def load_matches(spreadsheet_key: str) -> pd.DataFrame:
-    df = read_sheet_to_df(spreadsheet_key, "matches")
-    df = _strip_and_alias_matches(df)
-    if "date" in df:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    if "division_game" in df:
-        df["division_game"] = _bool_col(df["division_game"])
-    if "home_away" in df:
-        df["home_away"] = (
-            df["home_away"].astype(str).str.strip().str.lower().map({"h": "H", "home": "H", "a": "A", "away": "A"})
-        )
-    for c in [
-        "goals_for",
-        "goals_against",
-        "shots_for",
-        "shots_target",
-        "shots_against",
-        "shots_against_target",
-        "saves",
-    ]:
-        if c in df:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
-    if {"goals_for", "goals_against"}.issubset(df):
-        df["result"] = df.apply(
-            lambda r: "W" if r.goals_for > r.goals_against else ("L" if r.goals_for < r.goals_against else "D"), axis=1
+def _fetch_tables(spreadsheet_key: str, revision: str) -> DataSnapshot:
+    tabs = open_data_source(spreadsheet_key).read_tabs(SHEET_TABS)
+    tables = {name: _clean_table(tabs, name) for name in SCHEMAS}
+    encode_join_keys(tables)
+    loaded = DataSnapshot(
+        tables=tables,
+        revision=revision,
+        fetched_at=datetime.now(timezone.utc),
+        header_drift=_check_header_drift(tabs),
+    )
+    # Persistence is best-effort; the fresh tables are still served.
+    try:
+        save_snapshot(
+            SNAPSHOT_DIR,
+            spreadsheet_key,
+            loaded.tables,
+            fetched_at=loaded.fetched_at,
+            revision=revision,
         )
-    if "match_id" not in df:
-        df["match_id"] = df.index.astype(str)
-    else:
-        df["match_id"] = df["match_id"].astype(str)
-    return _normalize_season_id(df)
+    except Exception:
+        logger.warning("Could not save the snapshot for %s", spreadsheet_key, exc_info=True)
+    try:
+        _history_store(spreadsheet_key).sync(loaded.tables, loaded.version)
+    except Exception:
+        logger.warning("Could not sync the history store for %s", spreadsheet_key, exc_info=True)
+    return loaded
+
+
+class _TableStore:
+    """Process-wide, stale-while-revalidate holder for one spreadsheet's tables.
+
+    Readers always get the last good tables immediately. Once they are older
+    than ``REVALIDATE_SECONDS`` a single background thread probes the source's
+    revision and, only if it changed, re-reads the tabs and swaps the new
+    tables in with one reference assignment. Only a process with nothing to
+    serve yet (no memory copy, no disk snapshot) or a manual refresh blocks.
+    """
+
+    def __init__(self, spreadsheet_key: str):
+        self.spreadsheet_key = spreadsheet_key
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._loaded: Optional[DataSnapshot] = None
+        self._checked_at = float("-inf")
+        self._refreshing = False
+        self._force_refetch = False
+        self._last_error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def current(self) -> DataSnapshot:
+        with self._lock:
+            loaded = None if self._force_refetch else self._loaded
+            stale = time.monotonic() - self._checked_at >= REVALIDATE_SECONDS
+        if loaded is None:
+            return self._load_blocking()
+        if stale:
+            self._start_refresh()
+        return loaded
+
+    def status(self) -> DataStatus:
+        with self._lock:
+            loaded = self._loaded
+            return DataStatus(
+                fetched_at=loaded.fetched_at if loaded else None,
+                revision=loaded.revision if loaded else None,
+                refreshing=self._refreshing,
+                last_error=self._last_error,
+                header_drift=dict(loaded.header_drift) if loaded else {},
+                footprint=dict(loaded.footprint) if loaded else {},
+            )
+
+    def fetch_now(self) -> DataSnapshot:
+        with self._fetch_lock:
+            loaded = _fetch_tables(self.spreadsheet_key, _probe_revision(self.spreadsheet_key))
+        self._publish(loaded, checked=True)
+        return loaded
+
+    def invalidate(self) -> None:
+        """Make the next read re-fetch from the source, bypassing the disk snapshot."""
+        with self._lock:
+            self._force_refetch = True
+
+    def _publish(self, loaded: DataSnapshot, *, checked: bool) -> None:
+        with self._lock:
+            self._loaded = loaded
+            if checked:
+                self._checked_at = time.monotonic()
+                self._force_refetch = False
+                self._last_error = None
+
+    def _load_blocking(self) -> DataSnapshot:
+        with self._fetch_lock:
+            with self._lock:
+                force = self._force_refetch
+                if self._loaded is not None and not force:
+                    return self._loaded
+            if not force:
+                snapshot = load_snapshot(SNAPSHOT_DIR, self.spreadsheet_key)
+                if snapshot is not None:
+                    # First load after a restart: serve the snapshot, revalidate behind it.
+                    loaded = DataSnapshot(snapshot.tables, snapshot.revision or "", snapshot.fetched_at)
+                    self._publish(loaded, checked=False)
+                    self._start_refresh()
+                    return loaded
+            try:
+                loaded = _fetch_tables(self.spreadsheet_key, _probe_revision(self.spreadsheet_key))
+            except Exception as exc:
+                with self._lock:
+                    stale = self._loaded
+                    if stale is None:
+                        raise
+                    # A failed manual refresh keeps serving the last good tables.
+                    self._force_refetch = False
+                    self._last_error = f"{type(exc).__name__}: {exc}"
+                return stale
+            self._publish(loaded, checked=True)
+            return loaded
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self._thread = threading.Thread(target=self._refresh, name="sheet-refresh", daemon=True)
+        self._thread.start()
+
+    def _refresh(self) -> None:
+        error = None
+        try:
+            with self._fetch_lock:
+                revision = _probe_revision(self.spreadsheet_key)
+                with self._lock:
+                    current = self._loaded
+                if current is None or current.revision != revision:
+                    self._publish(_fetch_tables(self.spreadsheet_key, revision), checked=True)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"  # Keep serving the last good tables.
+        finally:
+            with self._lock:
+                self._checked_at = time.monotonic()
+                self._refreshing = False
+                if error is not None:
+                    self._last_error = error
+
+
+_stores: dict[str, _TableStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _table_store(spreadsheet_key: str) -> _TableStore:
+    with _stores_lock:
+        store = _stores.get(spreadsheet_key)
+        if store is None:
+            store = _stores[spreadsheet_key] = _TableStore(spreadsheet_key)
+        return store
+
+
+def load_data_snapshot(spreadsheet_key: str) -> DataSnapshot:
+    """Return the current snapshot of every cleaned table.
+
+    Never waits on the network once any data is available: the last good
+    snapshot is served while a background refresh re-checks the source. Take
+    one snapshot per script run so every table comes from the same version.
+    """
+    return _table_store(spreadsheet_key).current()
+
+
+def prefetch_tables(spreadsheet_key: str) -> DataSnapshot:
+    """Read every table from the source now and publish it, raising on failure.
+
+    Unlike ``load_data_snapshot`` this never falls back to older data, so a
+    warmup run can tell whether the source is actually reachable.
+    """
+    return _table_store(spreadsheet_key).fetch_now()
+
+
+def data_status(spreadsheet_key: str) -> DataStatus:
+    """Return the age and refresh state of the loaded tables."""
+    return _table_store(spreadsheet_key).status()
+
+
+_history_stores: dict[str, HistoryStore] = {}
+_history_stores_lock = threading.Lock()
+
+
+def _history_store(spreadsheet_key: str) -> HistoryStore:
+    """Return the process-wide store for a spreadsheet, so its connection is reused."""
+    path = snapshot_root(SNAPSHOT_DIR, spreadsheet_key) / HISTORY_FILE
+    with _history_stores_lock:
+        store = _history_stores.get(str(path))
+        if store is None:
+            store = _history_stores[str(path)] = HistoryStore(path)
+        return store
+
+
+def load_history_store(spreadsheet_key: str, snapshot: DataSnapshot) -> Optional[HistoryStore]:
+    """Return the SQLite history store if it holds ``snapshot``, else None.
+
+    The store is only written by ``_fetch_tables``; a request never syncs it.
+    Queries should still run inside ``store.reading(snapshot.version)``, since
+    a refresh can swap the file at any time.
+    """
+    store = _history_store(spreadsheet_key)
+    if store.version() != snapshot.version:
+        return None
+    return store
+
+
+def _load_current_table(spreadsheet_key: str, name: str) -> pd.DataFrame:
+    return load_data_snapshot(spreadsheet_key).table(name)
+
+
+def load_seasons(spreadsheet_key: str) -> pd.DataFrame:
+    return _load_current_table(spreadsheet_key, "seasons")
+
+
+def load_matches(spreadsheet_key: str) -> pd.DataFrame:
+    return _load_current_table(spreadsheet_key, "matches")
 
 
-@st.cache_data(ttl=300)
 def load_players(spreadsheet_key: str) -> pd.DataFrame:
-    df = read_sheet_to_df(spreadsheet_key, "players")
-    df.columns = [str(column).strip().lower() for column in df.columns]
-    if "jersey" in df:
-        df["jersey"] = pd.to_numeric(df["jersey"], errors="coerce").fillna(0).astype(int)
-    if "player_id" in df:
-        df["player_id"] = df["player_id"].astype(str)
-    if "player_status" in df:
-        df["player_status"] = df["player_status"].astype(str).str.strip().str.lower()
-    return _normalize_season_id(df)
-
-
-@st.cache_data(ttl=300)
+    return _load_current_table(spreadsheet_key, "players")
+
+
 def load_events(spreadsheet_key: str) -> pd.DataFrame:
-    df = read_sheet_to_df(spreadsheet_key, "events")
-    df.columns = [c.strip().lower() for c in df.columns]
-    if "assist" in df.columns and "assists" not in df.columns:
-        df = df.rename(columns={"assist": "assists"})
-    for k in ["event_id", "match_id", "player_id"]:
-        if k in df.columns:
-            df[k] = df[k].astype(str)
-    for n in ["goals", "assists", "shots", "fouls"]:
-        if n not in df.columns:
-            df[n] = 0
-        df[n] = pd.to_numeric(df[n], errors="coerce").fillna(0).astype(int)
-    return _normalize_season_id(df)
-
-
-@st.cache_data(ttl=300)
+    return _load_current_table(spreadsheet_key, "events")
+
+
 def load_plays_simple(spreadsheet_key: str) -> pd.DataFrame:
-    try:
-        raw = read_sheet_to_df(spreadsheet_key, "plays")
-    except Exception:
-        return pd.DataFrame()
-    raw.columns = [c.lower().strip() for c in raw.columns]
-    if "play type" in raw and "play_type" not in raw:
-        raw = raw.rename(columns={"play type": "play_type"})
-    if "set_piece" in raw:
-        sp = raw["set_piece"].astype(str).str.strip().str.lower()
-        raw["set_piece"] = sp.replace(
-            {"direct": "fk_direct", "indirect": "fk_indirect", "fk direct": "fk_direct", "fk indirect": "fk_indirect"}
-        )
-    raw["taker_notes"] = raw.get("taker_id", "").astype(str).fillna("")
-    if "goal_created" in raw:
-        raw["goal_created"] = (
-            raw["goal_created"]
-            .astype(str)
-            .str.strip()
-            .str.lower()
-            .map({"true": True, "yes": True, "y": True, "1": True, "no": False, "false": False, "0": False})
-            .fillna(False)
-        )
-    for k in ["match_id", "play_call_id", "play_type"]:
-        if k in raw:
-            raw[k] = raw[k].astype(str).fillna("").str.strip()
-    keep = [
-        c
-        for c in ["season_id", "match_id", "set_piece", "play_call_id", "play_type", "taker_notes", "goal_created"]
-        if c in raw
-    ]
-    return _normalize_season_id(raw[keep].copy())
-
-
-@st.cache_data(ttl=300)
+    return _load_current_table(spreadsheet_key, "plays_simple")
+
+
 def load_summaries(spreadsheet_key: str) -> pd.DataFrame:
-    # Support both 'summary' and 'summaries'
-    for tab in ("summary", "summaries"):
-        try:
-            df = read_sheet_to_df(spreadsheet_key, tab)
-            df.columns = [str(c).strip().lower() for c in df.columns]
-            if "match_id" in df.columns:
-                df["match_id"] = df["match_id"].astype(str)
-            return _normalize_season_id(df)
-        except Exception:
-            continue
-    return pd.DataFrame()
+    return _load_current_table(spreadsheet_key, "summaries")
 
 
-@st.cache_data(ttl=300)
 def load_goals_allowed(spreadsheet_key: str) -> pd.DataFrame:
-    """Read 'goals_allowed' tab.
-
-    Expected columns (case-insensitive, flexible):
-      - match_id (str)
-      - goal_id (str)  [optional]
-      - description or description_of_goal (str)  [optional]
-      - goalie_player_id / goalkeeper_player_id / goalie (player_id as str)
-      - minute (int) [optional]
-      - situation (str) [optional]
-    """
+    return _load_current_table(spreadsheet_key, "goals_allowed")
 
-    try:
-        df = read_sheet_to_df(spreadsheet_key, "goals_allowed")
-    except Exception:
-        return pd.DataFrame()
-
-    df.columns = [str(c).strip().lower() for c in df.columns]
-
-    if "description_of_goal" in df.columns and "description" not in df.columns:
-        df = df.rename(columns={"description_of_goal": "description"})
-    for cand in ["goalie_player_id", "goalkeeper_player_id", "goalie"]:
-        if cand in df.columns:
-            df = df.rename(columns={cand: "goalie_player_id"})
-            break
-    if "goalie_player_id" not in df.columns:
-        df["goalie_player_id"] = ""
-
-    for k in ["match_id", "goal_id", "goalie_player_id"]:
-        if k in df.columns:
-            df[k] = df[k].astype(str)
-    if "minute" in df.columns:
-        df["minute"] = pd.to_numeric(df["minute"], errors="coerce")
-    else:
-        df["minute"] = pd.NA
-    if "situation" not in df.columns:
-        df["situation"] = ""
-    if "description" not in df.columns:
-        df["description"] = ""
-
-    return _normalize_season_id(df)
+
+def clear_caches() -> None:
+    """Drop cached data so the next load re-reads the source, not the disk snapshot.
+
+    Cached MaxPreps pages are deleted too, so schedules and rankings refetch.
+    """
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.invalidate()
+    clear_page_cache()
+    st.cache_data.clear()
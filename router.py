@@ -19,6 +19,7 @@ def route(*, ctx, handlers: HomeHandlers) -> None:
             events=ctx.events_view,
             plays_df=ctx.plays_view,
             summaries=ctx.summaries,
+            player_stats=ctx.player_stats,
             qparams_set=handlers.qparams_set,
             format_date=handlers.format_date,
             generate_ai_game_summary=handlers.generate_ai_game_summary,
@@ -43,4 +44,7 @@ def route(*, ctx, handlers: HomeHandlers) -> None:
         our_rank=ctx.our_rank,
         compact=ctx.compact,
         handlers=handlers,
+        data_status=ctx.data_status,
+        match_totals=ctx.match_totals,
+        player_stats=ctx.player_stats,
     )
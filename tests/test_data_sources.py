@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from data_sources import LocalFilesSource, SheetsSource, open_data_source
+
+
+class LocalFilesSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def test_reads_csv_tabs_as_stripped_strings(self):
+        (self.root / "matches.csv").write_text("match_id, opponent \n0, Rice \n1,\n", encoding="utf-8")
+
+        tabs = LocalFilesSource(self.root).read_tabs(["matches", "plays"])
+
+        self.assertEqual(list(tabs), ["matches"])
+        self.assertEqual(list(tabs["matches"].columns), ["match_id", "opponent"])
+        self.assertEqual(tabs["matches"]["opponent"].tolist(), ["Rice", ""])
+
+    def test_parquet_values_are_rendered_like_sheet_cells(self):
+        pd.DataFrame({"goals": [2, None], "player_id": ["7", "8"]}).to_parquet(self.root / "events.parquet")
+
+        events = LocalFilesSource(self.root).read_tabs(["events"])["events"]
+
+        self.assertEqual(events["goals"].tolist(), ["2.0", ""])
+        self.assertEqual(events["player_id"].tolist(), ["7", "8"])
+
+    def test_reads_tabs_from_sqlite_database(self):
+        db_path = self.root / "team.sqlite"
+        with closing(sqlite3.connect(db_path)) as conn:
+            pd.DataFrame({"player_id": [7], "name": ["Sam"]}).to_sql("players", conn, index=False)
+
+        tabs = LocalFilesSource(db_path).read_tabs(["players", "events"])
+
+        self.assertEqual(list(tabs), ["players"])
+        self.assertEqual(tabs["players"].loc[0, "player_id"], "7")
+
+    def test_revision_changes_when_a_file_is_modified(self):
+        tab_file = self.root / "matches.csv"
+        tab_file.write_text("match_id\n0\n", encoding="utf-8")
+        source = LocalFilesSource(self.root)
+        before = source.revision()
+
+        stat = tab_file.stat()
+        os.utime(tab_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertNotEqual(source.revision(), before)
+
+
+class OpenDataSourceTests(unittest.TestCase):
+    def test_file_scheme_selects_local_files(self):
+        source = open_data_source("file:///srv/team-data")
+        self.assertIsInstance(source, LocalFilesSource)
+        self.assertEqual(source.path, Path("/srv/team-data"))
+
+    def test_sheet_ids_and_urls_select_google_sheets(self):
+        for key in ("abc123", "https://docs.google.com/spreadsheets/d/abc123/edit"):
+            source = open_data_source(key)
+            self.assertIsInstance(source, SheetsSource)
+            self.assertEqual(source.spreadsheet_key, key)
+
+
+if __name__ == "__main__":
+    unittest.main()
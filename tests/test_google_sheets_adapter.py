@@ -0,0 +1,227 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import google_sheets_adapter as adapter
+
+
+class _FakeHttpClient:
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.batch_calls = []
+        self.metadata_calls = 0
+
+    def fetch_sheet_metadata(self, spreadsheet_id, params=None):
+        self.metadata_calls += 1
+        return {"sheets": [{"properties": {"title": title}} for title in self.tabs]}
+
+    def values_get(self, spreadsheet_id, range_name, params=None):
+        return {"range": range_name, "values": self.tabs[range_name.strip("'")]}
+
+    def values_batch_get(self, spreadsheet_id, ranges, params=None):
+        self.batch_calls.append(list(ranges))
+        value_ranges = []
+        for range_name in ranges:
+            title = range_name.strip("'")
+            value_ranges.append({"range": range_name, "values": self.tabs[title]})
+        return {"valueRanges": value_ranges}
+
+
+class _FakeClient:
+    def __init__(self, tabs):
+        self.http_client = _FakeHttpClient(tabs)
+
+
+def _api_error(status, headers=None):
+    response = mock.Mock(status_code=status, headers=headers or {}, text="")
+    response.json.return_value = {"error": {"code": status, "message": "boom", "status": "ERR"}}
+    return adapter.gspread.exceptions.APIError(response)
+
+
+class _FreshAdapterStateMixin:
+    def setUp(self):
+        adapter._titles_cache.clear()
+        self.addCleanup(adapter._titles_cache.clear)
+        patcher = mock.patch.object(adapter, "_sheets_bucket", adapter._TokenBucket(6000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class ReadSheetsBatchTests(_FreshAdapterStateMixin, unittest.TestCase):
+    def test_reads_existing_tabs_in_one_batch_request(self):
+        client = _FakeClient(
+            {
+                "matches": [["match_id", " opponent "], ["0", " Rice  "], ["1"]],
+                "events": [["event_id", "goals"], ["e1", "2"]],
+            }
+        )
+
+        with mock.patch.object(adapter, "_authorize_client", return_value=client):
+            tabs = adapter.read_sheets_to_dfs("sheet-id", ["matches", "events", "plays"])
+
+        self.assertEqual(client.http_client.batch_calls, [["'matches'", "'events'"]])
+        self.assertEqual(sorted(tabs), ["events", "matches"])
+        self.assertEqual(tabs["matches"].columns.tolist(), ["match_id", "opponent"])
+        self.assertEqual(tabs["matches"]["opponent"].tolist(), ["Rice", ""])
+
+    def test_empty_tab_becomes_empty_frame(self):
+        client = _FakeClient({"summary": []})
+
+        with mock.patch.object(adapter, "_authorize_client", return_value=client):
+            tabs = adapter.read_sheets_to_dfs("sheet-id", ["summary"])
+
+        self.assertTrue(tabs["summary"].empty)
+
+    def test_worksheet_titles_are_listed_once_per_ttl(self):
+        client = _FakeClient({"matches": [["match_id"], ["0"]]})
+
+        with mock.patch.object(adapter, "_authorize_client", return_value=client):
+            adapter.read_sheets_to_dfs("sheet-id", ["matches"])
+            adapter.read_sheets_to_dfs("sheet-id", ["matches", "plays"])
+
+        self.assertEqual(client.http_client.metadata_calls, 1)
+        self.assertEqual(len(client.http_client.batch_calls), 2)
+
+    def test_renamed_tab_relists_titles_and_retries(self):
+        client = _FakeClient({"matches": [["match_id"], ["0"]]})
+        adapter._titles_cache["sheet-id"] = (adapter.time.monotonic(), frozenset({"matches", "old_tab"}))
+        batch_get = client.http_client.values_batch_get
+        client.http_client.values_batch_get = mock.Mock(side_effect=[_api_error(400), batch_get("sheet-id", ["'matches'"])])
+
+        with mock.patch.object(adapter, "_authorize_client", return_value=client):
+            tabs = adapter.read_sheets_to_dfs("sheet-id", ["matches", "old_tab"])
+
+        self.assertEqual(list(tabs), ["matches"])
+        self.assertEqual(client.http_client.metadata_calls, 1)
+
+    def test_missing_single_tab_fails_fast_without_a_values_request(self):
+        client = _FakeClient({"summaries": [["match_id"], ["0"]]})
+        client.http_client.values_get = mock.Mock(wraps=client.http_client.values_get)
+
+        with mock.patch.object(adapter, "_authorize_client", return_value=client), mock.patch.object(
+            adapter.time, "sleep"
+        ) as sleep:
+            with self.assertRaises(adapter.gspread.exceptions.WorksheetNotFound):
+                adapter.read_sheet_to_df("sheet-id", "summary")
+            df = adapter.read_sheet_to_df("sheet-id", "summaries")
+
+        sleep.assert_not_called()
+        self.assertEqual(client.http_client.values_get.call_count, 1)
+        self.assertEqual(df["match_id"].tolist(), ["0"])
+
+
+class RetryTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(adapter.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_client_errors_are_not_retried(self):
+        for error in (_api_error(404), adapter.gspread.exceptions.WorksheetNotFound("plays"), ValueError("bad")):
+            fn = mock.Mock(side_effect=error)
+            with self.assertRaises(type(error)):
+                adapter._retry(fn)
+            self.assertEqual(fn.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_rate_limit_honors_retry_after(self):
+        fn = mock.Mock(side_effect=[_api_error(429, {"Retry-After": "7"}), "ok"])
+
+        self.assertEqual(adapter._retry(fn), "ok")
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_server_errors_back_off_with_jitter(self):
+        fn = mock.Mock(side_effect=[_api_error(503), adapter.requests.ConnectionError(), "ok"])
+
+        with mock.patch.object(adapter.random, "uniform", side_effect=lambda low, high: high):
+            self.assertEqual(adapter._retry(fn, delay=1.0, backoff=2.0), "ok")
+
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [1.0, 2.0])
+
+    def test_gives_up_after_the_last_try(self):
+        fn = mock.Mock(side_effect=_api_error(500))
+
+        with self.assertRaises(adapter.gspread.exceptions.APIError):
+            adapter._retry(fn, tries=3)
+        self.assertEqual(fn.call_count, 3)
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_bursts_then_paces_to_the_rate(self):
+        now = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        bucket = adapter._TokenBucket(60, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertEqual(len(waits), 2)
+        self.assertAlmostEqual(sum(waits), 2.0)
+
+
+class SpreadsheetRevisionTests(unittest.TestCase):
+    def test_probe_reads_drive_version(self):
+        response = mock.Mock()
+        response.json.return_value = {"version": "57", "modifiedTime": "2026-10-01T12:00:00Z"}
+        client = SimpleNamespace(http_client=mock.Mock())
+        client.http_client.request.return_value = response
+
+        with mock.patch.object(adapter, "_authorize_client", return_value=client):
+            revision = adapter.read_spreadsheet_revision("https://docs.google.com/spreadsheets/d/abc123/edit")
+
+        self.assertEqual(revision, "57")
+        method, url = client.http_client.request.call_args.args
+        self.assertEqual(method, "get")
+        self.assertTrue(url.endswith("/files/abc123"))
+
+
+class _FakeCredentials:
+    def __init__(self, expires_in):
+        self.token = "token"
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + expires_in
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+
+
+class PooledClientTests(unittest.TestCase):
+    def setUp(self):
+        adapter._client = None
+        self.addCleanup(setattr, adapter, "_client", None)
+
+    def _authorize(self, creds):
+        return SimpleNamespace(http_client=SimpleNamespace(auth=creds, session=mock.Mock()))
+
+    def test_client_is_built_once_and_reused(self):
+        creds = _FakeCredentials(timedelta(hours=1))
+        with mock.patch.object(adapter, "_build_credentials", return_value=creds) as build, mock.patch.object(
+            adapter.gspread, "authorize", side_effect=self._authorize
+        ):
+            first = adapter._authorize_client()
+            second = adapter._authorize_client()
+
+        self.assertIs(first, second)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(creds.refreshes, 0)
+        first.http_client.session.mount.assert_called_once()
+
+    def test_token_is_refreshed_shortly_before_expiry(self):
+        creds = _FakeCredentials(timedelta(minutes=2))
+        with mock.patch.object(adapter, "_build_credentials", return_value=creds), mock.patch.object(
+            adapter.gspread, "authorize", side_effect=self._authorize
+        ):
+            adapter._authorize_client()
+            adapter._authorize_client()
+
+        self.assertEqual(creds.refreshes, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
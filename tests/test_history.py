@@ -0,0 +1,156 @@
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from data.history import HistoryStore, Predicate
+from data.schema import COMPILED_SCHEMAS
+from data.views import (
+    apply_match_filters,
+    derive_related_views,
+    filter_by_season,
+    query_match_views,
+    query_season,
+)
+
+
+def _tables() -> dict[str, pd.DataFrame]:
+    matches = COMPILED_SCHEMAS["matches"](
+        pd.DataFrame(
+            {
+                "match_id": ["0", "1", "0", "1"],
+                "season_id": ["2025", "2025", "2026", "2026"],
+                "date": ["2025-09-01", "2025-09-05", "2026-09-02", ""],
+                "opponent": ["Rice", "Essex", "Rice", "Mount Mansfield"],
+                "home_away": ["H", "A", "A", "H"],
+                "division_game": ["TRUE", "FALSE", "TRUE", "TRUE"],
+                "goals_for": ["2", "0", "1", "3"],
+            }
+        )
+    )
+    events = COMPILED_SCHEMAS["events"](
+        pd.DataFrame(
+            {
+                "event_id": ["1", "2", "3", "4"],
+                "season_id": ["2025", "2026", "2026", "2026"],
+                "match_id": ["0", "0", "0", "1"],
+                "player_id": ["7", "7", "8", "7"],
+                "goals": ["1", "1", "0", "2"],
+            }
+        )
+    )
+    goals_allowed = COMPILED_SCHEMAS["goals_allowed"](
+        pd.DataFrame({"match_id": ["0", "1"], "season_id": ["2026", "2026"], "situation": ["corner", ""]})
+    )
+    return {"matches": matches, "events": events, "goals_allowed": goals_allowed}
+
+
+class HistoryStoreTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = HistoryStore(Path(tmp.name) / "history.sqlite")
+        self.addCleanup(self.store.close)
+        self.tables = _tables()
+        self.store.sync(self.tables, "rev-1")
+
+    def test_round_trip_keeps_dtypes_and_row_labels(self):
+        for name, df in self.tables.items():
+            pd.testing.assert_frame_equal(self.store.select(name), df, check_index_type=False)
+
+    def test_sync_skips_a_version_it_already_holds(self):
+        self.assertFalse(self.store.sync(self.tables, "rev-1"))
+        self.assertTrue(self.store.sync({"matches": self.tables["matches"].iloc[:1]}, "rev-2"))
+        self.assertEqual(self.store.version(), "rev-2")
+        self.assertEqual(self.store.columns("events"), [])
+
+    def test_queries_share_one_connection_until_the_file_is_swapped(self):
+        with mock.patch.object(self.store, "_connect", wraps=self.store._connect) as connect:
+            self.store.select("matches")
+            self.store.columns("events")
+            self.store.version()
+            self.assertEqual(connect.call_count, 1)
+
+            self.store.sync({"matches": self.tables["matches"].iloc[:1]}, "rev-2")
+            self.assertEqual(len(self.store.select("matches")), 1)
+            self.assertEqual(connect.call_count, 2)
+
+    def test_reading_pins_one_version_across_a_sync(self):
+        with self.store.reading("rev-1") as current:
+            self.assertTrue(current)
+            self.store.sync({"matches": self.tables["matches"].iloc[:1]}, "rev-2")
+            self.assertEqual(len(self.store.select("matches")), len(self.tables["matches"]))
+
+        with self.store.reading("rev-1") as current:
+            self.assertFalse(current)
+        self.assertEqual(len(self.store.select("matches")), 1)
+
+    def test_missing_file_has_no_version(self):
+        self.store.path.unlink()
+
+        self.assertIsNone(self.store.version())
+
+    def test_season_and_player_indexes_are_created(self):
+        with closing(sqlite3.connect(self.store.path)) as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("ix_events_season_id_match_id", indexes)
+        self.assertIn("ix_events_player_id", indexes)
+        self.assertIn("ix_matches_season_id_match_id", indexes)
+
+    def test_unknown_columns_are_rejected(self):
+        with self.assertRaises(KeyError):
+            self.store.select("matches", [Predicate("opponent; DROP TABLE matches", "eq", "x")])
+
+
+class PushedDownViewTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = HistoryStore(Path(tmp.name) / "history.sqlite")
+        self.addCleanup(self.store.close)
+        self.tables = _tables()
+        self.store.sync(self.tables, "rev-1")
+
+    def test_season_query_matches_in_memory_filter(self):
+        for season in ("2025", "2026", "2030"):
+            pd.testing.assert_frame_equal(
+                query_season(self.store, "events", season),
+                filter_by_season(self.tables["events"], season),
+                check_index_type=False,
+            )
+
+    def test_match_filters_match_in_memory_views(self):
+        for filters in (
+            {"div_only": True, "opp_filter": "", "ha_val": "any"},
+            {"div_only": False, "opp_filter": "RICE", "ha_val": "away"},
+            {"div_only": False, "opp_filter": "", "ha_val": "h"},
+            {"div_only": True, "opp_filter": "nobody", "ha_val": "any"},
+            {"div_only": False, "opp_filter": "Mt. Mansfield Union", "ha_val": "any"},
+        ):
+            with self.subTest(**filters):
+                matches = filter_by_season(self.tables["matches"], "2026")
+                matches_view = apply_match_filters(matches, **filters)
+                expected = (
+                    matches_view,
+                    *derive_related_views(
+                        matches_view=matches_view,
+                        events=filter_by_season(self.tables["events"], "2026"),
+                        plays_simple=pd.DataFrame(),
+                        goals_allowed=filter_by_season(self.tables["goals_allowed"], "2026"),
+                    ),
+                )
+
+                actual = query_match_views(self.store, "2026", **filters)
+
+                for got, want in zip(actual[:2], expected[:2]):
+                    pd.testing.assert_frame_equal(got, want, check_index_type=False)
+                pd.testing.assert_frame_equal(actual[3], expected[3], check_index_type=False)
+                self.assertTrue(actual[2].empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import tempfile
+import threading
+from datetime import datetime, timezone
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+import loaders
+
+
+def _write_tabs(root: Path, goals_for: str) -> None:
+    (root / "matches.csv").write_text(
+        f"match_id,season_id,goals_for,goals_against\n0,2026,{goals_for},1\n", encoding="utf-8"
+    )
+    (root / "players.csv").write_text("player_id,player_status\n7,current\n", encoding="utf-8")
+    (root / "events.csv").write_text("event_id,match_id,player_id,goals\n1,0,7,1\n", encoding="utf-8")
+
+
+class CleanMatchesTests(unittest.TestCase):
+    def test_result_is_derived_from_goals(self):
+        raw = pd.DataFrame({"match_id": ["0", "1", "2"], "goals_for": ["3", "0", "1"], "goals_against": ["1", "2", "1"]})
+
+        matches = loaders._clean_table({"matches": raw}, "matches")
+
+        self.assertEqual(matches["result"].tolist(), ["W", "L", "D"])
+
+
+class DataSnapshotTests(unittest.TestCase):
+    def _snapshot(self):
+        matches = pd.DataFrame({"match_id": ["0", "1"], "goals_for": [2, 0]})
+        return loaders.DataSnapshot({"matches": matches}, "rev-1", datetime(2026, 10, 1, tzinfo=timezone.utc))
+
+    def test_caller_changes_do_not_leak_into_the_shared_table(self):
+        snapshot = self._snapshot()
+
+        session_copy = snapshot.table("matches")
+        session_copy.columns = ["MATCH_ID", "GOALS_FOR"]
+        session_copy.loc[0, "GOALS_FOR"] = 9
+        session_copy["extra"] = 1
+
+        shared = snapshot.tables["matches"]
+        self.assertEqual(shared.columns.tolist(), ["match_id", "goals_for"])
+        self.assertEqual(shared["goals_for"].tolist(), [2, 0])
+
+    def test_table_mapping_is_read_only(self):
+        snapshot = self._snapshot()
+
+        with self.assertRaises(TypeError):
+            snapshot.tables["matches"] = pd.DataFrame()
+        self.assertEqual(snapshot.version, "rev-1@2026-10-01T00:00:00+00:00")
+
+    def test_season_table_is_split_once_and_copied_shallowly(self):
+        snapshot = loaders.DataSnapshot(
+            {"events": pd.DataFrame({"season_id": ["2025", "2026", "2026"], "goals": [1, 2, 3]})},
+            "rev-1",
+            datetime(2026, 10, 1, tzinfo=timezone.utc),
+        )
+
+        season = snapshot.season_table("events", "2026")
+        season["goals"] = 0
+
+        self.assertEqual(snapshot.season_table("events", "2026")["goals"].tolist(), [2, 3])
+        self.assertIs(snapshot._season_indexes, snapshot._season_indexes)
+
+    def test_season_catalog_is_built_once_per_snapshot(self):
+        snapshot = self._snapshot()
+
+        self.assertIs(snapshot.season_catalog, snapshot.season_catalog)
+        self.assertEqual(snapshot.season_catalog.ids, ("2025",))
+
+    def test_match_ranges_are_built_once_per_season(self):
+        snapshot = self._snapshot()
+
+        self.assertIs(snapshot.match_ranges("2025"), snapshot.match_ranges("2025"))
+        self.assertEqual(len(snapshot.match_ranges("2025")), 2)
+        self.assertEqual(len(snapshot.match_ranges("2026")), 0)
+
+    def test_player_stats_are_built_once_per_season(self):
+        snapshot = loaders.DataSnapshot(
+            {
+                "events": pd.DataFrame({"season_id": ["2026"], "match_id": ["0"], "player_id": ["7"], "goals": [1]}),
+                "players": pd.DataFrame({"season_id": ["2026"], "player_id": ["7"], "name": ["Avery"]}),
+            },
+            "rev-1",
+            datetime(2026, 10, 1, tzinfo=timezone.utc),
+        )
+
+        self.assertIs(snapshot.player_stats("2026"), snapshot.player_stats("2026"))
+        self.assertEqual(snapshot.player_stats("2026").leaderboard()["name"].tolist(), ["Avery"])
+        self.assertEqual(len(snapshot.player_stats("2025")), 0)
+
+    def test_footprint_covers_every_table(self):
+        footprint = self._snapshot().footprint
+
+        self.assertEqual(list(footprint), ["matches"])
+        self.assertEqual(footprint["matches"].rows, 2)
+
+
+class TableStoreTests(unittest.TestCase):
+    def setUp(self):
+        data_dir = tempfile.TemporaryDirectory()
+        snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        self.addCleanup(snapshot_dir.cleanup)
+        self.root = Path(data_dir.name)
+        self.key = f"file://{self.root}"
+        _write_tabs(self.root, "2")
+        for patcher in (
+            mock.patch.object(loaders, "SNAPSHOT_DIR", snapshot_dir.name),
+            # The trimmed fixture tabs would otherwise log header drift.
+            mock.patch.object(loaders.logger, "disabled", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _wait_for_refresh(self, store):
+        if store._thread is not None:
+            store._thread.join(timeout=5)
+
+    def test_first_load_reads_the_source(self):
+        store = loaders._TableStore(self.key)
+
+        tables = store.current().tables
+
+        self.assertEqual(tables["matches"].loc[0, "result"], "W")
+        self.assertTrue(tables["plays_simple"].empty)
+        self.assertFalse(store.status().refreshing)
+
+    def test_fetch_syncs_history_store(self):
+        loaded = loaders._TableStore(self.key).current()
+
+        history = loaders.load_history_store(self.key, loaded)
+
+        self.assertEqual(history.version(), loaded.version)
+        self.assertEqual(history.select("matches")["result"].tolist(), ["W"])
+
+    def test_history_store_is_synced_when_the_snapshot_cannot_be_saved(self):
+        with mock.patch.object(loaders, "save_snapshot", side_effect=OSError("disk full")):
+            loaded = loaders._TableStore(self.key).current()
+
+        self.assertEqual(loaders._history_store(self.key).version(), loaded.version)
+
+    def test_history_store_is_not_synced_from_a_request(self):
+        loaded = loaders._TableStore(self.key).current()
+        older = loaders.DataSnapshot(loaded.tables, "rev-0", loaded.fetched_at)
+
+        self.assertIsNone(loaders.load_history_store(self.key, older))
+        self.assertEqual(loaders._history_store(self.key).version(), loaded.version)
+
+    def test_stale_tables_are_served_while_refresh_runs(self):
+        store = loaders._TableStore(self.key)
+        first = store.current()
+        _write_tabs(self.root, "0")
+        release = threading.Event()
+        fetch = loaders._fetch_tables
+
+        def slow_fetch(*args):
+            release.wait(timeout=5)
+            return fetch(*args)
+
+        with mock.patch.object(loaders, "REVALIDATE_SECONDS", 0), mock.patch.object(
+            loaders, "_probe_revision", return_value="edited"
+        ), mock.patch.object(loaders, "_fetch_tables", side_effect=slow_fetch):
+            served = store.current()
+            self.assertIs(served, first)
+            self.assertTrue(store.status().refreshing)
+            release.set()
+            self._wait_for_refresh(store)
+
+        refreshed = store.current()
+        self.assertEqual(refreshed.revision, "edited")
+        self.assertEqual(refreshed.tables["matches"].loc[0, "result"], "L")
+        self.assertFalse(store.status().refreshing)
+
+    def test_failed_refresh_keeps_last_good_tables(self):
+        store = loaders._TableStore(self.key)
+        first = store.current()
+
+        with mock.patch.object(loaders, "REVALIDATE_SECONDS", 0), mock.patch.object(
+            loaders, "_probe_revision", return_value="edited"
+        ), mock.patch.object(loaders, "_fetch_tables", side_effect=OSError("offline")):
+            self.assertIs(store.current(), first)
+            self._wait_for_refresh(store)
+
+        status = store.status()
+        self.assertIn("offline", status.last_error)
+        self.assertIs(store.current(), first)
+
+    def test_restart_serves_disk_snapshot_then_revalidates(self):
+        loaders._TableStore(self.key).current()
+        restarted = loaders._TableStore(self.key)
+
+        with mock.patch.object(loaders, "_fetch_tables") as fetch:
+            loaded = restarted.current()
+            self._wait_for_refresh(restarted)
+
+        self.assertEqual(loaded.tables["matches"].loc[0, "goals_for"], 2)
+        self.assertEqual(loaded.tables["events"]["match_id"].dtype, loaded.tables["matches"]["match_id"].dtype)
+        fetch.assert_not_called()  # Revision unchanged, so the snapshot stays current.
+
+    def test_invalidate_forces_a_fresh_read(self):
+        store = loaders._TableStore(self.key)
+        store.current()
+        _write_tabs(self.root, "0")
+
+        store.invalidate()
+
+        self.assertEqual(store.current().tables["matches"].loc[0, "result"], "L")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
 import json
+import tempfile
 import unittest
 from datetime import datetime
+from pathlib import Path
+from unittest import mock
 
+from data import maxpreps
 from data.maxpreps import parse_maxpreps_division_rank, parse_maxpreps_next_opponent
 
 
@@ -102,5 +106,40 @@ class MaxPrepsScheduleTests(unittest.TestCase):
         self.assertIsNone(parse_maxpreps_next_opponent(_page_html(None)))
 
 
+class FetchPageTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+
+    def test_recent_page_is_served_from_disk(self):
+        response = mock.Mock(text="<html>v1</html>")
+        with mock.patch("requests.get", return_value=response) as get:
+            first = maxpreps.fetch_page("https://example.test/a", cache_dir=self.cache_dir)
+            second = maxpreps.fetch_page("https://example.test/a", cache_dir=self.cache_dir)
+
+        self.assertEqual((first, second), ("<html>v1</html>", "<html>v1</html>"))
+        get.assert_called_once()
+
+    def test_zero_max_age_refetches(self):
+        with mock.patch("requests.get", return_value=mock.Mock(text="v1")):
+            maxpreps.fetch_page("https://example.test/a", cache_dir=self.cache_dir)
+        with mock.patch("requests.get", return_value=mock.Mock(text="v2")):
+            page = maxpreps.fetch_page("https://example.test/a", cache_dir=self.cache_dir, max_age_seconds=0)
+
+        self.assertEqual(page, "v2")
+
+    def test_cleared_cache_refetches(self):
+        with mock.patch("requests.get", return_value=mock.Mock(text="v1")):
+            maxpreps.fetch_page("https://example.test/a", cache_dir=self.cache_dir)
+        maxpreps.clear_page_cache(self.cache_dir)
+        with mock.patch("requests.get", return_value=mock.Mock(text="v2")) as get:
+            page = maxpreps.fetch_page("https://example.test/a", cache_dir=self.cache_dir)
+
+        self.assertEqual(page, "v2")
+        get.assert_called_once()
+        maxpreps.clear_page_cache(Path(self.cache_dir) / "missing")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,14 @@ import unittest
 
 import pandas as pd
 
-from data.metrics import calculate_shot_on_target_percentages
+from data.metrics import (
+    TeamKpis,
+    calculate_shot_on_target_percentages,
+    kpi_memo,
+    shot_on_target_percentages,
+    team_kpis,
+)
+from data.views import MatchRange, MatchRangeIndex
 
 
 class ShotOnTargetPercentageTests(unittest.TestCase):
@@ -28,6 +35,10 @@ class ShotOnTargetPercentageTests(unittest.TestCase):
 
         self.assertAlmostEqual(shots_target_pct, 50.0)
         self.assertAlmostEqual(shots_against_target_pct, 50.0)
+        self.assertEqual(
+            shot_on_target_percentages(matches.sum().to_dict()),
+            (shots_target_pct, shots_against_target_pct),
+        )
 
     def test_missing_or_zero_totals_return_zero(self):
         matches = pd.DataFrame(
@@ -38,5 +49,53 @@ class ShotOnTargetPercentageTests(unittest.TestCase):
         self.assertEqual(calculate_shot_on_target_percentages(pd.DataFrame()), (0.0, 0.0))
 
 
+def _matches() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2026-09-01", "2026-09-04", "2026-09-08"]),
+            "result": ["W", "D", "L"],
+            "goals_for": [3, 1, 0],
+            "goals_against": [1, 1, 2],
+            "shots_for": [10, 5, 0],
+            "shots_target": [6, 2, 0],
+            "shots_against": [4, 5, 8],
+            "shots_against_target": [2, 3, 4],
+            "saves": pd.array([1, 2, None], dtype="Int64"),
+        }
+    )
+
+
+class TeamKpisTests(unittest.TestCase):
+    def test_one_reduction_gives_every_total_and_rate(self):
+        kpis = TeamKpis.from_matches(_matches())
+
+        self.assertEqual((kpis.games, kpis.record), (3, "1-1-1"))
+        self.assertEqual((kpis.goals_for, kpis.goals_against, kpis.saves), (4, 4, 3))
+        self.assertAlmostEqual(kpis.save_pct, 3 / 7 * 100)
+        self.assertAlmostEqual(kpis.conv_for_pct, 4 / 15 * 100)
+        self.assertEqual(kpis.shots_target_pcts, calculate_shot_on_target_percentages(_matches()))
+        self.assertEqual(TeamKpis.from_matches(pd.DataFrame()).record, "0-0")
+
+    def test_range_totals_build_the_same_bundle(self):
+        index = MatchRangeIndex(_matches())
+
+        totals = index.totals(index.positions(MatchRange()))
+
+        self.assertEqual(TeamKpis.from_totals(totals), TeamKpis.from_matches(_matches()))
+
+    def test_bundle_is_cached_per_view_contents(self):
+        kpi_memo.clear()
+        before = kpi_memo.stats()
+
+        first = team_kpis(_matches())
+        second = team_kpis(_matches().assign(opponent="Essex"))
+        team_kpis(_matches().head(2))
+
+        after = kpi_memo.stats()
+        self.assertIs(first, second)
+        self.assertEqual((after.misses - before.misses, after.hits - before.hits), (2, 1))
+        self.assertEqual(first.to_frame().loc[0, "record"], "1-1-1")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+import pickle
+import unittest
+
+import pandas as pd
+
+from data.opponents import OpponentRegistry, opponent_mask, team_id, team_tokens
+
+
+class TeamTokenTests(unittest.TestCase):
+    def test_spelling_variants_share_one_id(self):
+        for name in ("BFA-St. Albans", "BFA St Albans", "B.F.A. Saint Albans High School", " bfa st. albans "):
+            with self.subTest(name=name):
+                self.assertEqual(team_id(name), "bfa-st-albans")
+        self.assertEqual(team_id("Mt. Mansfield Union"), team_id("Mount Mansfield"))
+        self.assertEqual(team_tokens("U-32"), ("u", "32"))
+
+    def test_blank_names_have_no_id(self):
+        for name in (None, float("nan"), "", " - "):
+            self.assertEqual(team_id(name), "")
+
+
+class OpponentRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.registry = OpponentRegistry(
+            ["BFA St Albans", "BFA-St. Albans", "Rice Memorial", "Essex", "Burlington", "South Burlington", "U-32", None]
+        )
+
+    def test_variants_are_one_team_with_every_spelling(self):
+        self.assertEqual(len(self.registry), 6)
+        self.assertEqual(self.registry.name("bfa-st-albans"), "BFA St Albans")
+        self.assertEqual(self.registry.spellings(["bfa-st-albans"]), ["BFA St Albans", "BFA-St. Albans"])
+
+    def test_partial_names_match_by_token_prefix(self):
+        self.assertEqual(self.registry.match("rice"), {"rice-memorial"})
+        self.assertEqual(self.registry.match("st alb"), {"bfa-st-albans"})
+        self.assertEqual(self.registry.match("Burlington"), {"burlington", "south-burlington"})
+        self.assertEqual(self.registry.match("Hazen"), frozenset())
+
+    def test_maxpreps_names_resolve_to_sheet_teams(self):
+        maxpreps = OpponentRegistry(["BFA-St. Albans Comets", "Burlington Seahorses", "Essex Hornets"])
+        self.assertEqual(maxpreps.resolve("BFA St Albans"), "bfa-st-albans-comets")
+        self.assertEqual(maxpreps.resolve("Essex"), "essex-hornets")
+        self.assertEqual(self.registry.resolve("Burlington"), "burlington")
+        self.assertEqual(self.registry.resolve("U32"), "u-32")
+        self.assertEqual(self.registry.resolve("Esex"), "essex")
+        self.assertIsNone(self.registry.resolve("Milton"))
+
+    def test_a_longer_name_is_a_different_school(self):
+        registry = OpponentRegistry(["Burlington", "Essex", "Colchester"])
+
+        for name in ("South Burlington", "Essex Junction", "Colchester Christian", "BFA-St. Albans Comets"):
+            with self.subTest(name=name):
+                self.assertIsNone(registry.resolve(name))
+                self.assertEqual(registry.match(name), frozenset())
+        self.assertEqual(
+            opponent_mask(pd.Series(["Burlington", "Essex"]), "Essex Junction", registry=registry).tolist(),
+            [False, False],
+        )
+
+    def test_registry_survives_pickling(self):
+        restored = pickle.loads(pickle.dumps(self.registry))
+
+        self.assertEqual(restored.match("rice"), {"rice-memorial"})
+
+    def test_mask_selects_every_spelling_of_the_matched_team(self):
+        opponents = pd.Series(["BFA St Albans", "Essex", "BFA-St. Albans", None], dtype="category")
+
+        mask = opponent_mask(opponents, "bfa st. albans", registry=self.registry)
+
+        self.assertEqual(mask.tolist(), [True, False, True, False])
+        self.assertEqual(opponent_mask(opponents, "essex").tolist(), [False, True, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
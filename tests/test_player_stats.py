@@ -0,0 +1,70 @@
+import unittest
+
+import pandas as pd
+
+from data.player_stats import PlayerMatchCube
+from data.schema import encode_join_keys
+
+
+def _tables() -> dict[str, pd.DataFrame]:
+    tables = {
+        "events": pd.DataFrame(
+            {
+                "match_id": ["0", "0", "1", "1", "0", "2"],
+                "player_id": ["7", "9", "7", "8", "7", "9"],
+                "goals": [1, 0, 2, 0, 1, 3],
+                "assists": [0, 1, 0, 1, 0, 0],
+                "shots": [2, 1, 3, 0, 1, 4],
+                "fouls": [0, 0, 1, 0, 0, 0],
+            }
+        ),
+        "players": pd.DataFrame(
+            {"player_id": ["7", "9"], "name": ["Avery", "Blake"], "jersey": [10, 4], "position": ["F", "M"]}
+        ),
+    }
+    encode_join_keys(tables)
+    return tables
+
+
+class PlayerMatchCubeTests(unittest.TestCase):
+    def setUp(self):
+        tables = _tables()
+        self.events = tables["events"]
+        self.cube = PlayerMatchCube(self.events, tables["players"])
+
+    def test_one_row_per_player_and_match_with_roster_details(self):
+        self.assertEqual(len(self.cube), 5)
+        game = self.cube.for_match("0")
+        self.assertEqual(game["name"].tolist(), ["Avery", "Blake"])
+        self.assertEqual(game["goals"].tolist(), [2, 0])
+        self.assertEqual(game["points"].tolist(), [4, 1])
+        self.assertEqual(self.cube.for_match("1")["name"].tolist(), ["Avery", "Unknown"])
+        self.assertTrue(self.cube.for_match("99").empty)
+
+    def test_leaderboard_sums_the_matches_in_view(self):
+        season = self.cube.leaderboard()
+        self.assertEqual(season["name"].tolist(), ["Avery", "Blake", "Unknown"])
+        self.assertEqual(season["points"].tolist(), [8, 7, 1])
+
+        in_view = self.events.loc[self.events["match_id"].isin(["0", "1"]), "match_id"]
+        self.assertEqual(self.cube.leaderboard(in_view)["points"].tolist(), [8, 1, 1])
+
+    def test_top_scorers_match_a_full_sort(self):
+        top = self.cube.top_scorers(2)
+
+        expected = self.cube.leaderboard().sort_values("goals", ascending=False, kind="stable").head(2)
+        self.assertEqual(top["name"].tolist(), expected["name"].tolist())
+        self.assertEqual(top["goals"].tolist(), [4, 3])
+
+    def test_plain_string_keys_still_join(self):
+        cube = PlayerMatchCube(
+            pd.DataFrame({"match_id": ["0"], "player_id": ["7"], "goals": ["2"]}),
+            pd.DataFrame({"player_id": ["7"], "name": ["Avery"], "jersey": [10]}),
+        )
+
+        self.assertEqual(cube.leaderboard()[["name", "goals", "points"]].values.tolist(), [["Avery", 2, 4]])
+        self.assertTrue(PlayerMatchCube(None, None).leaderboard().empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data.schema import (
+    COMPILED_SCHEMAS,
+    SCHEMAS,
+    compact_int_dtype,
+    detect_header_drift,
+    encode_join_keys,
+    header_fingerprint,
+    memory_footprint,
+    parse_bool,
+    parse_dates,
+    to_category,
+)
+
+
+class CompiledSchemaTests(unittest.TestCase):
+    def test_events_aliases_and_defaults(self):
+        raw = pd.DataFrame({"Event_ID": ["1"], "Assist": ["2"], "Goals": ["x"], "player_id": ["7"]})
+
+        events = COMPILED_SCHEMAS["events"](raw)
+
+        self.assertEqual(list(events.columns), ["event_id", "assists", "goals", "player_id", "shots", "fouls"])
+        self.assertEqual(events.loc[0, "assists"], 2)
+        self.assertEqual(events.loc[0, "goals"], 0)
+        self.assertEqual(events.loc[0, "fouls"], 0)
+
+    def test_matches_coerces_dates_flags_and_venue(self):
+        raw = pd.DataFrame(
+            {
+                "match_id": ["1", "2"],
+                "date": ["2026-09-01", "9/4/2026"],
+                "division_game": ["TRUE", "no"],
+                "home_away": ["Home", "neutral"],
+                "shots": ["5", ""],
+            }
+        )
+
+        matches = COMPILED_SCHEMAS["matches"](raw)
+
+        self.assertEqual(list(matches["date"].dt.day), [1, 4])
+        self.assertEqual(list(matches["division_game"]), [True, False])
+        self.assertEqual(matches.loc[0, "home_away"], "H")
+        self.assertTrue(pd.isna(matches.loc[1, "home_away"]))
+        self.assertEqual(list(matches["shots_for"]), [5, 0])
+
+    def test_count_columns_share_one_compact_integer_dtype(self):
+        raw = pd.DataFrame({"goals_for": ["2", "", "1.9"], "goals_against": ["x", "3", "0"], "saves": ["4", "5", "6"]})
+
+        matches = COMPILED_SCHEMAS["matches"](raw)
+
+        self.assertEqual(set(matches[["goals_for", "goals_against", "saves"]].dtypes), {np.dtype("int16")})
+        self.assertEqual(matches["goals_for"].tolist(), [2, 0, 1])
+        self.assertEqual(matches["goals_against"].tolist(), [0, 3, 0])
+
+    def test_plays_keeps_only_declared_columns(self):
+        raw = pd.DataFrame(
+            {
+                "match_id": ["1"],
+                "set_piece": ["Direct"],
+                "play type": ["near post"],
+                "taker_id": ["9"],
+                "goal_created": ["yes"],
+                "extra": ["ignored"],
+            }
+        )
+
+        plays = COMPILED_SCHEMAS["plays_simple"](raw)
+
+        self.assertEqual(
+            list(plays.columns), ["match_id", "set_piece", "play_type", "taker_notes", "goal_created"]
+        )
+        self.assertEqual(plays.loc[0, "set_piece"], "fk_direct")
+        self.assertEqual(plays.loc[0, "taker_notes"], "9")
+        self.assertTrue(plays.loc[0, "goal_created"])
+
+    def test_goalie_column_uses_first_available_alias(self):
+        raw = pd.DataFrame({"match_id": ["1"], "Goalie": ["12"], "minute": ["33"]})
+
+        goals = COMPILED_SCHEMAS["goals_allowed"](raw)
+
+        self.assertEqual(goals.loc[0, "goalie_player_id"], "12")
+        self.assertEqual(goals.loc[0, "minute"], 33.0)
+        self.assertEqual(goals.loc[0, "situation"], "")
+
+    def test_repetitive_text_columns_become_categorical(self):
+        raw = pd.DataFrame(
+            {
+                "event_id": [str(i) for i in range(6)],
+                "season_id": ["2026"] * 6,
+                "match_id": ["1", "1", "2", "2", "3", "3"],
+                "player_id": ["7", "8", "7", "8", "7", "8"],
+            }
+        )
+
+        events = COMPILED_SCHEMAS["events"](raw)
+
+        for column in ("season_id", "match_id", "player_id"):
+            self.assertIsInstance(events[column].dtype, pd.CategoricalDtype, column)
+        self.assertFalse(isinstance(events["event_id"].dtype, pd.CategoricalDtype))
+        self.assertEqual(events.loc[events["player_id"] == "7", "match_id"].tolist(), ["1", "2", "3"])
+
+
+class CompactionTests(unittest.TestCase):
+    def test_to_category_skips_mostly_unique_columns(self):
+        self.assertIsInstance(to_category(pd.Series(["a", "b", "a", "a"])).dtype, pd.CategoricalDtype)
+        unique = pd.Series(["a", "b", "c", "a"])
+        self.assertIs(to_category(unique), unique)
+
+    def test_memory_footprint_reports_savings(self):
+        df = pd.DataFrame(
+            {
+                "opponent": pd.Series(["Central High School"] * 500, dtype="category"),
+                "goals": pd.Series([1] * 500, dtype="int16"),
+            }
+        )
+
+        footprint = memory_footprint(df)
+
+        self.assertEqual(footprint.rows, 500)
+        self.assertEqual(footprint.compact_bytes, int(df.memory_usage(deep=True).sum()))
+        self.assertLess(footprint.compact_bytes, footprint.expanded_bytes)
+
+    def test_join_keys_share_one_encoding_across_tables(self):
+        tables = {
+            "matches": pd.DataFrame({"match_id": ["2", "10"]}),
+            "events": pd.DataFrame({"match_id": pd.Categorical(["10", None]), "player_id": ["7", "8"]}),
+            "goals_allowed": pd.DataFrame({"match_id": ["2"], "goalie_player_id": ["9"]}),
+        }
+
+        dtypes = encode_join_keys(tables)
+
+        self.assertEqual(list(dtypes["match_id"].categories), ["10", "2"])
+        self.assertEqual(list(dtypes["player_id"].categories), ["7", "8", "9"])
+        self.assertEqual(tables["events"]["match_id"].dtype, tables["matches"]["match_id"].dtype)
+        self.assertEqual(tables["events"]["match_id"].cat.codes.tolist(), [0, -1])
+        self.assertEqual(tables["goals_allowed"]["goalie_player_id"].cat.codes.tolist(), [2])
+
+
+class ParsingTests(unittest.TestCase):
+    def test_parse_bool_accepts_sheet_spellings(self):
+        values = pd.Series(["TRUE", " yes", "0", "", True])
+        self.assertEqual(list(parse_bool(values)), [True, True, False, False, True])
+
+    def test_parse_dates_uses_explicit_formats_then_falls_back(self):
+        parsed = parse_dates(pd.Series(["2026-09-01", "9/3/26", "Sep 5, 2026", "", "soon"]))
+
+        self.assertEqual(
+            [None if pd.isna(value) else value.strftime("%Y-%m-%d") for value in parsed],
+            ["2026-09-01", "2026-09-03", "2026-09-05", None, None],
+        )
+
+    def test_compact_int_dtype_widens_only_when_needed(self):
+        self.assertEqual(compact_int_dtype(0, 12), np.dtype("int16"))
+        self.assertEqual(compact_int_dtype(-1, 40_000), np.dtype("int32"))
+        self.assertEqual(compact_int_dtype(0, 2**40), np.dtype("int64"))
+
+
+class HeaderDriftTests(unittest.TestCase):
+    def test_documented_header_has_no_drift(self):
+        schema = SCHEMAS["events"]
+        self.assertIsNone(detect_header_drift(schema, [c.upper() for c in schema.header]))
+
+    def test_renamed_column_is_reported(self):
+        schema = SCHEMAS["events"]
+        header = ["event_id", "season_id", "match_id", "player_id", "goals", "assist", "shots", "fouls"]
+
+        drift = detect_header_drift(schema, header)
+
+        self.assertEqual(drift.missing, ("assists",))
+        self.assertEqual(drift.unexpected, ("assist",))
+        self.assertEqual(drift.actual, header_fingerprint(header))
+
+
+if __name__ == "__main__":
+    unittest.main()
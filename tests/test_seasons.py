@@ -3,6 +3,7 @@ import unittest
 import pandas as pd
 
 from data.seasons import (
+    SeasonCatalog,
     build_season_catalog,
     resolve_season_id,
     season_is_active,
@@ -44,6 +45,35 @@ class SeasonCatalogTests(unittest.TestCase):
 
         self.assertEqual(season_label(catalog, "2026"), "2026 season")
 
+    def test_catalog_object_matches_dataframe_lookups(self):
+        seasons = pd.DataFrame(
+            [
+                {"season_id": "2026", "label": "2026 season", "active": "TRUE"},
+                {"season_id": "2026", "label": "Fall 2026", "active": "no"},
+                {"season_id": "spring", "label": "", "active": ""},
+            ]
+        )
+        matches = pd.DataFrame([{"season_id": "2025"}, {"season_id": "2027"}])
+
+        catalog = SeasonCatalog.from_tables(seasons, matches)
+        frame = build_season_catalog(seasons, matches)
+
+        self.assertEqual(catalog.ids, ("2027", "2026", "2025", "spring"))
+        self.assertEqual(frame["season_id"].tolist(), list(catalog.ids))
+        for season_id in (*catalog.ids, "2030"):
+            self.assertEqual(catalog.label(season_id), season_label(frame, season_id))
+            self.assertEqual(catalog.is_active(season_id), season_is_active(frame, season_id))
+        self.assertEqual(catalog.label("2026"), "Fall 2026")
+        self.assertFalse(catalog.is_active("2026"))
+
+    def test_catalog_resolves_like_the_dataframe(self):
+        catalog = SeasonCatalog.from_tables(self.seasons, self.matches)
+
+        for requested in (None, "", "2025", " 2026 ", "1999"):
+            self.assertEqual(catalog.resolve(requested), resolve_season_id(requested, catalog.to_frame()))
+        self.assertEqual(SeasonCatalog.from_tables(None, self.matches).resolve(None), "2025")
+        self.assertEqual(SeasonCatalog.from_tables(None, None).ids, ("2025",))
+
     def test_shot_on_target_kpis_start_with_2026_season(self):
         self.assertFalse(supports_shot_on_target_kpis("2025"))
         self.assertTrue(supports_shot_on_target_kpis("2026"))
@@ -0,0 +1,19 @@
+import unittest
+
+from ui.sidebar import range_params_for_season
+
+
+class RangeParamsForSeasonTests(unittest.TestCase):
+    def test_switching_seasons_clears_the_range(self):
+        qp = {"season": "2025", "games": "6-12", "from": "2025-09-10", "to": "2025-10-01"}
+
+        self.assertEqual(range_params_for_season(qp, "2026"), {"games": "", "from": "", "to": ""})
+        self.assertEqual(range_params_for_season({"season": ["2025"], "games": "2-3"}, "2026")["games"], "")
+
+    def test_same_season_or_shared_link_keeps_the_range(self):
+        self.assertEqual(range_params_for_season({"season": "2026", "games": "6-12"}, "2026"), {})
+        self.assertEqual(range_params_for_season({"games": "6-12"}, "2026"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
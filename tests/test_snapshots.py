@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+import pandas as pd
+
+from data.snapshots import SNAPSHOT_FORMAT_VERSION, load_snapshot, save_snapshot, snapshot_root
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_round_trip_preserves_tables_and_metadata(self):
+        fetched_at = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+        matches = pd.DataFrame(
+            {
+                "match_id": ["0", "1"],
+                "date": pd.to_datetime(["2026-09-01", "2026-09-04"]),
+                "goals_for": [2, 0],
+                "division_game": [True, False],
+            }
+        )
+        tables = {"matches": matches, "plays_simple": pd.DataFrame()}
+
+        save_snapshot(self.tmp.name, "sheet-key", tables, fetched_at=fetched_at)
+        snapshot = load_snapshot(self.tmp.name, "sheet-key")
+
+        self.assertEqual(snapshot.fetched_at, fetched_at)
+        self.assertEqual(snapshot.spreadsheet_key, "sheet-key")
+        pd.testing.assert_frame_equal(snapshot.tables["matches"], matches)
+        self.assertTrue(snapshot.tables["plays_simple"].empty)
+
+    def test_newer_snapshot_replaces_older_version(self):
+        old = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        new = datetime(2026, 10, 2, tzinfo=timezone.utc)
+        save_snapshot(self.tmp.name, "sheet-key", {"t": pd.DataFrame({"v": [1]})}, fetched_at=old)
+        save_snapshot(self.tmp.name, "sheet-key", {"t": pd.DataFrame({"v": [2]})}, fetched_at=new)
+
+        snapshot = load_snapshot(self.tmp.name, "sheet-key")
+
+        self.assertEqual(snapshot.fetched_at, new)
+        self.assertEqual(snapshot.tables["t"]["v"].tolist(), [2])
+        versions = [p for p in snapshot_root(self.tmp.name, "sheet-key").iterdir() if p.is_dir()]
+        self.assertEqual(len(versions), 1)
+
+    def test_revision_is_stored_with_snapshot(self):
+        fetched_at = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        save_snapshot(self.tmp.name, "sheet-key", {}, fetched_at=fetched_at, revision="412")
+
+        self.assertEqual(load_snapshot(self.tmp.name, "sheet-key").revision, "412")
+
+    def test_snapshot_in_an_older_format_is_ignored(self):
+        fetched_at = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        save_snapshot(self.tmp.name, "sheet-key", {"t": pd.DataFrame({"v": [1]})}, fetched_at=fetched_at)
+
+        with mock.patch("data.snapshots.SNAPSHOT_FORMAT_VERSION", SNAPSHOT_FORMAT_VERSION + 1):
+            self.assertIsNone(load_snapshot(self.tmp.name, "sheet-key"))
+
+    def test_missing_snapshot_returns_none(self):
+        self.assertIsNone(load_snapshot(self.tmp.name, "unknown"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import unittest
+
+from benchmarks.bench_startup import REPO_ROOT, startup_imports
+
+_DEFERRED = ("altair", "groq", "gspread", "requests")
+
+
+class StartupImportTests(unittest.TestCase):
+    def test_app_defers_optional_dependencies(self):
+        modules = startup_imports()
+
+        self.assertIn("loaders", modules)
+        for module in _DEFERRED:
+            self.assertNotIn(module, modules)
+
+    def test_app_modules_do_not_load_deferred_packages(self):
+        code = (
+            "import sys, app_pages.home, data.maxpreps, data.views, loaders, router\n"
+            f"print(','.join(m for m in {_DEFERRED!r} if m in sys.modules))"
+        )
+        loaded = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        self.assertEqual(loaded, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
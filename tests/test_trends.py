@@ -0,0 +1,126 @@
+import unittest
+
+import pandas as pd
+
+from data.trends import (
+    TREND_METRICS,
+    FormSettings,
+    build_form_frame,
+    build_metric_matrix,
+    comparison_frame,
+    form_metrics,
+    game_points,
+    metric_matrix,
+    rolling_frame,
+    trend_memo,
+)
+
+
+def _matches() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "match_id": ["0", "1", "2", "3"],
+            "date": pd.to_datetime(["2026-09-08", "2026-09-01", "2026-09-15", "2026-09-04"]),
+            "opponent": ["Essex", "Rice", "Burlington", "U-32"],
+            "goals_for": [2, 0, 3, 1],
+            "goals_against": [1, 2, 0, 1],
+            "saves": [3, 2, 4, 0],
+            "shots_for": [8, 0, 10, 4],
+            "shots_against": [5, 6, 2, 3],
+        },
+        index=[10, 11, 12, 13],
+    )
+
+
+class MetricMatrixTests(unittest.TestCase):
+    def test_games_are_numbered_in_date_order(self):
+        matrix = build_metric_matrix(_matches())
+
+        self.assertEqual(matrix["Opponent"].tolist(), ["Rice", "U-32", "Essex", "Burlington"])
+        self.assertEqual(matrix["Game #"].tolist(), [1, 2, 3, 4])
+        self.assertEqual(matrix.index.tolist(), [11, 13, 10, 12])
+        self.assertEqual(matrix["Save%"].tolist(), [50.0, 0.0, 75.0, 100.0])
+        self.assertEqual(matrix["GF Conv%"].tolist(), [0.0, 25.0, 25.0, 30.0])
+
+    def test_views_derive_from_one_matrix(self):
+        matrix = build_metric_matrix(_matches())
+
+        comparison = comparison_frame(matrix).set_index("Metric")
+        self.assertAlmostEqual(comparison.loc["GF", "All Games"], 1.5)
+        self.assertAlmostEqual(comparison.loc["GF", "Last 3 Games"], 2.0)
+        self.assertAlmostEqual(comparison.loc["GF", "Difference"], 0.5)
+        self.assertEqual(rolling_frame(matrix)["R3 GF"].tolist(), [0.0, 0.5, 1.0, 2.0])
+        self.assertEqual(game_points(matrix)["Last 3 Games"].tolist(), [False, True, True, True])
+
+    def test_short_views_compare_every_game_with_itself(self):
+        comparison = comparison_frame(build_metric_matrix(_matches().head(2)))
+
+        self.assertTrue((comparison["Difference"] == 0).all())
+        self.assertTrue(comparison_frame(build_metric_matrix(_matches().iloc[0:0])).empty)
+
+
+class FormMetricsTests(unittest.TestCase):
+    def test_settings_are_normalized(self):
+        self.assertEqual(FormSettings((8, 3, 5, 3)).windows, (3, 5, 8))
+        self.assertEqual(FormSettings(()).windows, (3,))
+        self.assertIsNone(FormSettings(halflife=0).halflife)
+        self.assertEqual(FormSettings((5,), 2).recent_column("GF"), "EWMA GF")
+        self.assertEqual(FormSettings((8, 5)).recent_column("GA"), "R5 GA")
+
+    def test_one_pass_matches_pandas_rolling_and_ewm(self):
+        matrix = build_metric_matrix(_matches())
+        metrics = matrix[list(TREND_METRICS)]
+
+        form = build_form_frame(matrix, FormSettings((2, 3, 8), halflife=1.5))
+
+        for window in (2, 3, 8):
+            expected = metrics.rolling(window, min_periods=1).mean().add_prefix(f"R{window} ")
+            pd.testing.assert_frame_equal(form[expected.columns], expected, check_exact=False)
+        expected = metrics.ewm(halflife=1.5).mean().add_prefix("EWMA ")
+        pd.testing.assert_frame_equal(form[expected.columns], expected, check_exact=False)
+
+    def test_comparison_has_a_column_per_window(self):
+        matrix = build_metric_matrix(_matches())
+        settings = FormSettings((2, 3), halflife=1.0)
+
+        comparison = comparison_frame(matrix, build_form_frame(matrix, settings), settings)
+
+        self.assertEqual(
+            comparison.columns.tolist(),
+            ["Metric", "All Games", "Last 2 Games", "Last 3 Games", "EWMA (half-life 1)", "Difference"],
+        )
+        self.assertAlmostEqual(comparison.set_index("Metric").loc["GF", "Last 2 Games"], 2.5)
+
+    def test_form_is_cached_per_view_and_settings(self):
+        trend_memo.clear()
+        matches = _matches()
+        before = trend_memo.stats()
+
+        form_metrics(matches, FormSettings((3, 5)))
+        form_metrics(matches.copy(), FormSettings((5, 3)))
+        form_metrics(matches, FormSettings((3,)))
+
+        after = trend_memo.stats()
+        # Matrix once, form for (3, 5) once then a hit, form for (3,) once.
+        self.assertEqual((after.misses - before.misses, after.hits - before.hits), (3, 2))
+
+
+class MetricMatrixMemoTests(unittest.TestCase):
+    def setUp(self):
+        trend_memo.clear()
+
+    def test_matrix_is_built_once_per_view_contents(self):
+        before = trend_memo.stats()
+        matches = _matches()
+
+        first = metric_matrix(matches)
+        first["GF"] = 99
+        second = metric_matrix(matches.copy())
+
+        after = trend_memo.stats()
+        self.assertEqual((after.misses - before.misses, after.hits - before.hits), (1, 1))
+        self.assertEqual(second["GF"].tolist(), [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
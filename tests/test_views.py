@@ -0,0 +1,194 @@
+import unittest
+from datetime import date
+
+import pandas as pd
+
+from data.schema import encode_join_keys
+from data.views import (
+    MatchRange,
+    LruMemo,
+    MatchRangeIndex,
+    MatchViewMemo,
+    SeasonIndex,
+    filter_by_season,
+    key_isin,
+    match_views_key,
+    view_fingerprint,
+)
+
+
+class SeasonIndexTests(unittest.TestCase):
+    def test_lookup_matches_filter_by_season(self):
+        events = pd.DataFrame(
+            {"season_id": pd.Categorical([" 2025", "2026", "2025", None]), "goals": [1, 2, 3, 4]},
+            index=[10, 11, 12, 13],
+        )
+        index = SeasonIndex(events)
+
+        for season in ("2025", "2026", "2030"):
+            pd.testing.assert_frame_equal(index.get(season), filter_by_season(events, season))
+        self.assertEqual(index.get(2025)["goals"].tolist(), [1, 3])
+
+    def test_table_without_season_column_belongs_to_legacy_season(self):
+        summaries = pd.DataFrame({"match_id": ["0"]})
+        index = SeasonIndex(summaries, legacy_season_id="2025")
+
+        self.assertEqual(len(index.get("2025")), 1)
+        self.assertTrue(index.get("2026").empty)
+        self.assertEqual(list(index.get("2026").columns), ["match_id"])
+
+    def test_lookups_do_not_change_the_partition(self):
+        index = SeasonIndex(pd.DataFrame({"season_id": ["2026"], "goals": [1]}))
+
+        season = index.get("2026")
+        season.loc[0, "goals"] = 9
+
+        self.assertEqual(index.get("2026").loc[0, "goals"], 1)
+
+
+class MatchRangeTests(unittest.TestCase):
+    def setUp(self):
+        self.matches = pd.DataFrame(
+            {
+                "match_id": ["a", "b", "c", "d", "e"],
+                "date": pd.to_datetime(["2026-09-10", "2026-09-01", None, "2026-10-02", "2026-09-20"]),
+                "result": ["W", "L", "D", "W", "W"],
+                "goals_for": [1, 0, 2, 3, 2],
+                "goals_against": [0, 2, 2, 1, 1],
+                "saves": [5, 3, 4, 6, 2],
+            }
+        )
+        self.index = MatchRangeIndex(self.matches)
+
+    def test_game_numbers_follow_date_order_with_undated_last(self):
+        rows = self.index.rows(self.index.positions(MatchRange(first_game=2, last_game=4)))
+
+        self.assertEqual(rows["match_id"].tolist(), ["a", "e", "d"])
+        self.assertEqual(self.index.date_bounds(), (date(2026, 9, 1), date(2026, 10, 2)))
+
+    def test_date_bounds_are_inclusive_and_skip_undated_matches(self):
+        positions = self.index.positions(MatchRange(start_date=date(2026, 9, 10), end_date=date(2026, 9, 20)))
+        self.assertEqual(self.index.rows(positions)["match_id"].tolist(), ["a", "e"])
+
+        positions = self.index.positions(MatchRange(start_date=date(2026, 9, 15)))
+        self.assertEqual(self.index.rows(positions)["match_id"].tolist(), ["e", "d"])
+        self.assertEqual(self.index.totals(self.index.positions(MatchRange(start_date=date(2027, 1, 1))))["games"], 0)
+
+    def test_totals_match_summing_the_rows(self):
+        for first in range(1, 6):
+            for last in range(first - 1, 7):
+                positions = self.index.positions(MatchRange(first_game=first, last_game=last))
+                rows = self.index.rows(positions)
+                totals = self.index.totals(positions)
+                with self.subTest(first=first, last=last):
+                    self.assertEqual(totals["games"], len(rows))
+                    self.assertEqual(totals["goals_for"], rows["goals_for"].sum())
+                    self.assertEqual(totals["saves"], rows["saves"].sum())
+                    self.assertEqual(totals["wins"], (rows["result"] == "W").sum())
+                    self.assertEqual(totals["shots_for"], 0)
+
+    def test_query_params_round_trip(self):
+        match_range = MatchRange.from_query("6-12", "2026-10-01", "")
+
+        self.assertEqual(match_range, MatchRange(6, 12, date(2026, 10, 1)))
+        query = match_range.to_query()
+        self.assertEqual(MatchRange.from_query(query["games"], query["from"], query["to"]), match_range)
+        self.assertEqual(MatchRange.from_query("7"), MatchRange(7, 7))
+        self.assertEqual(MatchRange.from_query("6-"), MatchRange(6))
+        self.assertFalse(MatchRange.from_query("x-y", "not a date").active)
+        self.assertEqual(MatchRange().to_query(), {"games": "", "from": "", "to": ""})
+
+
+class KeyIsinTests(unittest.TestCase):
+    def test_encoded_and_plain_keys_agree(self):
+        tables = {
+            "matches": pd.DataFrame({"match_id": ["1", "3"]}),
+            "events": pd.DataFrame({"match_id": ["1", "2", "3", "3"]}),
+        }
+        plain = key_isin(tables["events"]["match_id"], tables["matches"]["match_id"])
+
+        encode_join_keys(tables)
+        encoded = key_isin(tables["events"]["match_id"], tables["matches"]["match_id"])
+
+        self.assertEqual(plain.tolist(), [True, False, True, True])
+        pd.testing.assert_series_equal(encoded, plain, check_names=False)
+
+    def test_mixed_key_types_fall_back_to_strings(self):
+        events = pd.Series([1, 2, 3])
+        self.assertEqual(key_isin(events, pd.Series(["2"])).tolist(), [False, True, False])
+
+
+class MatchViewMemoTests(unittest.TestCase):
+    def _views(self, label):
+        return tuple(pd.DataFrame({"label": [label]}) for _ in range(4))
+
+    def test_repeat_lookups_are_hits(self):
+        memo = MatchViewMemo(maxsize=4)
+        calls = []
+        key = match_views_key("rev@1", "2026", div_only=False, opp_filter="Rice ", ha_val="home")
+
+        for _ in range(3):
+            views = memo.get(key, lambda: calls.append(1) or self._views("a"))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(views[0]["label"].tolist(), ["a"])
+        stats = memo.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (2, 1, 1))
+        self.assertAlmostEqual(stats.hit_rate, 2 / 3)
+
+    def test_equivalent_filters_share_a_key(self):
+        self.assertEqual(
+            match_views_key("rev@1", "2026", div_only=False, opp_filter=" rice", ha_val="H"),
+            match_views_key("rev@1", 2026, div_only=0, opp_filter="RICE", ha_val="home"),
+        )
+        self.assertNotEqual(
+            match_views_key("rev@1", "2026", div_only=False, opp_filter="", ha_val="any"),
+            match_views_key("rev@2", "2026", div_only=False, opp_filter="", ha_val="any"),
+        )
+
+    def test_least_recently_used_entry_is_evicted(self):
+        memo = MatchViewMemo(maxsize=2)
+        memo.get("a", lambda: self._views("a"))
+        memo.get("b", lambda: self._views("b"))
+        memo.get("a", lambda: self._views("a"))
+        memo.get("c", lambda: self._views("c"))
+
+        recomputed = []
+        memo.get("a", lambda: recomputed.append("a") or self._views("a"))
+        memo.get("b", lambda: recomputed.append("b") or self._views("b"))
+
+        self.assertEqual(recomputed, ["b"])
+        self.assertEqual(memo.stats().size, 2)
+
+    def test_callers_cannot_modify_cached_views(self):
+        memo = MatchViewMemo()
+        first = memo.get("k", lambda: self._views("a"))
+        first[0].loc[0, "label"] = "changed"
+
+        self.assertEqual(memo.get("k", lambda: self._views("b"))[0]["label"].tolist(), ["a"])
+
+
+class LruMemoTests(unittest.TestCase):
+    def test_values_are_returned_as_stored(self):
+        memo = LruMemo(maxsize=1)
+        value = ("kpis", 3)
+
+        self.assertIs(memo.get("k", lambda: value), value)
+        self.assertIs(memo.get("k", lambda: ("other",)), value)
+        self.assertIsNone(memo.get("none", lambda: None))
+        self.assertIsNone(memo.get("none", lambda: "recomputed"))
+        self.assertEqual((memo.stats().hits, memo.stats().size), (2, 1))
+
+    def test_fingerprint_tracks_the_given_columns(self):
+        matches = pd.DataFrame({"match_id": ["0", "1"], "goals_for": [2, 0]}, index=[10, 11])
+        edited = matches.copy()
+        edited.loc[10, "goals_for"] = 5
+        columns = ("match_id", "goals_for", "saves")
+
+        self.assertNotEqual(view_fingerprint(matches, columns), view_fingerprint(edited, columns))
+        self.assertNotEqual(view_fingerprint(matches, columns), view_fingerprint(matches.iloc[1:], columns))
+        self.assertEqual(view_fingerprint(matches, columns), view_fingerprint(matches.assign(notes="x"), columns))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+import loaders
+import warmup
+
+
+class WarmupTests(unittest.TestCase):
+    def setUp(self):
+        data_dir = tempfile.TemporaryDirectory()
+        snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        self.addCleanup(snapshot_dir.cleanup)
+        self.root = Path(data_dir.name)
+        self.key = f"file://{self.root}"
+        (self.root / "matches.csv").write_text(
+            "match_id,season_id,goals_for,goals_against\n0,2026,2,1\n", encoding="utf-8"
+        )
+        (self.root / "players.csv").write_text("player_id,player_status\n7,current\n", encoding="utf-8")
+        (self.root / "events.csv").write_text("event_id,season_id,match_id,player_id,goals\n1,2026,0,7,1\n", encoding="utf-8")
+        for patcher in (
+            mock.patch.object(loaders, "SNAPSHOT_DIR", snapshot_dir.name),
+            mock.patch.object(loaders.logger, "disabled", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _main(self, *argv):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = warmup.main(["--key", self.key, *argv])
+        return code, out.getvalue()
+
+    def test_successful_warmup_reports_every_stage(self):
+        with mock.patch.object(warmup, "fetch_page", return_value="<html></html>") as fetch:
+            code, report = self._main()
+
+        self.assertEqual(code, 0)
+        for stage in ("tables", "snapshot", "history", "views", "maxpreps rankings", "maxpreps schedule", "total"):
+            self.assertIn(stage, report)
+        self.assertNotIn("FAILED", report)
+        self.assertIn("season 2026: 1 matches, 1 events", report)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_missing_required_tab_fails(self):
+        (self.root / "events.csv").unlink()
+
+        code, report = self._main("--skip-maxpreps")
+
+        self.assertEqual(code, 1)
+        self.assertIn("FAILED", report)
+        self.assertNotIn("views", report)
+
+    def test_maxpreps_outage_is_only_a_warning(self):
+        with mock.patch.object(warmup, "fetch_page", side_effect=OSError("offline")):
+            results = warmup.run_warmup(self.key)
+
+        failed = {r.name: r.required for r in results if not r.ok}
+        self.assertEqual(failed, {"maxpreps rankings": False, "maxpreps schedule": False})
+
+    def test_command_runs_only_after_a_passing_warmup(self):
+        with mock.patch.object(warmup.os, "execvp") as execvp:
+            code, _ = self._main("--skip-maxpreps", "--", "streamlit", "run", "app.py")
+
+        self.assertEqual(code, 0)
+        execvp.assert_called_once_with("streamlit", ["streamlit", "run", "app.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
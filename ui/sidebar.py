@@ -1,5 +1,25 @@
+from datetime import date
+from typing import Mapping, Optional
+
 import streamlit as st
 
+from data.views import MatchRange
+
+
+def range_params_for_season(qp: Mapping, selected_season: str) -> dict[str, str]:
+    """Query params that clear the game/date range when the season changes.
+
+    A range is only meaningful for the season it was picked in, so switching
+    seasons drops it. A URL without a season (first load) keeps its range.
+    """
+
+    previous = qp.get("season")
+    if isinstance(previous, list):
+        previous = previous[0] if previous else None
+    if previous and str(previous) != str(selected_season):
+        return MatchRange().to_query()
+    return {}
+
 
 def render_sidebar(
     *,
@@ -8,7 +28,7 @@ def render_sidebar(
     qparams_set,
     qparams_merge_update,
     season_options: list[str],
-    season_labels: dict[str, str],
+    season_labels: Mapping[str, str],
     default_season: str,
     schedule_url: str,
     rankings_url: str,
@@ -76,6 +96,7 @@ def render_sidebar(
                 "opp": opponent_q.strip(),
                 # Store full text so "Any" is not mistaken for Away
                 "ha": ha_opt.lower() if ha_opt else "any",
+                **range_params_for_season(qp_init, selected_season),
             }
 
             diffs = []
@@ -93,3 +114,50 @@ def render_sidebar(
             pass
 
     return compact, div_only, selected_season
+
+
+def render_range_filters(
+    *,
+    qparams_get,
+    qparams_merge_update,
+    game_count: int,
+    date_bounds: Optional[tuple[date, date]],
+) -> MatchRange:
+    """Render the game-number and date range filters for the selected season.
+
+    Ranges are kept in the ``games``, ``from`` and ``to`` query params; a range
+    covering the whole season clears them.
+    """
+
+    qp_init = qparams_get()
+    current = MatchRange.from_query(qp_init.get("games", ""), qp_init.get("from", ""), qp_init.get("to", ""))
+
+    with st.sidebar:
+        st.subheader("Range")
+        first_game = last_game = start_date = end_date = None
+        if game_count > 1:
+            lo = min(max(current.first_game or 1, 1), game_count)
+            hi = min(max(current.last_game or game_count, lo), game_count)
+            lo, hi = st.slider("Games", 1, game_count, (lo, hi))
+            first_game = lo if lo > 1 else None
+            last_game = hi if hi < game_count else None
+        if date_bounds is not None and date_bounds[0] < date_bounds[1]:
+            first_day, last_day = date_bounds
+            start = min(max(current.start_date or first_day, first_day), last_day)
+            end = min(max(current.end_date or last_day, start), last_day)
+            picked = st.date_input("Dates", (start, end), min_value=first_day, max_value=last_day)
+            # The picker returns one date while the second is being chosen.
+            if isinstance(picked, (tuple, list)) and len(picked) == 2:
+                start, end = picked
+            start_date = start if start > first_day else None
+            end_date = end if end < last_day else None
+
+    selected = MatchRange(first_game, last_game, start_date, end_date)
+    desired = selected.to_query()
+    try:
+        if any(str(qp_init.get(key, "") or "") != value for key, value in desired.items()):
+            qparams_merge_update(**desired)
+            st.rerun()
+    except Exception:
+        pass
+    return selected
@@ -0,0 +1,164 @@
+"""Warm the dashboard's caches before it takes traffic.
+
+Reads every worksheet and writes the on-disk snapshot and SQLite history the
+server starts from. It then builds the default views once, so schema problems
+show up here instead of on the first visit, and prefetches the MaxPreps pages.
+
+Usage:
+    python -m warmup [--key SPREADSHEET_KEY] [--skip-maxpreps]
+    python -m warmup -- streamlit run app.py    # start the server only if warmup passes
+
+Prints how long each stage took. Exits 1 if a required stage fails: reading
+the data source, or building the default views.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from dotenv import load_dotenv
+
+import loaders
+from data.history import HistoryStore
+from data.maxpreps import (
+    MAXPREPS_RANKINGS_URL,
+    MAXPREPS_SCHEDULE_URL,
+    fetch_page,
+    parse_maxpreps_division_rank,
+    parse_maxpreps_next_opponent,
+)
+from data.snapshots import load_snapshot
+from data.views import derive_related_views, query_match_views
+
+
+@dataclass(frozen=True)
+class StageResult:
+    name: str
+    seconds: float
+    ok: bool
+    required: bool
+    detail: str = ""
+
+
+def _warm_tables(spreadsheet_key: str) -> tuple[loaders.DataSnapshot, str]:
+    snapshot = loaders.prefetch_tables(spreadsheet_key)
+    rows = sum(len(df) for df in snapshot.tables.values())
+    detail = f"{len(snapshot.tables)} tables, {rows} rows"
+    if snapshot.header_drift:
+        detail += f"; header drift in {', '.join(sorted(snapshot.header_drift))}"
+    return snapshot, detail
+
+
+def _check_snapshot(spreadsheet_key: str, snapshot: loaders.DataSnapshot) -> tuple[None, str]:
+    saved = load_snapshot(loaders.SNAPSHOT_DIR, spreadsheet_key)
+    if saved is None or saved.fetched_at != snapshot.fetched_at:
+        raise RuntimeError(f"snapshot was not written under {loaders.SNAPSHOT_DIR}")
+    return None, loaders.SNAPSHOT_DIR
+
+
+def _warm_history(spreadsheet_key: str, snapshot: loaders.DataSnapshot) -> tuple[HistoryStore, str]:
+    history = loaders.load_history_store(spreadsheet_key, snapshot)
+    if history is None:
+        raise RuntimeError("history store does not hold the loaded snapshot")
+    return history, str(history.path)
+
+
+def _warm_views(snapshot: loaders.DataSnapshot, history: Optional[HistoryStore]) -> tuple[None, str]:
+    season_id = snapshot.season_catalog.resolve(None)
+    if history is not None:
+        matches_view, events_view, _, _ = query_match_views(
+            history, season_id, div_only=False, opp_filter="", ha_val="any"
+        )
+    else:
+        matches_view = snapshot.season_table("matches", season_id)
+        events_view, _, _ = derive_related_views(
+            matches_view=matches_view,
+            events=snapshot.season_table("events", season_id),
+            plays_simple=snapshot.season_table("plays_simple", season_id),
+            goals_allowed=snapshot.season_table("goals_allowed", season_id),
+        )
+    return None, f"season {season_id}: {len(matches_view)} matches, {len(events_view)} events"
+
+
+def _warm_page(url: str, parse: Callable[[str], object]) -> tuple[None, str]:
+    html = fetch_page(url, max_age_seconds=0)
+    published = parse(html) is not None
+    return None, f"{len(html)} bytes" + ("" if published else " (nothing published yet)")
+
+
+def _run_stage(results: list[StageResult], name: str, fn: Callable[[], tuple], *, required: bool = True):
+    start = time.perf_counter()
+    try:
+        value, detail = fn()
+    except Exception as exc:
+        results.append(StageResult(name, time.perf_counter() - start, False, required, f"{type(exc).__name__}: {exc}"))
+        return None
+    results.append(StageResult(name, time.perf_counter() - start, True, required, detail))
+    return value
+
+
+def run_warmup(spreadsheet_key: str, *, maxpreps: bool = True) -> list[StageResult]:
+    """Run every warmup stage in order and report how each one went."""
+
+    results: list[StageResult] = []
+    snapshot = _run_stage(results, "tables", lambda: _warm_tables(spreadsheet_key))
+    if snapshot is None:
+        return results
+    _run_stage(results, "snapshot", lambda: _check_snapshot(spreadsheet_key, snapshot), required=False)
+    history = _run_stage(results, "history", lambda: _warm_history(spreadsheet_key, snapshot), required=False)
+    _run_stage(results, "views", lambda: _warm_views(snapshot, history))
+    if maxpreps:
+        _run_stage(
+            results,
+            "maxpreps rankings",
+            lambda: _warm_page(MAXPREPS_RANKINGS_URL, parse_maxpreps_division_rank),
+            required=False,
+        )
+        _run_stage(
+            results,
+            "maxpreps schedule",
+            lambda: _warm_page(MAXPREPS_SCHEDULE_URL, parse_maxpreps_next_opponent),
+            required=False,
+        )
+    return results
+
+
+def format_report(results: Sequence[StageResult]) -> str:
+    lines = [f"{'stage':<18} {'seconds':>8}  {'status':<6} detail"]
+    for result in results:
+        status = "ok" if result.ok else ("FAILED" if result.required else "warn")
+        lines.append(f"{result.name:<18} {result.seconds:>8.2f}  {status:<6} {result.detail}")
+    lines.append(f"{'total':<18} {sum(r.seconds for r in results):>8.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--key", help="spreadsheet ID, URL or file:// path (default: $SPREADSHEET_KEY)")
+    parser.add_argument("--skip-maxpreps", action="store_true", help="do not prefetch the MaxPreps pages")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="after --, a command to run if warmup passes")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    spreadsheet_key = args.key or os.getenv("SPREADSHEET_KEY")
+    if not spreadsheet_key:
+        parser.error("set SPREADSHEET_KEY or pass --key")
+
+    results = run_warmup(spreadsheet_key, maxpreps=not args.skip_maxpreps)
+    print(format_report(results), flush=True)
+    if any(result.required and not result.ok for result in results):
+        return 1
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if command:
+        os.execvp(command[0], command)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())